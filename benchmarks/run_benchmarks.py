@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Benchmarks headless dos caminhos críticos do editor do PyPy IDE
+
+Executa cenários roteirizados sobre IDEMainWindow, TabManager, CodeEditor,
+PythonHighlighter e o autocompletar com QT_QPA_PLATFORM=offscreen e
+gera um relatório JSON com tempo total, pico de memória (RSS) e percentis
+de latência por operação. Cada cenário roda num processo próprio, para que
+o pico de memória seja só dele.
+
+Uso:
+    python benchmarks/run_benchmarks.py                    # roda e compara com o baseline
+    python benchmarks/run_benchmarks.py --update-baseline  # grava o baseline atual
+    python benchmarks/run_benchmarks.py --scale 0.1 --scenario typing
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtTest import QTest
+from src.main_window import IDEMainWindow
+from src.workspace_index import workspace_index
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def status(message):
+    """Progresso e mensagens vão para stderr; stdout fica só com o relatório JSON"""
+    print(message, file=sys.stderr, flush=True)
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Trecho de código usado para gerar arquivos e simular digitação
+SAMPLE_CODE = '''class Model{n}:
+    """Modelo gerado número {n}"""
+
+    def __init__(self, value=None):
+        self.value = value
+        self.items = [x * 2 for x in range({n} % 17)]
+
+    def compute(self, factor):
+        # Calcula o total aplicando o fator
+        total = sum(self.items) * factor
+        return f"total={{total}}"
+
+
+'''
+
+TYPED_TEXT = (
+    "def process(records):\n"
+    "    result = []\n"
+    "    for record in records:\n"
+    "        if record.get('active'):\n"
+    "            result.append(record['value'] * 2)\n"
+    "    return sorted(result)\n"
+)
+
+# Cenários, na ordem de execução (métodos ``scenario_<nome>``)
+SCENARIOS = ['open_large_file', 'typing', 'scroll', 'switch_themes', 'open_tabs',
+             'completions', 'module_completions']
+
+COMPLETION_PREFIXES = ['pr', 'im', 'de', 'cl', 'se', 'ra', 'le', 'en', 'is', 'ma',
+                       'fi', 'so', 'st', 'di', 're', 'op', 'wh', 'tr', 'ex', 'ge']
+
+
+def generate_code(lines):
+    """Gera código Python com aproximadamente ``lines`` linhas"""
+    chunk_lines = SAMPLE_CODE.count('\n')
+    parts = [SAMPLE_CODE.format(n=n) for n in range(max(1, lines // chunk_lines))]
+    return ''.join(parts)
+
+
+def peak_rss_kb():
+    """Retorna o pico de memória residente do processo em KB.
+
+    É o pico do processo inteiro, por isso cada cenário roda num processo próprio.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak //= 1024  # macOS informa em bytes
+    return peak
+
+
+def percentiles(samples):
+    """Resume uma lista de latências (ms) em percentis"""
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+
+    def pick(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+    return {
+        'count': len(ordered),
+        'mean': round(sum(ordered) / len(ordered), 3),
+        'p50': pick(0.50),
+        'p90': pick(0.90),
+        'p99': pick(0.99),
+        'max': round(ordered[-1], 3)
+    }
+
+
+class BenchmarkRunner:
+    """Executa os cenários de benchmark numa janela real da IDE"""
+
+    def __init__(self, scale=1.0):
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        self.scale = scale
+        self.workdir = tempfile.mkdtemp(prefix='pypy_ide_bench_')
+        self.window = IDEMainWindow()
+        self.window.show()
+        self.process_events()
+
+        self.scenarios = {name: getattr(self, f'scenario_{name}') for name in SCENARIOS}
+
+    def scaled(self, value):
+        return max(1, int(value * self.scale))
+
+    def process_events(self):
+        self.app.processEvents()
+
+    def timed(self, function, *args):
+        """Executa uma operação, processa os eventos e retorna o tempo em ms"""
+        start = time.perf_counter()
+        function(*args)
+        self.process_events()
+        return (time.perf_counter() - start) * 1000
+
+    def write_file(self, name, content):
+        path = os.path.join(self.workdir, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def current_editor(self):
+        return self.window.tab_manager.get_current_editor()
+
+    def current_highlighter(self):
+        return self.window.tab_manager.get_current_tab_info().get('highlighter')
+
+    def wait_for_highlighting(self, timeout=300):
+        """Processa eventos até o highlighting em segundo plano terminar"""
+        highlighter = self.current_highlighter()
+        deadline = time.perf_counter() + timeout
+        while highlighter and highlighter.is_loading() and time.perf_counter() < deadline:
+            self.process_events()
+
+    def repaint(self, editor):
+        """Força a pintura síncrona do editor (texto e numeração de linhas)"""
+        editor.viewport().repaint()
+        editor.lineNumberArea.repaint()
+
+    # Cenários
+
+    def scenario_open_large_file(self):
+        """Abre um arquivo de 100k linhas e espera o highlighting completo"""
+        path = self.write_file('large.py', generate_code(self.scaled(100000)))
+        open_ms = self.timed(self.window.open_file_from_path, path)
+        start = time.perf_counter()
+        self.wait_for_highlighting()
+        highlight_ms = (time.perf_counter() - start) * 1000
+        return [open_ms], {'first_interaction_ms': round(open_ms, 3),
+                           'full_highlight_ms': round(highlight_ms, 3)}
+
+    def scenario_typing(self):
+        """Digita 1.000 caracteres no meio de um arquivo de 2.000 linhas"""
+        path = self.write_file('typing.py', generate_code(2000))
+        self.window.open_file_from_path(path)
+        self.wait_for_highlighting()
+        editor = self.current_editor()
+        editor.setFocus()
+        cursor = editor.textCursor()
+        cursor.setPosition(editor.document().findBlockByNumber(1000).position())
+        editor.setTextCursor(cursor)
+
+        samples = []
+        count = self.scaled(1000)
+        for i in range(count):
+            char = TYPED_TEXT[i % len(TYPED_TEXT)]
+            if char == '\n':
+                samples.append(self.timed(QTest.keyClick, editor, Qt.Key_Return))
+            else:
+                samples.append(self.timed(QTest.keyClicks, editor, char))
+            self.repaint(editor)
+        return samples, {'characters': count}
+
+    def scenario_scroll(self):
+        """Rola o arquivo grande do início ao fim, página por página"""
+        path = self.write_file('scroll.py', generate_code(self.scaled(100000)))
+        self.window.open_file_from_path(path)
+        self.wait_for_highlighting()
+        editor = self.current_editor()
+        scrollbar = editor.verticalScrollBar()
+        scrollbar.setValue(0)
+
+        samples = []
+        step = max(1, scrollbar.pageStep())
+        for value in range(0, scrollbar.maximum() + step, step):
+            start = time.perf_counter()
+            scrollbar.setValue(value)
+            self.process_events()
+            self.repaint(editor)
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples, {'pages': len(samples)}
+
+    def scenario_switch_themes(self):
+        """Alterna entre todos os temas com arquivos abertos"""
+        themes = self.window.theme_manager.get_available_themes()
+        samples = []
+        for _ in range(2):
+            for theme in themes:
+                samples.append(self.timed(self.window.change_theme, theme))
+        return samples, {'themes': len(themes),
+                         'open_tabs': self.window.tab_manager.count()}
+
+    def scenario_open_tabs(self):
+        """Abre 50 arquivos em abas"""
+        samples = []
+        count = self.scaled(50)
+        for i in range(count):
+            path = self.write_file(f'tab_{i}.py', generate_code(300))
+            samples.append(self.timed(self.window.open_file_from_path, path))
+        return samples, {'tabs': count}
+
+    def scenario_completions(self):
+        """Digita prefixos que disparam o autocompletar e espera as sugestões"""
+        self.window.add_new_tab()
+        editor = self.current_editor()
+        completer = self.window.tab_manager.get_current_tab_info()['completer']
+        popup = completer.completer.popup()
+
+        samples = []
+        results_ms = []
+        for i in range(self.scaled(200)):
+            prefix = COMPLETION_PREFIXES[i % len(COMPLETION_PREFIXES)]
+            cursor = editor.textCursor()
+            cursor.movePosition(QTextCursor.End)
+            editor.setTextCursor(cursor)
+            QTest.keyClick(editor, Qt.Key_Return)
+            for char in prefix:
+                samples.append(self.timed(QTest.keyClicks, editor, char))
+
+            # Tempo da última tecla até as sugestões aparecerem
+            start = time.perf_counter()
+            deadline = start + 2
+            while not popup.isVisible() and time.perf_counter() < deadline:
+                self.process_events()
+            results_ms.append((time.perf_counter() - start) * 1000)
+            popup.hide()
+        return samples, {'requests': len(results_ms),
+                         'results_latency_ms': percentiles(results_ms)}
+
+    def scenario_module_completions(self):
+        """Atributos de um módulo do próprio projeto depois de "modulo."
+
+        O módulo não é instalado nem da biblioteca padrão, então as
+        sugestões vêm do índice do workspace. Falha se elas não aparecem.
+        """
+        names = [f'helper_{n}' for n in range(self.scaled(200))]
+        self.write_file('bench_utils.py', ''.join(f'def {name}():\n    pass\n' for name in names))
+        workspace_index.set_root(self.workdir)
+        deadline = time.perf_counter() + 60
+        while workspace_index.is_indexing() and time.perf_counter() < deadline:
+            self.process_events()
+
+        self.window.add_new_tab()
+        editor = self.current_editor()
+        completer = self.window.tab_manager.get_current_tab_info()['completer']
+        popup = completer.completer.popup()
+        QTest.keyClicks(editor, 'import bench_utils')
+
+        samples = []
+        for i in range(self.scaled(50)):
+            QTest.keyClick(editor, Qt.Key_Return)
+            QTest.keyClicks(editor, 'bench_utils.')
+            start = time.perf_counter()
+            QTest.keyClicks(editor, 'helper_1')
+            deadline = start + 2
+            while not popup.isVisible() and time.perf_counter() < deadline:
+                self.process_events()
+            samples.append((time.perf_counter() - start) * 1000)
+            results = completer.completer.results_model.stringList()
+            if not popup.isVisible() or 'helper_1' not in results:
+                raise RuntimeError(f"module_completions: sem sugestões de bench_utils ({results})")
+            popup.hide()
+        return samples, {'requests': len(samples)}
+
+    def run(self, names=None):
+        """Executa os cenários e retorna o relatório"""
+        results = {}
+        for name, scenario in self.scenarios.items():
+            if names and name not in names:
+                continue
+            status(f"▶️ {name}...")
+            start = time.perf_counter()
+            samples, extra = scenario()
+            wall_ms = (time.perf_counter() - start) * 1000
+            results[name] = {
+                'wall_time_ms': round(wall_ms, 3),
+                'peak_rss_kb': peak_rss_kb(),
+                'latency_ms': percentiles(samples),
+            }
+            results[name].update(extra)
+        return {
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'scale': self.scale,
+            'scenarios': results
+        }
+
+    def close(self):
+        """Faz o encerramento que a IDE faria ao sair.
+
+        Sem o laço de eventos, ``aboutToQuit`` nunca é emitido; é ele que
+        encerra o InterpreterPool (processos ociosos) e as threads de análise.
+        """
+        self.app.aboutToQuit.emit()
+
+
+def run_isolated(names, scale):
+    """Executa cada cenário num processo filho e junta os relatórios"""
+    report = None
+    for name in names:
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker',
+                                '--scale', repr(scale), '--scenario', name],
+                               stdout=subprocess.PIPE, check=True)
+        result = json.loads(child.stdout)
+        if report is None:
+            report = result
+        else:
+            report['scenarios'].update(result['scenarios'])
+    return report
+
+
+def compare_with_baseline(report, baseline, tolerance, min_delta_ms, min_delta_kb):
+    """Retorna a lista de regressões em relação ao baseline"""
+    regressions = []
+    for name, result in report['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if not base:
+            continue
+        metrics = [
+            ('wall_time_ms', result['wall_time_ms'], base.get('wall_time_ms'), min_delta_ms, 'ms'),
+            ('latency_ms.p90', result['latency_ms'].get('p90'), base.get('latency_ms', {}).get('p90'),
+             min_delta_ms, 'ms'),
+            ('peak_rss_kb', result.get('peak_rss_kb'), base.get('peak_rss_kb'), min_delta_kb, 'KB'),
+        ]
+        for metric, current, previous, min_delta, unit in metrics:
+            if current is None or previous is None:
+                continue
+            if current > previous * (1 + tolerance) and current - previous > min_delta:
+                regressions.append(f"{name}.{metric}: {previous:.1f} -> {current:.1f} {unit}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks headless do PyPy IDE")
+    parser.add_argument('--output', help="arquivo JSON para o relatório (padrão: stdout)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline para comparação")
+    parser.add_argument('--update-baseline', action='store_true', help="grava o relatório como baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="piora relativa tolerada (0.25 = 25%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help="diferença absoluta mínima para regressão")
+    parser.add_argument('--min-delta-kb', type=float, default=10240,
+                        help="aumento mínimo do pico de memória para regressão")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiplica o tamanho dos cenários")
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS,
+                        help="executa só o cenário informado")
+    # Processo filho de run_isolated: roda os cenários aqui e só imprime o relatório
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        runner = BenchmarkRunner(scale=args.scale)
+        try:
+            report = runner.run(args.scenario)
+        finally:
+            runner.close()
+        print(json.dumps(report))
+        return 0
+
+    report = run_isolated(args.scenario or SCENARIOS, args.scale)
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+        status(f"✅ Baseline gravado em {args.baseline}")
+        return 0
+
+    # Sem baseline comparável o portão não pode passar em silêncio
+    if not os.path.exists(args.baseline):
+        status(f"❌ Nenhum baseline em {args.baseline}; use --update-baseline para criar")
+        return 2
+
+    with open(args.baseline, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    if baseline.get('scale') != report['scale']:
+        status(f"❌ Baseline gerado com --scale {baseline.get('scale')}, não {report['scale']}; "
+               f"use a mesma escala ou --update-baseline")
+        return 2
+
+    regressions = compare_with_baseline(report, baseline, args.tolerance,
+                                        args.min_delta_ms, args.min_delta_kb)
+    if regressions:
+        status("❌ Regressões de desempenho:")
+        for regression in regressions:
+            status(f"  {regression}")
+        return 1
+    status("✅ Nenhuma regressão em relação ao baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,103 +1,593 @@
+import re
+import bisect
+import heapq
 import keyword
 import builtins
-from PyQt5.QtWidgets import QCompleter, QAbstractItemView
-from PyQt5.QtGui import QStandardItemModel, QStandardItem
-from PyQt5.QtCore import Qt
-from .package_manager import get_installed_packages
+import itertools
+import threading
+from PyQt5.QtWidgets import QCompleter, QAbstractItemView, QApplication
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtCore import Qt, QStringListModel, QThread, QTimer, pyqtSignal
+from .package_manager import get_installed_modules
+from .constants import EDITOR_CONFIG
+from .performance import timed
+from .symbols import get_symbol_worker
+from .workspace_index import workspace_index
+from .introspection import get_module_inspector, ModuleAttributes
+
+
+# Número máximo de sugestões mostradas no popup
+MAX_COMPLETIONS = 50
+
+# Máximo de candidatos fuzzy avaliados por busca
+MAX_FUZZY_CANDIDATES = 500
+
+# Acima deste número de palavras alteradas o índice é refeito numa passada
+INCREMENTAL_UPDATE_LIMIT = 256
+
+
+def fuzzy_score(query, key, word):
+    """Pontua ``word`` como subsequência de ``query`` (ambos minúsculos em
+    ``query``/``key``). Retorna None se não casar; maior é melhor."""
+    # lower() pode mudar o tamanho (ex.: "İ"); aí não há como achar o camelCase em ``word``
+    camel_case = len(key) == len(word)
+    score = 0
+    pos = 0
+    previous = -2
+    for char in query:
+        index = key.find(char, pos)
+        if index < 0:
+            return None
+        if index == previous + 1:
+            score += 5  # letras consecutivas
+        if index == 0 or key[index - 1] in '_.' or \
+                (camel_case and word[index].isupper() and word[index - 1].islower()):
+            score += 3  # início de palavra, snake_case ou camelCase
+        score -= index - pos  # letras puladas
+        previous = index
+        pos = index + 1
+    return score - len(key) * 0.1
+
+
+def segments_of(words):
+    """Trechos internos de snake_case e camelCase: [(trecho minúsculo, palavra)]"""
+    segments = []
+    for word in words:
+        for position in range(1, len(word)):
+            previous, char = word[position - 1], word[position]
+            if (previous in '_.' and char not in '_.') or (char.isupper() and previous.islower()):
+                segments.append((word[position:].lower(), word))
+    return segments
+
+
+class CompletionIndex:
+    """Índice persistente do vocabulário de autocompletar.
+
+    As palavras ficam ordenadas pela forma minúscula, então as que começam
+    com o texto digitado saem de uma busca binária. Se faltarem sugestões,
+    procura subsequências (fuzzy) entre as palavras com a mesma letra
+    inicial, com uma regex sobre o texto concatenado do grupo, e por fim
+    palavras com um trecho de snake_case/camelCase começando pelo texto
+    (``path`` encontra ``os_path`` e ``basePath``).
+    """
+
+    def __init__(self, words=()):
+        self.words = []
+        self.keys = []
+        self.word_set = set()
+        self._buckets = {}  # letra inicial -> (texto, offsets, chaves, palavras)
+        self._segments = []  # (trecho minúsculo, palavra), em ordem
+        self.lock = threading.Lock()  # buscas rodam no CompletionWorker
+        if words:
+            self.add_words(words)
+
+    def __len__(self):
+        return len(self.words)
+
+    def add_words(self, words):
+        """Adiciona palavras ao índice (duplicadas são ignoradas)"""
+        self.update_words(added=words)
+
+    def remove_words(self, words):
+        """Remove palavras do índice"""
+        self.update_words(removed=words)
+
+    def update_words(self, added=(), removed=()):
+        """Adiciona e remove palavras numa única atualização.
+
+        Só os grupos fuzzy das letras iniciais afetadas e os trechos das
+        palavras alteradas são refeitos; o resto do índice fica como está.
+        """
+        with self.lock:
+            removed = self.word_set.intersection(removed)
+            self.word_set -= removed
+            added = {word for word in added if word and word not in self.word_set}
+            if not added and not removed:
+                return
+            self.word_set |= added
+
+            new_pairs = sorted((word.lower(), word) for word in added)
+            new_segments = sorted(segments_of(added))
+            if len(added) + len(removed) > INCREMENTAL_UPDATE_LIMIT:
+                # Muitas mudanças: refaz as listas numa passada. As partes já
+                # estão ordenadas, então o sort só as intercala
+                old_pairs = {(word.lower(), word) for word in removed}
+                pairs = sorted([pair for pair in zip(self.keys, self.words) if pair not in old_pairs]
+                               + new_pairs)
+                self.keys = [key for key, _ in pairs]
+                self.words = [word for _, word in pairs]
+                old_segments = set(segments_of(removed))
+                self._segments = sorted([segment for segment in self._segments
+                                         if segment not in old_segments] + new_segments)
+            else:
+                for word in removed:
+                    position = self._find_pair(word.lower(), word)
+                    del self.keys[position]
+                    del self.words[position]
+                for key, word in new_pairs:
+                    position = self._find_pair(key, word)
+                    self.keys.insert(position, key)
+                    self.words.insert(position, word)
+                for segment in segments_of(removed):
+                    del self._segments[bisect.bisect_left(self._segments, segment)]
+                for segment in new_segments:
+                    bisect.insort(self._segments, segment)
+
+            for letter in {word.lower()[:1] for word in added | removed}:
+                self._rebuild_bucket(letter)
+
+    def _find_pair(self, key, word):
+        """Posição de ``(key, word)`` na ordem de ``keys``/``words``"""
+        position = bisect.bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key and self.words[position] < word:
+            position += 1
+        return position
+
+    def _rebuild_bucket(self, letter):
+        """Recria o texto da busca fuzzy das palavras que começam com ``letter``"""
+        start = bisect.bisect_left(self.keys, letter)
+        end = bisect.bisect_left(self.keys, letter + '\U0010ffff', start)
+        if start == end:
+            self._buckets.pop(letter, None)
+            return
+        keys = self.keys[start:end]
+        offsets = list(itertools.accumulate((len(key) + 1 for key in keys[:-1]), initial=0))
+        self._buckets[letter] = ('\n' + '\n'.join(keys), offsets, keys, self.words[start:end])
+
+    @timed('completion_search')
+    def search(self, query, limit=MAX_COMPLETIONS):
+        """Retorna até ``limit`` sugestões ordenadas por relevância"""
+        with self.lock:
+            return self._search(query.lower(), limit)
+
+    def _search(self, query, limit):
+        """Busca em três etapas: prefixo, subsequência e trechos de palavra"""
+        if not query or not self.keys:
+            return []
+
+        # 1) Prefixo, em ordem alfabética
+        start = bisect.bisect_left(self.keys, query)
+        end = bisect.bisect_left(self.keys, query + '\U0010ffff', start)
+        results = self.words[start:min(end, start + limit)]
+        if len(results) >= limit:
+            return results
+        seen = set(results)
+
+        # 2) Subsequência começando pela mesma letra, ordenada por pontuação
+        bucket = self._buckets.get(query[0])
+        if bucket and len(query) > 1:
+            text, offsets, keys, words = bucket
+            # Classes negadas evitam backtracking: cada letra casa na primeira ocorrência
+            pattern = '\n' + re.escape(query[0]) + ''.join(
+                '[^\n%s]*%s' % (re.escape(char), re.escape(char)) for char in query[1:])
+            scored = []
+            for match in re.finditer(pattern, text):
+                index = bisect.bisect_right(offsets, match.start()) - 1
+                if words[index] in seen:
+                    continue
+                score = fuzzy_score(query, keys[index], words[index])
+                if score is not None:
+                    scored.append((-score, keys[index], words[index]))
+                if len(scored) >= MAX_FUZZY_CANDIDATES:
+                    break
+            for _, _, word in heapq.nsmallest(limit - len(results), scored):
+                results.append(word)
+                seen.add(word)
+            if len(results) >= limit:
+                return results
+
+        # 3) Trechos de snake_case/camelCase começando pelo texto
+        start = bisect.bisect_left(self._segments, (query,))
+        end = bisect.bisect_left(self._segments, (query + '\U0010ffff',), start)
+        for _, word in self._segments[start:end]:
+            if word not in seen:
+                seen.add(word)
+                results.append(word)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+class CompletionWorker(QThread):
+    """Calcula sugestões de autocompletar fora da thread da interface.
+
+    Guarda só o pedido mais recente de cada editor: um pedido novo
+    substitui o anterior que ainda não começou a ser processado. Cada
+    pedido consulta uma lista de fontes (objetos com ``search``), em
+    ordem de prioridade, e junta os resultados sem repetição.
+    """
+    results_signal = pyqtSignal(int, list)
+
+    def __init__(self):
+        super().__init__()
+        self.condition = threading.Condition()
+        self.pending = {}  # dono -> (id do pedido, fontes, palavra)
+        self.running = True
+        self.request_ids = itertools.count(1)
+
+    def submit(self, owner, sources, word):
+        """Agenda uma busca e retorna o id do pedido"""
+        request_id = next(self.request_ids)
+        with self.condition:
+            self.pending[owner] = (request_id, sources, word)
+            self.condition.notify()
+        return request_id
+
+    def cancel(self, owner):
+        """Descarta o pedido pendente de um editor"""
+        with self.condition:
+            self.pending.pop(owner, None)
+
+    def stop(self, *args):
+        """Encerra a thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                _, (request_id, sources, word) = self.pending.popitem()
+            try:
+                results = []
+                for source in sources:
+                    results.extend(match for match in source.search(word) if match not in results)
+                    if len(results) >= MAX_COMPLETIONS:
+                        break
+                results = results[:MAX_COMPLETIONS]
+            except Exception as e:
+                print(f"Erro ao calcular sugestões: {e}")
+                results = []
+            self.results_signal.emit(request_id, results)
+
+
+_completion_worker = None
+
+
+def get_completion_worker():
+    """Retorna a thread de autocompletar compartilhada, criando-a se necessário"""
+    global _completion_worker
+    if _completion_worker is None:
+        _completion_worker = CompletionWorker()
+        QApplication.instance().aboutToQuit.connect(_completion_worker.stop)
+        _completion_worker.start()
+    return _completion_worker
+
+
+def python_words():
+    """Palavras-chave, built-ins, bibliotecas e métodos comuns do Python"""
+    completions = []
+    
+    # Palavras-chave do Python
+    completions.extend(keyword.kwlist)
+    
+    # Funções built-in
+    completions.extend(dir(builtins))
+    
+    # Bibliotecas comuns
+    common_libs = [
+        'os', 'sys', 're', 'json', 'datetime', 'time', 'random',
+        'math', 'collections', 'itertools', 'functools', 'pathlib',
+        'requests', 'numpy', 'pandas', 'matplotlib', 'seaborn',
+        'tkinter', 'PyQt5', 'flask', 'django', 'sqlite3'
+    ]
+    completions.extend(common_libs)
+    
+    # Métodos comuns
+    methods = [
+        'append', 'extend', 'insert', 'remove', 'pop', 'clear',
+        'index', 'count', 'sort', 'reverse', 'copy', 'len',
+        'print', 'input', 'range', 'enumerate', 'zip', 'map',
+        'filter', 'reduce', 'sum', 'min', 'max', 'abs', 'round',
+        'str', 'int', 'float', 'bool', 'list', 'tuple', 'dict',
+        'set', 'frozenset', 'open', 'read', 'write', 'close'
+    ]
+    completions.extend(methods)
+    return completions
+
+
+class CompletionVocabulary:
+    """Vocabulário de autocompletar único do processo, lido por todos os editores.
+
+    As palavras vêm de fontes nomeadas ('python', 'packages', símbolos do
+    projeto...). Atualizar uma fonte só acrescenta ou remove a diferença no
+    índice compartilhado; uma palavra só sai quando nenhuma fonte a contém.
+    """
+
+    def __init__(self):
+        self.index = CompletionIndex()
+        self.sources = {}  # nome da fonte -> conjunto de palavras
+        self.lock = threading.Lock()
+
+    def get_index(self):
+        """Retorna o índice compartilhado, criando o vocabulário básico na primeira vez"""
+        if 'python' not in self.sources:
+            self.set_source('python', python_words())
+        return self.index
+
+    def set_source(self, name, words):
+        """Substitui as palavras de uma fonte, atualizando o índice pela diferença"""
+        with self.lock:
+            words = set(words)
+            previous = self.sources.get(name, set())
+            self.sources[name] = words
+            others = [source for key, source in self.sources.items() if key != name]
+            removed = {word for word in previous - words
+                       if not any(word in source for source in others)}
+            self.index.update_words(added=words - previous, removed=removed)
+
+    def update_packages(self):
+        """Atualiza a fonte de pacotes instalados"""
+        try:
+            self.set_source('packages', get_installed_modules())
+        except Exception as e:
+            print(f"Erro ao atualizar autocompletar: {e}")
+
+
+# Instância global
+completion_vocabulary = CompletionVocabulary()
 
 
 class PythonCompleter(QCompleter):
-    """Autocompletar para Python"""
+    """Popup de autocompletar para Python"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setup_completions()
         self.setCaseSensitivity(Qt.CaseInsensitive)
         self.setCompletionMode(QCompleter.PopupCompletion)
         self.setWrapAround(False)
-    
-    def setup_completions(self):
-        """Configura as sugestões de autocompletar"""
-        completions = []
         
-        # Palavras-chave do Python
-        completions.extend(keyword.kwlist)
-        
-        # Funções built-in
-        completions.extend(dir(builtins))
-        
-        # Bibliotecas comuns
-        common_libs = [
-            'os', 'sys', 're', 'json', 'datetime', 'time', 'random',
-            'math', 'collections', 'itertools', 'functools', 'pathlib',
-            'requests', 'numpy', 'pandas', 'matplotlib', 'seaborn',
-            'tkinter', 'PyQt5', 'flask', 'django', 'sqlite3'
-        ]
-        completions.extend(common_libs)
-        
-        # Métodos comuns
-        methods = [
-            'append', 'extend', 'insert', 'remove', 'pop', 'clear',
-            'index', 'count', 'sort', 'reverse', 'copy', 'len',
-            'print', 'input', 'range', 'enumerate', 'zip', 'map',
-            'filter', 'reduce', 'sum', 'min', 'max', 'abs', 'round',
-            'str', 'int', 'float', 'bool', 'list', 'tuple', 'dict',
-            'set', 'frozenset', 'open', 'read', 'write', 'close'
-        ]
-        completions.extend(methods)
-        
-        # Cria o modelo
-        model = QStandardItemModel()
-        for completion in sorted(set(completions)):
-            item = QStandardItem(completion)
-            model.appendRow(item)
-        
-        self.setModel(model)
+        # O vocabulário fica no índice compartilhado; cada popup só tem o
+        # modelo que recebe os resultados
+        self.index = completion_vocabulary.get_index()
+        self.results_model = QStringListModel()
+        self.setModel(self.results_model)
     
     def update_completions(self):
         """Atualiza as sugestões com pacotes instalados"""
-        try:
-            installed_packages = get_installed_packages()
-            model = self.model()
-            
-            # Adiciona pacotes instalados
-            for package in installed_packages:
-                item = QStandardItem(package)
-                model.appendRow(item)
-                
-        except Exception as e:
-            print(f"Erro ao atualizar autocompletar: {e}")
+        completion_vocabulary.update_packages()
+    
+    def set_results(self, results):
+        """Troca o conteúdo do modelo de sugestões"""
+        self.results_model.setStringList(results)
+
+
+# "modulo.sub." logo antes da palavra (mas não "f().x." nem "lista[0].x.")
+MODULE_ACCESS_PATTERN = re.compile(r'(?<![\w.)\]])([A-Za-z_][\w.]*)\.$')
 
 
 class CodeEditorCompleter:
-    """Integra autocompletar com o editor de código"""
+    """Integra autocompletar com o editor de código.
+
+    Só a digitação de um caractere na posição do cursor dispara sugestões;
+    cargas com setPlainText, colagens e snippets são ignorados. A busca
+    espera uma pausa na digitação, roda no CompletionWorker e o resultado
+    só é mostrado se o cursor e a palavra ainda forem os do pedido.
+
+    Qualquer edição também reagenda a análise do documento no SymbolWorker;
+    os nomes visíveis no escopo do cursor vêm primeiro, depois os definidos
+    no workspace e por fim o vocabulário comum.
+    Se o código não compilar, a última tabela de símbolos válida é mantida.
+
+    Depois de "modulo." as sugestões são os atributos do módulo importado,
+    listados pelo ModuleInspector; na primeira vez o pedido espera o
+    inspetor e é refeito quando o resultado chega. Módulos que o inspetor
+    não lista (os do próprio projeto) usam as definições do workspace e,
+    sem elas, as fontes comuns.
+    """
     
     def __init__(self, editor):
         self.editor = editor
-        self.completer = PythonCompleter(editor)
+        self.index = completion_vocabulary.get_index()
+        self._completer = None  # popup criado só na primeira sugestão
+        self.worker = get_completion_worker()
+        self.symbol_worker = get_symbol_worker()
+        self.inspector = get_module_inspector()
+        self.symbols = None  # última SymbolTable válida
+        self.waiting_module = None  # módulo cujos atributos ainda estão sendo listados
+        self.symbol_request = None
+        self.request_id = None
+        self.request_position = None
+        self.request_word = None
         self.setup_completer()
     
+    @property
+    def completer(self):
+        """Popup de sugestões do editor"""
+        if self._completer is None:
+            self._completer = PythonCompleter(self.editor)
+            self._completer.setWidget(self.editor)
+            self._completer.activated.connect(self.insert_completion)
+        return self._completer
+    
+    def popup_visible(self):
+        return self._completer is not None and self._completer.popup().isVisible()
+    
+    def hide_popup(self):
+        if self._completer is not None:
+            self._completer.popup().hide()
+    
     def setup_completer(self):
         """Configura o autocompletar no editor"""
-        self.completer.setWidget(self.editor)
-        self.completer.activated.connect(self.insert_completion)
+        self.debounce_timer = QTimer(self.editor)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(EDITOR_CONFIG['completion_delay_ms'])
+        self.debounce_timer.timeout.connect(self.request_completions)
+        
+        self.parse_timer = QTimer(self.editor)
+        self.parse_timer.setSingleShot(True)
+        self.parse_timer.setInterval(EDITOR_CONFIG['symbol_parse_delay_ms'])
+        self.parse_timer.timeout.connect(self.request_symbols)
+        if not self.editor.document().isEmpty():
+            self.parse_timer.start()
         
         # Conecta eventos do editor
-        self.editor.textChanged.connect(self.handle_text_change)
+        self.editor.document().contentsChange.connect(self.handle_text_change)
+        self.editor.cursorPositionChanged.connect(self.handle_cursor_moved)
+        self.worker.results_signal.connect(self.handle_results)
+        self.symbol_worker.table_signal.connect(self.handle_symbols)
+        self.inspector.attributes_signal.connect(self.handle_module_ready)
+        self.editor.destroyed.connect(self.detach)
+    
+    def detach(self, *args):
+        """Desliga o editor destruído da thread de autocompletar"""
+        # No fim do programa os workers podem já ter sido destruídos (RuntimeError)
+        steps = (lambda: self.worker.cancel(id(self)),
+                 lambda: self.symbol_worker.forget(id(self)),
+                 lambda: self.worker.results_signal.disconnect(self.handle_results),
+                 lambda: self.symbol_worker.table_signal.disconnect(self.handle_symbols),
+                 lambda: self.inspector.attributes_signal.disconnect(self.handle_module_ready))
+        for step in steps:
+            try:
+                step()
+            except (TypeError, RuntimeError):
+                pass
     
     def insert_completion(self, completion):
-        """Insere a sugestão selecionada"""
+        """Insere a sugestão selecionada no lugar da palavra digitada"""
         cursor = self.editor.textCursor()
+        word = self.get_current_word(cursor)
+        cursor.movePosition(QTextCursor.Left, QTextCursor.KeepAnchor, len(word))
         cursor.insertText(completion)
         self.editor.setTextCursor(cursor)
     
-    def handle_text_change(self):
-        """Manipula mudanças no texto para mostrar sugestões"""
+    @timed('handle_text_change')
+    def handle_text_change(self, position, removed, added):
+        """Reinicia a espera quando um caractere é digitado ou apagado"""
+        if added != removed:
+            self.parse_timer.start()
+        
+        typed = added == 1 and removed == 0
+        erased = added == 0 and removed == 1 and self.popup_visible()
+        if typed or erased:
+            self.cancel_request()
+            self.debounce_timer.start()
+        elif added != removed:
+            # Edição que não é digitação (carga de arquivo, colagem, snippet)
+            self.cancel_request()
+            self.debounce_timer.stop()
+            self.hide_popup()
+    
+    def handle_cursor_moved(self):
+        """Cancela o pedido em andamento se o cursor sair da posição dele"""
+        if self.request_id is not None and \
+                self.editor.textCursor().position() != self.request_position:
+            self.cancel_request()
+    
+    def cancel_request(self):
+        """Descarta o pedido em andamento"""
+        self.waiting_module = None
+        if self.request_id is not None:
+            self.worker.cancel(id(self))
+            self.request_id = None
+    
+    def request_completions(self):
+        """Envia a palavra atual para a thread de autocompletar"""
         cursor = self.editor.textCursor()
         current_word = self.get_current_word(cursor)
+        line = cursor.block().text()[:cursor.positionInBlock() - len(current_word)]
+        attributes = line.endswith('self.')
+        indent = len(line) - len(line.lstrip())
+        module = None if attributes else self.module_before(line, cursor.blockNumber() + 1, indent)
+        
+        source = None
+        if module is not None and not cursor.hasSelection():
+            # Atributos de módulo aparecem logo depois do ponto
+            source = self.inspector.lookup(module)
+            if source is None:
+                self.waiting_module = module  # refeito em handle_module_ready
+                self.hide_popup()
+                return
+            if not source.names:
+                # Módulo do projeto, que o inspetor não importa
+                names = workspace_index.module_definitions(module)
+                source = ModuleAttributes(names) if names else None
         
-        if len(current_word) >= 2:  # Mostra sugestões após 2 caracteres
-            self.show_completions(current_word, cursor)
+        if source is not None:
+            self.request_position = cursor.position()
+            self.request_word = current_word
+            self.request_id = self.worker.submit(id(self), [source], current_word)
+        # Mostra sugestões após 2 caracteres (1 depois de "self.")
+        elif len(current_word) >= (1 if attributes else 2) and not cursor.hasSelection():
+            sources = []
+            if self.symbols is not None:
+                sources.append(self.symbols.source_at(cursor.blockNumber() + 1, indent, attributes))
+            if not attributes:
+                sources.append(workspace_index)
+                sources.append(self.index)
+            self.request_position = cursor.position()
+            self.request_word = current_word
+            self.request_id = self.worker.submit(id(self), sources, current_word)
+        else:
+            self.hide_popup()
+    
+    def module_before(self, line, number, indent):
+        """Nome completo do módulo acessado antes da palavra ("np." -> "numpy")"""
+        match = MODULE_ACCESS_PATTERN.search(line)
+        if match is None:
+            return None
+        head, dot, rest = match.group(1).partition('.')
+        target = None
+        if self.symbols is not None:
+            target = self.symbols.import_at(number, head, indent)
+            if target is None and self.symbols.definition_at(number, head, indent):
+                return None  # variável local, não um módulo
+        # Sem import conhecido (tabela ainda não analisada), tenta o nome como está
+        return (target or head) + dot + rest
+    
+    def handle_module_ready(self, module):
+        """Refaz o pedido que esperava os atributos deste módulo"""
+        if module == self.waiting_module:
+            self.waiting_module = None
+            self.request_completions()
+    
+    def request_symbols(self):
+        """Envia o texto do documento para análise"""
+        self.symbol_request = self.symbol_worker.submit(id(self), self.editor.toPlainText())
+    
+    def handle_symbols(self, request_id, table):
+        """Guarda a nova tabela de símbolos (None = código não compila)"""
+        if request_id != self.symbol_request:
+            return
+        self.symbol_request = None
+        if table is not None:
+            self.symbols = table
+    
+    def handle_results(self, request_id, results):
+        """Mostra o resultado se ele ainda vale para a posição do cursor"""
+        if request_id != self.request_id:
+            return
+        self.request_id = None
+        cursor = self.editor.textCursor()
+        if cursor.hasSelection() or cursor.position() != self.request_position or \
+                self.get_current_word(cursor) != self.request_word:
+            return
+        self.show_completions(results)
     
     def get_current_word(self, cursor):
         """Obtém a palavra atual do cursor"""
@@ -111,20 +601,10 @@ class CodeEditorCompleter:
         
         return line[start:position]
     
-    def show_completions(self, word, cursor):
+    def show_completions(self, results):
         """Mostra sugestões de autocompletar"""
-        # Filtra sugestões baseadas na palavra atual
-        model = self.completer.model()
-        filtered_model = QStandardItemModel()
-        
-        for i in range(model.rowCount()):
-            item = model.item(i)
-            if item and word.lower() in item.text().lower():
-                new_item = QStandardItem(item.text())
-                filtered_model.appendRow(new_item)
-        
-        if filtered_model.rowCount() > 0:
-            self.completer.setModel(filtered_model)
+        if results:
+            self.completer.set_results(results)
             
             # Posiciona o popup
             rect = self.editor.cursorRect()
@@ -132,11 +612,11 @@ class CodeEditorCompleter:
             
             self.completer.complete(rect)
         else:
-            self.completer.popup().hide()
+            self.hide_popup()
     
     def update_package_completions(self):
         """Atualiza sugestões com pacotes instalados"""
-        self.completer.update_completions()
+        completion_vocabulary.update_packages()
 
 
 class SnippetManager:
@@ -1,7 +1,46 @@
-from PyQt5.QtWidgets import QPlainTextEdit, QWidget, QTextEdit
-from PyQt5.QtGui import QFont, QColor, QPainter, QTextCharFormat, QPen, QBrush
-from PyQt5.QtCore import Qt, QRect, QSize
+import time
+from PyQt5.QtWidgets import (QPlainTextEdit, QWidget, QTextEdit, QToolTip, QScrollBar, QStyle,
+                             QStyleOptionSlider, QInputDialog)
+from PyQt5.QtGui import (QFont, QFontMetrics, QColor, QPainter, QTextCharFormat, QTextCursor, QPen,
+                         QBrush)
+from PyQt5.QtCore import Qt, QRect, QSize, QPoint, QEvent, pyqtSignal
 from .constants import DRACULA_COLORS, EDITOR_CONFIG
+from .performance import performance_monitor, timed
+from .line_markers import LineMarkers
+
+
+def heat_color(intensity):
+    """Cor do mapa de calor: amarelo transparente (frio) a vermelho forte (quente)"""
+    intensity = min(max(intensity, 0.0), 1.0)
+    return QColor.fromHsvF((1.0 - intensity) * 0.16, 0.9, 1.0, 0.2 + 0.6 * intensity)
+
+
+class MarkerScrollBar(QScrollBar):
+    """Barra de rolagem que mostra marcas coloridas na posição das linhas"""
+
+    def __init__(self, editor):
+        super().__init__(Qt.Vertical, editor)
+        self.editor = editor
+        self.marks = {}  # linha -> QColor
+
+    def setMarks(self, marks):
+        self.marks = dict(marks)
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.marks:
+            return
+        option = QStyleOptionSlider()
+        self.initStyleOption(option)
+        groove = self.style().subControlRect(QStyle.CC_ScrollBar, option,
+                                             QStyle.SC_ScrollBarGroove, self)
+        lines = max(1, self.editor.blockCount())
+        height = max(2, groove.height() // lines)
+        painter = QPainter(self)
+        for line, color in self.marks.items():
+            top = groove.top() + (line - 1) * groove.height() // lines
+            painter.fillRect(groove.left() + 2, top, groove.width() - 4, height, color)
 
 
 class LineNumberArea(QWidget):
@@ -17,9 +56,25 @@ class LineNumberArea(QWidget):
     def paintEvent(self, event):
         self.codeEditor.lineNumberAreaPaintEvent(event)
 
+    def mousePressEvent(self, event):
+        self.codeEditor.lineNumberAreaMousePressEvent(event)
+
+    def event(self, event):
+        """Mostra a dica das marcas da linha sob o mouse"""
+        if event.type() == QEvent.ToolTip:
+            tip = self.codeEditor.lineToolTipAt(event.pos().y())
+            if tip:
+                QToolTip.showText(event.globalPos(), tip, self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(event)
+
 
 class CodeEditor(QPlainTextEdit):
     """Editor de código com numeração de linhas e breakpoints"""
+    definition_requested = pyqtSignal()  # Ctrl+clique sobre um nome
+    breakpoints_changed = pyqtSignal()
     
     def __init__(self):
         super().__init__()
@@ -42,10 +97,20 @@ class CodeEditor(QPlainTextEdit):
         """)
         
         self.lineNumberArea = LineNumberArea(self)
-        self.breakpoints = set()  # Para armazenar os breakpoints
+        # Breakpoints (valor: condição, vazia = sempre) e bookmarks, presos aos blocos
+        self.markers = LineMarkers(self.document(), self)
+        self.markers.changed.connect(self.markersChanged)
+        self.execution_line = None  # linha onde o depurador parou
+        self.line_badges = {}  # linha -> (texto, dica), ex.: tempos do profiler
+        self.badge_width = 0
+        self.line_heat = {}  # linha -> (intensidade de 0 a 1, dica), ex.: mapa de calor
+        self.setVerticalScrollBar(MarkerScrollBar(self))
+        self._keystroke_time = None  # Início da tecla ainda não pintada
 
         # Conectar sinais
         self.blockCountChanged.connect(self.updateLineNumberAreaWidth)
+        self.blockCountChanged.connect(self.clearLineBadges)
+        self.blockCountChanged.connect(self.clearLineHeat)
         self.updateRequest.connect(self.updateLineNumberArea)
         self.cursorPositionChanged.connect(self.highlightCurrentLine)
 
@@ -55,8 +120,58 @@ class CodeEditor(QPlainTextEdit):
         """Calcula a largura da área de numeração de linhas"""
         digits = len(str(self.blockCount()))
         space = 8 + self.fontMetrics().horizontalAdvance('9') * digits
+        if self.line_badges:
+            space += self.badge_width + 6
         return max(space, 50)  # Mínimo de 50px
 
+    def badgeFont(self):
+        """Fonte menor para as marcas (o tema pode definir o tamanho em pixels)"""
+        font = QFont(self.font())
+        if font.pointSizeF() > 0:
+            font.setPointSizeF(font.pointSizeF() * 0.8)
+        else:
+            font.setPixelSize(max(1, int(font.pixelSize() * 0.8)))
+        return font
+
+    def badgeWidth(self):
+        metrics = QFontMetrics(self.badgeFont())
+        return max(metrics.horizontalAdvance(text) for text, tip in self.line_badges.values())
+
+    def setLineBadges(self, badges):
+        """Mostra marcas ao lado dos números de linha: {linha: (texto, dica)}"""
+        self.line_badges = dict(badges)
+        self.badge_width = self.badgeWidth() if self.line_badges else 0
+        self.updateLineNumberAreaWidth(0)
+        cr = self.contentsRect()
+        self.lineNumberArea.setGeometry(QRect(cr.left(), cr.top(), self.lineNumberAreaWidth(), cr.height()))
+        self.lineNumberArea.update()
+
+    def clearLineBadges(self, *args):
+        """Remove as marcas (as linhas mudaram de lugar)"""
+        if self.line_badges:
+            self.setLineBadges({})
+
+    def setLineHeat(self, heat):
+        """Pinta o fundo dos números de linha e marca a barra de rolagem: {linha: (intensidade, dica)}"""
+        self.line_heat = dict(heat)
+        self.verticalScrollBar().setMarks({line: heat_color(intensity)
+                                           for line, (intensity, tip) in self.line_heat.items()})
+        self.lineNumberArea.update()
+
+    def clearLineHeat(self, *args):
+        """Remove o mapa de calor (as linhas mudaram de lugar)"""
+        if self.line_heat:
+            self.setLineHeat({})
+
+    def lineToolTipAt(self, y):
+        """Dicas das marcas da linha na altura ``y`` da área de numeração"""
+        line = self.cursorForPosition(QPoint(0, y)).blockNumber() + 1
+        tips = [marks[line][1] for marks in (self.line_badges, self.line_heat) if line in marks]
+        condition = self.markers.value(line, 'breakpoint')
+        if condition:
+            tips.append(f"Breakpoint condicional: {condition}")
+        return '\n'.join(tips)
+
     def updateLineNumberAreaWidth(self, _):
         """Atualiza a largura da área de numeração"""
         self.setViewportMargins(self.lineNumberAreaWidth(), 0, 0, 0)
@@ -92,16 +207,75 @@ class CodeEditor(QPlainTextEdit):
             selection.cursor.clearSelection()
             extraSelections.append(selection)
 
+        if self.execution_line is not None:
+            block = self.document().findBlockByNumber(self.execution_line - 1)
+            if block.isValid():
+                selection = QTextEdit.ExtraSelection()
+                lineColor = QColor(DRACULA_COLORS['function'])
+                lineColor.setAlpha(60)
+                selection.format.setBackground(lineColor)
+                selection.format.setProperty(QTextCharFormat.FullWidthSelection, True)
+                selection.cursor = QTextCursor(block)
+                extraSelections.append(selection)
+
         self.setExtraSelections(extraSelections)
 
-    def toggleBreakpoint(self, block_number):
+    def breakpoints(self):
+        """{linha: condição} dos breakpoints (condição vazia = sempre)"""
+        return self.markers.items('breakpoint')
+
+    def toggleBreakpoint(self, line):
         """Alternar breakpoint na linha especificada"""
-        if block_number in self.breakpoints:
-            self.breakpoints.remove(block_number)
+        if self.markers.value(line, 'breakpoint') is None:
+            self.markers.set(line, 'breakpoint', '')
+        else:
+            self.markers.remove(line, 'breakpoint')
+
+    def setBreakpointCondition(self, line, condition):
+        """Cria o breakpoint da linha, parando só quando a condição for verdadeira"""
+        self.markers.set(line, 'breakpoint', condition)
+
+    def toggleBookmark(self):
+        """Marca ou desmarca a linha do cursor"""
+        line = self.textCursor().blockNumber() + 1
+        if self.markers.value(line, 'bookmark') is None:
+            self.markers.set(line, 'bookmark')
         else:
-            self.breakpoints.add(block_number)
-        self.viewport().update()
+            self.markers.remove(line, 'bookmark')
+
+    def gotoMarker(self, kind, backwards=False):
+        """Leva o cursor à próxima (ou anterior) linha com a marca ``kind``"""
+        line = self.markers.next_line(kind, self.textCursor().blockNumber() + 1, backwards)
+        if line is None:
+            return False
+        self.setTextCursor(QTextCursor(self.document().findBlockByNumber(line - 1)))
+        self.centerCursor()
+        return True
+
+    def markersChanged(self, kind):
+        self.lineNumberArea.update()
+        if kind == 'breakpoint':
+            self.breakpoints_changed.emit()
+
+    def setExecutionLine(self, line):
+        """Destaca a linha onde o programa está parado (None remove o destaque)"""
+        self.execution_line = line
+        self.highlightCurrentLine()
 
+    def keyPressEvent(self, event):
+        """Marca o início da tecla para medir o tempo até a pintura"""
+        if performance_monitor.enabled and self._keystroke_time is None:
+            self._keystroke_time = time.perf_counter()
+        super().keyPressEvent(event)
+
+    def paintEvent(self, event):
+        """Pinta o editor e registra a latência tecla-pintura, se ativa"""
+        super().paintEvent(event)
+        if self._keystroke_time is not None:
+            performance_monitor.record('keystroke_to_paint', self._keystroke_time, time.perf_counter())
+            self._keystroke_time = None
+
+    @timed('lineNumberAreaPaintEvent')
     def lineNumberAreaPaintEvent(self, event):
         """Pinta a área de numeração de linhas"""
         painter = QPainter(self.lineNumberArea)
@@ -111,15 +285,33 @@ class CodeEditor(QPlainTextEdit):
         blockNumber = block.blockNumber()
         top = int(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
         bottom = top + int(self.blockBoundingRect(block).height())
+        badge_font = self.badgeFont()
+        # Só as marcas da faixa pintada, em vez de consultar linha por linha
+        last = self.cursorForPosition(QPoint(0, event.rect().bottom())).blockNumber() + 1
+        markers = self.markers.in_range(blockNumber + 1, last)
 
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
                 number = str(blockNumber + 1)
                 
+                # Fundo do mapa de calor
+                heat = self.line_heat.get(blockNumber + 1)
+                if heat:
+                    painter.fillRect(0, top, self.lineNumberArea.width(), bottom - top,
+                                     heat_color(heat[0]))
+                
+                # Bookmark: faixa na borda esquerda
+                kinds = markers.get(blockNumber + 1, {})
+                if 'bookmark' in kinds:
+                    painter.fillRect(0, top, 2, bottom - top, QColor(DRACULA_COLORS['class']))
+                
                 # Cor do número da linha
-                if blockNumber + 1 in self.breakpoints:
-                    painter.setPen(QPen(QColor(DRACULA_COLORS['error']), 1))
-                    painter.setBrush(QBrush(QColor(DRACULA_COLORS['error'])))
+                if 'breakpoint' in kinds:
+                    # Breakpoints condicionais em laranja
+                    color = DRACULA_COLORS['identifier'] if kinds['breakpoint'] \
+                        else DRACULA_COLORS['error']
+                    painter.setPen(QPen(QColor(color), 1))
+                    painter.setBrush(QBrush(QColor(color)))
                     # Desenha círculo do breakpoint
                     painter.drawEllipse(QRect(2, top + 2, 8, 8))
                 else:
@@ -128,6 +320,16 @@ class CodeEditor(QPlainTextEdit):
                 # Desenha o número da linha
                 painter.drawText(QRect(0, top, self.lineNumberArea.width() - 4, self.fontMetrics().height()),
                                Qt.AlignRight, number)
+                
+                # Marca da linha (ex.: tempo da função no profiler)
+                badge = self.line_badges.get(blockNumber + 1)
+                if badge:
+                    painter.save()
+                    painter.setFont(badge_font)
+                    painter.setPen(QColor(DRACULA_COLORS['identifier']))
+                    painter.drawText(QRect(12, top, self.badge_width, self.fontMetrics().height()),
+                                     Qt.AlignLeft | Qt.AlignVCenter, badge[0])
+                    painter.restore()
             
             block = block.next()
             top = bottom
@@ -135,21 +337,22 @@ class CodeEditor(QPlainTextEdit):
             blockNumber += 1
 
     def mousePressEvent(self, event):
-        """Manipula cliques do mouse na área de numeração"""
+        """Ctrl+clique pede a definição do nome clicado"""
+        if event.button() == Qt.LeftButton and event.modifiers() & Qt.ControlModifier:
+            self.setTextCursor(self.cursorForPosition(event.pos()))
+            self.definition_requested.emit()
+            return
+        super().mousePressEvent(event)
+
+    def lineNumberAreaMousePressEvent(self, event):
+        """Clique na numeração alterna o breakpoint; botão direito edita a condição"""
+        line = self.cursorForPosition(QPoint(0, event.pos().y())).blockNumber() + 1
         if event.button() == Qt.LeftButton:
-            # Calcula a linha clicada
-            block = self.firstVisibleBlock()
-            blockNumber = block.blockNumber()
-            top = int(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
-            bottom = top + int(self.blockBoundingRect(block).height())
-            
-            while block.isValid():
-                if event.y() >= top and event.y() <= bottom:
-                    self.toggleBreakpoint(blockNumber + 1)
-                    break
-                block = block.next()
-                top = bottom
-                bottom = top + int(self.blockBoundingRect(block).height())
-                blockNumber += 1
-        
-        super().mousePressEvent(event) 
\ No newline at end of file
+            self.toggleBreakpoint(line)
+        elif event.button() == Qt.RightButton:
+            condition, accepted = QInputDialog.getText(
+                self, "Breakpoint condicional",
+                f"Parar na linha {line} só quando (vazio = sempre):",
+                text=self.markers.value(line, 'breakpoint') or '')
+            if accepted:
+                self.setBreakpointCondition(line, condition.strip())
@@ -0,0 +1,92 @@
+import time
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtGui import QTextCursor
+from .constants import RUN_CONFIG
+from .performance import timed
+
+
+class ConsoleWriter(QObject):
+    """Junta a saída do programa e a escreve no console uma vez por quadro.
+
+    Cada ``write`` só guarda o texto; um timer de ``console_flush_ms`` faz
+    uma única inserção com tudo o que chegou. O console guarda no máximo
+    ``console_max_blocks`` linhas: o que passaria disso é descartado antes
+    de ser inserido (não adianta formatar linhas que sairiam da tela) ou
+    removido do início do documento, e ``dropped_lines`` conta
+    as linhas perdidas desde o último ``reset``.
+
+    Se uma escrita demorar mais que um quadro (saída em rajada), a próxima
+    espera o dobro desse tempo, deixando a interface livre pelo menos
+    metade do tempo.
+    """
+
+    def __init__(self, console, max_blocks=None, interval=None):
+        super().__init__(console)
+        self.console = console
+        self.max_blocks = max_blocks or RUN_CONFIG['console_max_blocks']
+        self.console.setMaximumBlockCount(self.max_blocks)
+        self.pending = []
+        self.dropped_lines = 0
+        self.interval = RUN_CONFIG['console_flush_ms'] if interval is None else interval
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.interval)
+        self.timer.timeout.connect(self.flush)
+
+    def write(self, text):
+        """Agenda o texto para a próxima escrita no console"""
+        self.pending.append(text)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    @timed('console_flush')
+    def flush(self):
+        """Escreve de uma vez tudo o que está pendente"""
+        self.timer.stop()
+        if not self.pending:
+            return
+        start = time.perf_counter()
+        text = ''.join(self.pending)
+        self.pending = []
+
+        # Só as últimas max_blocks linhas podem ficar no console
+        lines = text.count('\n')
+        if lines >= self.max_blocks:
+            cut = len(text)
+            for _ in range(self.max_blocks):
+                cut = text.rfind('\n', 0, cut)
+            self.dropped_lines += lines - self.max_blocks + 1
+            text = text[cut + 1:]
+            lines = self.max_blocks - 1
+        document = self.console.document()
+        overflow = document.blockCount() + lines - self.max_blocks
+        if overflow > 0:
+            self.dropped_lines += overflow
+
+        scrollbar = self.console.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        if overflow > self.max_blocks // 4:
+            # Remover muitos blocos do início, um a um, custa mais que refazer
+            # o documento só com as linhas que sobram
+            keep = self.max_blocks - lines
+            if keep > 0:
+                cursor = QTextCursor(document.findBlockByNumber(document.blockCount() - keep))
+                cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+                text = cursor.selectedText().replace('\u2029', '\n') + text
+            self.console.setPlainText(text)
+        else:
+            cursor = QTextCursor(document)
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(text)
+        # Só acompanha a saída se o usuário não tiver rolado para cima
+        if at_bottom:
+            self.console.moveCursor(QTextCursor.End)
+            scrollbar.setValue(scrollbar.maximum())
+        elapsed = int((time.perf_counter() - start) * 1000)
+        self.timer.setInterval(max(self.interval, 2 * elapsed))
+
+    def reset(self):
+        """Descarta o pendente e zera a contagem (novo programa)"""
+        self.timer.stop()
+        self.pending = []
+        self.dropped_lines = 0
@@ -1,5 +1,7 @@
 # Constantes do PyPy IDE
 
+import os
+
 # Título da aplicação
 IDE_TITLE = "PyPy IDE - Minha IDE em Python"
 
@@ -24,9 +26,50 @@ DRACULA_COLORS = {
     'selection': '#44475a'
 }
 
+# Diretório de caches persistentes (índice de pacotes etc.)
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.pypy_ide', 'cache')
+
 # Configurações do editor
 EDITOR_CONFIG = {
     'font_family': 'Courier',
     'font_size': 10,
-    'tab_width': 4
-} 
\ No newline at end of file
+    'tab_width': 4,
+    # Arquivos a partir deste número de linhas são tokenizados em segundo plano
+    'background_highlight_lines': 5000,
+    # Linhas formatadas por vez durante a tokenização em segundo plano
+    'highlight_chunk_lines': 500,
+    # Limites do cache de tokens compartilhado entre as abas
+    'token_cache_entries': 50000,
+    'token_cache_chars': 4000000,
+    # Pausa na digitação (ms) antes de calcular sugestões de autocompletar
+    'completion_delay_ms': 80,
+    # Pausa nas edições (ms) antes de reanalisar os símbolos do documento
+    'symbol_parse_delay_ms': 400,
+    # Máximo de arquivos .py indexados por workspace
+    'workspace_max_files': 50000
+} 
+
+# Execução de código
+RUN_CONFIG = {
+    # Espera (ms) após o pedido de parada antes de matar o processo
+    'stop_grace_ms': 2000,
+    # Interpretadores mantidos prontos para o próximo F5 (0 desativa)
+    'warm_pool_size': 1,
+    # Módulos importados de antemão nos interpretadores prontos
+    'preload_modules': ['numpy', 'pandas'],
+    # Espera (ms) antes de repor um interpretador, para não disputar CPU com o programa
+    'pool_refill_delay_ms': 1000,
+    # Linhas mantidas no console; as mais antigas são descartadas
+    'console_max_blocks': 10000,
+    # Intervalo (ms) entre escritas da saída do programa no console (um quadro)
+    'console_flush_ms': 16,
+    # Intervalo (ms) de atualização do visualizador da saída completa
+    'viewer_refresh_ms': 250,
+    # Intervalo (ms) entre amostras da pilha no modo de amostragem
+    'sample_interval_ms': 5,
+    # Intervalo (ms) entre medições da memória no modo de memória
+    'memory_sample_ms': 100,
+    # Intervalo (ms) mínimo entre fotografias das alocações (tracemalloc); cresce
+    # quando fotografar fica caro, para não travar o programa
+    'memory_snapshot_ms': 1000
+}
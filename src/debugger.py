@@ -0,0 +1,233 @@
+import os
+import json
+import secrets
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSplitter,
+                             QListWidget, QListWidgetItem, QTreeWidget, QTreeWidgetItem,
+                             QHeaderView)
+from PyQt5.QtNetwork import QTcpServer, QHostAddress
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+from .constants import DRACULA_COLORS
+
+
+class DebugSession(QObject):
+    """Lado da IDE do depurador: recebe a conexão do processo do programa.
+
+    O processo (runner_bootstrap em modo "debug") se conecta ao servidor
+    local, apresenta o token e troca mensagens JSON, uma por linha.
+    """
+    stopped = pyqtSignal(dict)  # {'reason', 'stack': [[arquivo, função, linha], ...]}
+    running = pyqtSignal()
+    variables_ready = pyqtSignal(dict)  # {'frame', 'path', 'items': [[nome, tipo, valor, expansível]]}
+    disconnected = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.token = secrets.token_hex(16)
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self.accept)
+        self.socket = None
+        self.authenticated = False
+        self.buffer = b''
+        self.paused = False
+
+    def listen(self):
+        """Abre o servidor; retorna as opções do trabalho para o processo"""
+        self.server.listen(QHostAddress.LocalHost, 0)
+        return {'port': self.server.serverPort(), 'token': self.token}
+
+    def accept(self):
+        connection = self.server.nextPendingConnection()
+        if self.socket is not None:
+            connection.abort()  # só um programa por sessão
+            return
+        self.socket = connection
+        self.socket.readyRead.connect(self.read)
+        self.socket.disconnected.connect(self.connection_closed)
+        self.server.close()
+
+    def read(self):
+        self.buffer += bytes(self.socket.readAll())
+        *lines, self.buffer = self.buffer.split(b'\n')
+        for line in lines:
+            try:
+                message = json.loads(line.decode('utf-8'))
+            except ValueError:
+                continue
+            event = message.get('event')
+            if not self.authenticated:
+                if event != 'hello' or message.get('token') != self.token:
+                    self.socket.abort()
+                    return
+                self.authenticated = True
+            elif event == 'stopped':
+                self.paused = True
+                self.stopped.emit(message)
+            elif event == 'running':
+                self.paused = False
+                self.running.emit()
+            elif event == 'variables':
+                self.variables_ready.emit(message)
+
+    def connection_closed(self):
+        self.paused = False
+        self.disconnected.emit()
+
+    def send(self, message):
+        if self.socket is not None and self.authenticated:
+            self.socket.write((json.dumps(message) + '\n').encode('utf-8'))
+
+    def resume(self, command):
+        """Continua ("continue") ou dá um passo ("into", "over", "out")"""
+        if self.paused:
+            self.send({'command': command})
+
+    def pause(self):
+        if not self.paused:
+            self.send({'command': 'pause'})
+
+    def set_breakpoints(self, breakpoints):
+        self.send({'command': 'breakpoints', 'breakpoints': breakpoints})
+
+    def request_variables(self, frame, path=()):
+        """Pede as variáveis do quadro, ou os filhos do valor em ``path``
+        (índices a partir das variáveis do quadro)"""
+        self.send({'command': 'variables', 'frame': frame, 'path': list(path)})
+
+    def close(self, *args):
+        self.server.close()
+        if self.socket is not None:
+            self.socket.abort()
+
+
+class DebugPanel(QWidget):
+    """Controles do depurador, pilha de chamadas e variáveis do quadro escolhido"""
+    command_requested = pyqtSignal(str)  # "continue", "into", "over", "out" ou "pause"
+    frame_selected = pyqtSignal(int)  # índice do quadro (0 = o mais interno)
+    variables_requested = pyqtSignal(int, list)  # quadro, caminho até o valor expandido
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame = 0
+        self.pending = {}  # (quadro, caminho) -> item da árvore esperando variáveis (None = raiz)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header = QHBoxLayout()
+        self.status_label = QLabel()
+        header.addWidget(self.status_label)
+        header.addStretch()
+        self.buttons = {}
+        for command, text, tip in (("continue", "▶️", "Continuar (F8)"),
+                                   ("pause", "⏸️", "Pausar"),
+                                   ("over", "⤵️", "Passar por cima (F10)"),
+                                   ("into", "↘️", "Entrar (F11)"),
+                                   ("out", "↗️", "Sair da função (Shift+F11)")):
+            button = QPushButton(text)
+            button.setToolTip(tip)
+            button.clicked.connect(lambda checked, command=command: self.command_requested.emit(command))
+            header.addWidget(button)
+            self.buttons[command] = button
+        close_button = QPushButton("✖")
+        close_button.setFlat(True)
+        close_button.setToolTip("Fechar painel")
+        close_button.clicked.connect(self.hide)
+        header.addWidget(close_button)
+        layout.addLayout(header)
+
+        splitter = QSplitter(Qt.Horizontal)
+        self.stack_list = QListWidget()
+        self.stack_list.setStyleSheet(f"background-color: {DRACULA_COLORS['background']}; "
+                                      f"color: {DRACULA_COLORS['foreground']};")
+        self.stack_list.currentRowChanged.connect(self.select_frame)
+        splitter.addWidget(self.stack_list)
+
+        self.variables_tree = QTreeWidget()
+        self.variables_tree.setHeaderLabels(["Nome", "Tipo", "Valor"])
+        self.variables_tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.variables_tree.setStyleSheet(f"background-color: {DRACULA_COLORS['background']}; "
+                                          f"color: {DRACULA_COLORS['foreground']};")
+        self.variables_tree.itemExpanded.connect(self.expand_item)
+        splitter.addWidget(self.variables_tree)
+        splitter.setSizes([300, 500])
+        layout.addWidget(splitter)
+
+        self.setLayout(layout)
+        self.set_running()
+
+    def set_running(self, text="🐛 Executando..."):
+        self.status_label.setText(text)
+        self.stack_list.clear()
+        self.variables_tree.clear()
+        self.pending = {}
+        self.set_paused(False)
+
+    def finish(self):
+        """O programa terminou: mantém o painel, sem comandos"""
+        self.set_running("🐛 Depuração encerrada")
+        for button in self.buttons.values():
+            button.setEnabled(False)
+
+    def set_paused(self, paused):
+        for command, button in self.buttons.items():
+            button.setEnabled(paused != (command == 'pause'))
+
+    def show_stop(self, message):
+        """Mostra a pilha da parada e seleciona o quadro mais interno"""
+        reason = message.get('reason', '')
+        stack = message.get('stack', [])
+        where = f" em {os.path.basename(stack[0][0])}:{stack[0][2]}" if stack else ""
+        self.status_label.setText(f"🐛 Parado ({reason}){where}")
+        self.set_paused(True)
+        self.stack_list.blockSignals(True)
+        self.stack_list.clear()
+        for path, name, line in stack:
+            item = QListWidgetItem(f"{name}  —  {os.path.basename(path)}:{line}")
+            item.setData(Qt.UserRole, (path, line))
+            item.setToolTip(path)
+            self.stack_list.addItem(item)
+        self.stack_list.setCurrentRow(0)
+        self.stack_list.blockSignals(False)
+        self.select_frame(0)
+        self.show()
+
+    def select_frame(self, row):
+        if row < 0:
+            return
+        self.frame = row
+        self.variables_tree.clear()
+        self.pending = {(row, ()): None}
+        self.variables_requested.emit(row, [])
+        self.frame_selected.emit(row)
+
+    def frame_location(self, row):
+        item = self.stack_list.item(row)
+        return item.data(Qt.UserRole) if item is not None else None
+
+    def expand_item(self, item):
+        # O primeiro filho é um marcador até as variáveis chegarem
+        if item.childCount() == 1 and item.child(0).data(0, Qt.UserRole) == 'placeholder':
+            path = item.data(0, Qt.UserRole)
+            self.pending[(self.frame, tuple(path))] = item
+            self.variables_requested.emit(self.frame, path)
+
+    def show_variables(self, message):
+        key = (message.get('frame'), tuple(message.get('path', [])))
+        if key not in self.pending:
+            return  # resposta de um quadro que não está mais selecionado
+        parent = self.pending.pop(key)
+        if parent is None:
+            parent = self.variables_tree.invisibleRootItem()
+            path = []
+        else:
+            parent.takeChildren()
+            path = parent.data(0, Qt.UserRole)
+        for index, (name, kind, value, expandable) in enumerate(message['items']):
+            item = QTreeWidgetItem(parent, [name, kind, value])
+            item.setToolTip(2, value)
+            item.setData(0, Qt.UserRole, path + [index])
+            if expandable:
+                placeholder = QTreeWidgetItem(item, ["..."])
+                placeholder.setData(0, Qt.UserRole, 'placeholder')
@@ -11,6 +11,7 @@ class FileExplorer(QWidget):
     
     file_selected = pyqtSignal(str)  # Emite o caminho do arquivo selecionado
     file_double_clicked = pyqtSignal(str)  # Emite quando arquivo é clicado duas vezes
+    directory_changed = pyqtSignal(str)  # Emite quando outra pasta é carregada
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -95,6 +96,7 @@ class FileExplorer(QWidget):
         self.current_directory = path
         self.path_edit.setText(path)
         self.tree.clear()
+        self.directory_changed.emit(path)
         
         try:
             # Adiciona item para voltar (se não estiver na raiz)
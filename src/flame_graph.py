@@ -0,0 +1,267 @@
+import os
+import json
+import zlib
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QScrollArea, QToolTip)
+from PyQt5.QtGui import QColor, QPainter, QFontMetrics
+from PyQt5.QtCore import Qt, QRectF, QPointF, QEvent, pyqtSignal
+from .constants import DRACULA_COLORS
+from .profiler import format_duration
+
+# Altura (px) de cada nível do gráfico
+FLAME_ROW_HEIGHT = 18
+
+# Quadros mais estreitos que isso (px) não são desenhados
+FLAME_MIN_WIDTH = 1.0
+
+
+class FlameNode:
+    """Uma função numa posição da pilha, com as amostras em que apareceu"""
+    __slots__ = ('name', 'path', 'line', 'count', 'children', 'parent')
+
+    def __init__(self, name, path='', line=0, parent=None):
+        self.name = name
+        self.path = path
+        self.line = line
+        self.count = 0
+        self.children = {}  # (caminho, nome, linha) -> FlameNode
+        self.parent = parent
+
+    def child(self, path, name, line):
+        key = (path, name, line)
+        node = self.children.get(key)
+        if node is None:
+            node = self.children[key] = FlameNode(name, path, line, self)
+        return node
+
+    def depth(self):
+        """Número de níveis abaixo deste nó (inclusive)"""
+        deepest = 0
+        stack = [(self, 1)]  # sem recursão: pilhas de programas recursivos são fundas
+        while stack:
+            node, level = stack.pop()
+            deepest = max(deepest, level)
+            stack.extend((child, level + 1) for child in node.children.values())
+        return deepest
+
+    def self_count(self):
+        return self.count - sum(child.count for child in self.children.values())
+
+
+def load_samples(path):
+    """Lê as pilhas gravadas pelo modo de amostragem; retorna (raiz, segundos por amostra)"""
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    root = FlameNode("todas as amostras")
+    for stack, count in data['samples']:
+        root.count += count
+        node = root
+        for filename, name, line in stack:
+            node = node.child(filename, name, line)
+            node.count += count
+    # As amostras atrasam um pouco quando o programa segura o GIL, então o
+    # tempo de cada uma vem da duração real da execução, sem o tempo das
+    # descartadas (o programa esperando um input(), por exemplo)
+    kept = data['elapsed'] - data['dropped']
+    per_sample = kept / root.count if root.count and kept > 0 else data['interval']
+    return root, per_sample
+
+
+def node_color(node):
+    """Cor estável por função, em tons quentes"""
+    value = zlib.crc32(f"{node.path}:{node.name}".encode('utf-8'))
+    return QColor.fromHsv(value % 50, 140 + value % 80, 230)
+
+
+class FlameGraphView(QWidget):
+    """Desenha a árvore de amostras como flame graph (raiz embaixo) ou icicle (raiz em cima).
+
+    Clique num quadro amplia a função (os irmãos somem, ela ocupa toda a
+    largura); duplo clique pede a abertura do código-fonte.
+    """
+    node_zoomed = pyqtSignal()
+    location_selected = pyqtSignal(str, int, int)  # caminho, linha, coluna
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.zoomed = None
+        self.per_sample = 0.0
+        self.icicle = False
+        self.rects = []  # (QRectF, nó) desenhados, para os cliques e dicas
+        self.setMouseTracking(True)
+
+    def set_samples(self, root, per_sample):
+        self.root = root
+        self.zoomed = root
+        self.per_sample = per_sample
+        self.update_height()
+
+    def set_icicle(self, icicle):
+        self.icicle = icicle
+        self.update()
+
+    def zoom(self, node):
+        self.zoomed = node or self.root
+        self.update_height()
+        self.node_zoomed.emit()
+
+    def update_height(self):
+        # Ancestrais do nó ampliado continuam visíveis, em largura total
+        levels = 0
+        if self.zoomed is not None:
+            node = self.zoomed
+            while node.parent is not None:
+                levels += 1
+                node = node.parent
+            levels += self.zoomed.depth()
+        self.setMinimumHeight(max(1, levels) * FLAME_ROW_HEIGHT)
+        self.update()
+
+    def row_top(self, level):
+        if self.icicle:
+            return level * FLAME_ROW_HEIGHT
+        return self.height() - (level + 1) * FLAME_ROW_HEIGHT
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), QColor(DRACULA_COLORS['background']))
+        self.rects = []
+        if self.root is None or not self.root.count:
+            return
+
+        # Caminho da raiz até o nó ampliado, em largura total
+        ancestors = []
+        node = self.zoomed
+        while node is not None:
+            ancestors.append(node)
+            node = node.parent
+        ancestors.reverse()
+        for level, node in enumerate(ancestors[:-1]):
+            self.draw_node(painter, node, 0.0, float(self.width()), level, dimmed=True)
+
+        # O nó ampliado e os descendentes, proporcionais às amostras
+        stack = [(self.zoomed, 0.0, float(self.width()), len(ancestors) - 1)]
+        while stack:
+            node, left, width, level = stack.pop()
+            self.draw_node(painter, node, left, width, level)
+            scale = width / node.count if node.count else 0.0
+            x = left
+            for child in sorted(node.children.values(), key=lambda child: child.name):
+                child_width = child.count * scale
+                if child_width >= FLAME_MIN_WIDTH:
+                    stack.append((child, x, child_width, level + 1))
+                x += child_width
+
+    def draw_node(self, painter, node, left, width, level, dimmed=False):
+        rect = QRectF(left, self.row_top(level), width, FLAME_ROW_HEIGHT - 1)
+        self.rects.append((rect, node))
+        color = QColor(DRACULA_COLORS['line_highlight']) if node.parent is None else node_color(node)
+        if dimmed:
+            color.setAlpha(120)
+        painter.fillRect(rect, color)
+        if width > 20:
+            painter.setPen(QColor(DRACULA_COLORS['background'] if node.parent is not None
+                                  else DRACULA_COLORS['foreground']))
+            text = QFontMetrics(painter.font()).elidedText(node.name, Qt.ElideRight, int(width) - 6)
+            painter.drawText(rect.adjusted(3, 0, -3, 0), Qt.AlignLeft | Qt.AlignVCenter, text)
+
+    def node_at(self, position):
+        # Os últimos desenhados ficam por cima
+        for rect, node in reversed(self.rects):
+            if rect.contains(position):
+                return node
+        return None
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            node = self.node_at(event.localPos())
+            if node is not None:
+                self.zoom(node)
+        super().mousePressEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        node = self.node_at(event.localPos())
+        if node is not None and node.parent is not None:
+            self.location_selected.emit(node.path, node.line, 0)
+
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            node = self.node_at(QPointF(event.pos()))
+            if node is not None and self.root.count:
+                share = node.count / self.root.count * 100
+                location = f"\n{node.path}:{node.line}" if node.parent is not None else ""
+                QToolTip.showText(event.globalPos(),
+                                  f"{node.name}{location}\n{node.count} amostras ({share:.1f}%), "
+                                  f"~{format_duration(node.count * self.per_sample)}; "
+                                  f"própria: {node.self_count()} amostras", self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(event)
+
+
+class FlameGraphPanel(QWidget):
+    """Painel com o resultado do modo de amostragem"""
+    location_selected = pyqtSignal(str, int, int)  # caminho, linha, coluna
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header = QHBoxLayout()
+        self.status_label = QLabel()
+        header.addWidget(self.status_label)
+        header.addStretch()
+        self.orientation_button = QPushButton("🧊 Icicle")
+        self.orientation_button.setCheckable(True)
+        self.orientation_button.setToolTip("Alternar entre flame graph (raiz embaixo) e icicle (raiz em cima)")
+        self.orientation_button.toggled.connect(self.set_icicle)
+        header.addWidget(self.orientation_button)
+        reset_button = QPushButton("🔍 Ver tudo")
+        reset_button.setToolTip("Desfazer a ampliação")
+        reset_button.clicked.connect(lambda: self.view.zoom(None))
+        header.addWidget(reset_button)
+        close_button = QPushButton("✖")
+        close_button.setFlat(True)
+        close_button.setToolTip("Fechar painel")
+        close_button.clicked.connect(self.hide)
+        header.addWidget(close_button)
+        layout.addLayout(header)
+
+        self.view = FlameGraphView()
+        self.view.location_selected.connect(self.location_selected)
+        self.view.node_zoomed.connect(self.update_status)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setWidget(self.view)
+        layout.addWidget(self.scroll_area)
+
+        self.setLayout(layout)
+
+    def show_samples(self, root, per_sample):
+        self.view.set_samples(root, per_sample)
+        self.update_status()
+        self.show()
+        self.scroll_to_root()
+
+    def set_icicle(self, icicle):
+        self.view.set_icicle(icicle)
+        self.scroll_to_root()
+
+    def scroll_to_root(self):
+        scrollbar = self.scroll_area.verticalScrollBar()
+        scrollbar.setValue(scrollbar.minimum() if self.view.icicle else scrollbar.maximum())
+
+    def update_status(self):
+        root = self.view.root
+        text = (f"🔥 Amostragem: {root.count} amostras, "
+                f"~{format_duration(root.count * self.view.per_sample)}")
+        zoomed = self.view.zoomed
+        if zoomed is not None and zoomed is not root:
+            text += f" — ampliado em {zoomed.name} ({os.path.basename(zoomed.path)}:{zoomed.line})"
+        self.status_label.setText(text)
@@ -64,6 +64,12 @@ class ModernIcons:
     def run_code(self, size=24):
         return self.get_icon("run_code", size)
         
+    def stop(self, size=24):
+        return self.get_icon("stop", size)
+        
+    def profile(self, size=24):
+        return self.get_icon("profile", size)
+        
     def debug(self, size=24):
         return self.get_icon("debug", size)
         
@@ -116,6 +122,9 @@ class TextIcons:
     UNDO = "↶"
     REDO = "↷"
     SNIPPETS = "📝"
+    GOTO_DEFINITION = "🎯"
+    REFERENCES = "🔗"
+    BOOKMARK = "🔖"
     PACKAGES = "📦"
     AUTOCOMPLETE = "💡"
     TERMINAL = "💻"
@@ -128,6 +137,10 @@ class TextIcons:
     INFO = "ℹ️"
     DEBUG = "🐛"
     RUN_CODE = "▶️"
+    STOP = "⏹️"
+    OUTPUT = "📜"
+    PROFILE = "🔥"
+    MEMORY = "🧠"
     COMMAND_HELP = "❓"
     CLEAR_CONSOLE = "🧹"
     COMMAND_EXIT = "🚪"
@@ -142,6 +155,8 @@ class TextIcons:
     THEMES = "🎨"
     TERMINAL = "💻"
     SETTINGS = "⚙️"
+    DIAGNOSTICS = "📊"
+    PERFORMANCE = "⏱️"
     
     @staticmethod
     def get_icon_for_file_type(filename):
@@ -1,10 +1,18 @@
+import os
 import sys
-import io
-import builtins
+import json
+import time
+import codecs
+import signal
+import tempfile
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, 
                              QPushButton, QTextEdit, QLabel, QMessageBox)
-from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtCore import QTimer, QObject, QProcess, pyqtSignal
 from PyQt5.QtGui import QFont
+from .constants import RUN_CONFIG
+from .icons import TextIcons
+from .runner_bootstrap import INPUT_REQUEST
+from .interpreter_pool import BOOTSTRAP_PATH, run_environment
 
 
 class InputDialog(QDialog):
@@ -83,72 +91,172 @@ class InputManager:
         self.current_input_index = 0
 
 
-class InputRedirector:
-    """Redireciona input() para usar o dialog da IDE"""
+class CodeExecutor(QObject):
+    """Executa o código num interpretador filho, sem travar a interface.
+
+    O código vai para um arquivo temporário executado por runner_bootstrap
+    num QProcess, tirado do InterpreterPool quando há um pronto; stdout e
+    stderr chegam ao console conforme são escritos.
+    Quando o programa chama input(), a resposta é pedida no InputDialog e
+    enviada para a entrada padrão do processo. Parar envia SIGINT (o
+    programa recebe KeyboardInterrupt) e, se ele não terminar em
+    ``stop_grace_ms``, o processo é morto.
+    """
+    started = pyqtSignal()
+    finished = pyqtSignal(int)  # código de saída
     
-    def __init__(self, input_manager):
+    def __init__(self, input_manager, output_callback, pool=None):
+        super().__init__()
         self.input_manager = input_manager
-        self.original_input = builtins.input
+        self.output_callback = output_callback
+        self.pool = pool
+        self.process = None
+        self.script_path = None
+        self.start_time = None
+        self.stdout_decoder = None
+        self.stderr_decoder = None
+        self.held_output = ""  # início de um possível INPUT_REQUEST cortado entre leituras
+        self.kill_timer = QTimer(self)
+        self.kill_timer.setSingleShot(True)
+        self.kill_timer.timeout.connect(self.kill)
     
-    def __call__(self, prompt=""):
-        return self.input_manager.get_input(prompt)
-
-
-class OutputRedirector:
-    """Redireciona print() para a área de saída da IDE"""
+    def is_running(self):
+        return self.process is not None and self.process.state() != QProcess.NotRunning
     
-    def __init__(self, output_callback):
-        self.output_callback = output_callback
-        self.buffer = ""
-    
-    def write(self, text):
-        self.buffer += text
-        if text.endswith('\n'):
-            self.output_callback(self.buffer)
-            self.buffer = ""
-    
-    def flush(self):
-        if self.buffer:
-            self.output_callback(self.buffer)
-            self.buffer = ""
-
+    def execute_code(self, code, filename=None, mode='run', output=None, options=None):
+        """Inicia a execução do código; ``filename`` é o nome usado nos tracebacks.
 
-class CodeExecutor:
-    """Executor de código com suporte a input/output"""
+        ``mode`` "profile" roda sob cProfile, "sample" amostra a pilha, "lines"
+        mede cada linha e "memory" usa tracemalloc; os resultados são gravados
+        em ``output``. "debug" conecta ao depurador; ``options`` completa o
+        trabalho (porta, token e breakpoints).
+        """
+        if self.is_running():
+            self.output_callback(f"{TextIcons.ERROR} Já existe um programa em execução.\n")
+            return
+        
+        descriptor, self.script_path = tempfile.mkstemp(prefix='pypy_ide_run_', suffix='.py')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            file.write(code)
+        
+        cwd = os.path.dirname(os.path.abspath(filename)) if filename else os.getcwd()
+        job = {'script': self.script_path, 'filename': filename or '<editor>', 'cwd': cwd,
+               'mode': mode, 'output': output}
+        if mode == 'sample':
+            job['interval'] = RUN_CONFIG['sample_interval_ms'] / 1000
+        elif mode == 'memory':
+            job['interval'] = RUN_CONFIG['memory_sample_ms'] / 1000
+            job['snapshot_interval'] = RUN_CONFIG['memory_snapshot_ms'] / 1000
+        job.update(options or {})
+        process = self.pool.take() if self.pool is not None else None
+        warm = process is not None
+        if warm:
+            process.setParent(self)
+        else:
+            process = QProcess(self)
+            process.setProcessEnvironment(run_environment())
+            process.setWorkingDirectory(cwd)
+        process.readyReadStandardOutput.connect(self.read_stdout)
+        process.readyReadStandardError.connect(self.read_stderr)
+        process.finished.connect(self.process_finished)
+        process.errorOccurred.connect(self.process_error)
+        
+        self.process = process
+        self.stdout_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.stderr_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.held_output = ""
+        self.start_time = time.perf_counter()
+        if warm:
+            # O processo já está rodando e esperando o trabalho na entrada padrão
+            process.write((json.dumps(job) + '\n').encode('utf-8'))
+        else:
+            process.start(sys.executable, [BOOTSTRAP_PATH, '--job', json.dumps(job)])
+        self.started.emit()
     
-    def __init__(self, input_manager, output_callback):
-        self.input_manager = input_manager
-        self.output_callback = output_callback
-        self.output_redirector = OutputRedirector(output_callback)
-        self.input_redirector = InputRedirector(input_manager)
-    
-    def execute_code(self, code):
-        """Executa código Python com suporte a input/output"""
-        try:
-            # Salva funções originais
-            original_stdout = sys.stdout
-            original_stdin = sys.stdin
-            original_input = builtins.input
-            
-            # Redireciona input/output
-            sys.stdout = self.output_redirector
-            builtins.input = self.input_redirector
-            
-            # Executa o código em um namespace limpo
-            namespace = {
-                '__builtins__': builtins,
-                '__name__': '__main__',
-                '__file__': None
-            }
-            exec(code, namespace)
-            
-            # Restaura funções originais
-            sys.stdout = original_stdout
-            builtins.input = original_input
-            
-        except Exception as e:
-            self.output_callback(f"Erro: {str(e)}\n")
-        finally:
-            # Garante que stdout seja restaurado
-            if hasattr(self, 'original_stdout'):
-                sys.stdout = self.original_stdout 
\ No newline at end of file
+    def read_stdout(self):
+        """Repassa a saída padrão ao console, atendendo pedidos de input()"""
+        text = self.held_output + self.stdout_decoder.decode(bytes(self.process.readAllStandardOutput()))
+        self.held_output = ""
+        while True:
+            position = text.find(INPUT_REQUEST)
+            if position < 0:
+                break
+            before, text = text[:position], text[position + len(INPUT_REQUEST):]
+            if before:
+                self.output_callback(before)
+            self.answer_input(before.rsplit('\n', 1)[-1])
+        
+        # Guarda um pedaço final que pode ser o começo de um INPUT_REQUEST
+        if '\x1b' in text[-len(INPUT_REQUEST):]:
+            for size in range(min(len(INPUT_REQUEST) - 1, len(text)), 0, -1):
+                if INPUT_REQUEST.startswith(text[-size:]):
+                    text, self.held_output = text[:-size], text[-size:]
+                    break
+        if text:
+            self.output_callback(text)
+    
+    def read_stderr(self):
+        text = self.stderr_decoder.decode(bytes(self.process.readAllStandardError()))
+        if text:
+            self.output_callback(text)
+    
+    def answer_input(self, prompt):
+        """Pede a linha ao usuário e a envia para o processo"""
+        value = self.input_manager.get_input(prompt.strip() or "Digite algo:")
+        if self.is_running():
+            self.output_callback(value + "\n")
+            self.process.write((value + "\n").encode('utf-8'))
+    
+    def stop(self):
+        """Pede ao programa que termine; força o término se ele não obedecer"""
+        if not self.is_running():
+            return
+        self.output_callback(f"\n{TextIcons.STOP} Interrompendo...\n")
+        if sys.platform == 'win32':
+            self.process.terminate()
+        else:
+            os.kill(self.process.processId(), signal.SIGINT)
+        self.kill_timer.start(RUN_CONFIG['stop_grace_ms'])
+    
+    def kill(self):
+        if self.is_running():
+            self.output_callback(f"{TextIcons.STOP} Processo não respondeu; finalizado à força.\n")
+            self.process.kill()
+    
+    def process_error(self, error):
+        if error == QProcess.FailedToStart:
+            self.output_callback(f"{TextIcons.ERROR} Não foi possível iniciar o Python: "
+                                 f"{self.process.errorString()}\n")
+            self.cleanup()
+            self.finished.emit(-1)
+    
+    def process_finished(self, exit_code, exit_status):
+        """Esvazia o que restou da saída e informa o resultado"""
+        self.read_stdout()
+        self.read_stderr()
+        if self.held_output:
+            self.output_callback(self.held_output)
+            self.held_output = ""
+        elapsed = time.perf_counter() - self.start_time
+        if exit_status == QProcess.CrashExit:
+            message = f"{TextIcons.ERROR} Processo interrompido"
+            exit_code = -1
+        elif exit_code == 0:
+            message = f"{TextIcons.SUCCESS} Processo finalizado"
+        else:
+            message = f"{TextIcons.ERROR} Processo finalizado com código {exit_code}"
+        self.output_callback(f"\n{message} em {elapsed:.2f}s\n")
+        self.cleanup()
+        self.finished.emit(exit_code)
+    
+    def cleanup(self):
+        self.kill_timer.stop()
+        if self.script_path:
+            try:
+                os.remove(self.script_path)
+            except OSError:
+                pass
+            self.script_path = None
+        if self.process is not None:
+            self.process.deleteLater()
+            self.process = None
@@ -0,0 +1,87 @@
+import os
+import sys
+from PyQt5.QtCore import QObject, QProcess, QProcessEnvironment, QTimer
+from .constants import RUN_CONFIG
+
+BOOTSTRAP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'runner_bootstrap.py')
+
+
+def run_environment():
+    """Ambiente dos processos que executam o código do usuário"""
+    environment = QProcessEnvironment.systemEnvironment()
+    environment.insert('PYTHONIOENCODING', 'utf-8')
+    # A saída fica em buffer; runner_bootstrap a esvazia periodicamente
+    environment.remove('PYTHONUNBUFFERED')
+    return environment
+
+
+class InterpreterPool(QObject):
+    """Interpretadores já iniciados, com os módulos pesados importados.
+
+    Cada processo roda runner_bootstrap em modo ``--warm``: importa
+    ``preload_modules`` e espera o trabalho na entrada padrão. Um processo
+    executa um único programa (o namespace e os módulos do usuário nunca
+    passam de uma execução para outra) e é reposto em segundo plano, com um
+    atraso para não disputar CPU com o programa que acabou de começar.
+    """
+
+    def __init__(self, size=None, modules=None, parent=None):
+        super().__init__(parent)
+        self.size = RUN_CONFIG['warm_pool_size'] if size is None else size
+        self.modules = RUN_CONFIG['preload_modules'] if modules is None else modules
+        self.idle = []  # processos prontos, o mais antigo primeiro
+        self.refill_timer = QTimer(self)
+        self.refill_timer.setSingleShot(True)
+        self.refill_timer.setInterval(RUN_CONFIG['pool_refill_delay_ms'])
+        self.refill_timer.timeout.connect(self.refill)
+
+    def spawn(self):
+        """Inicia um processo novo e o coloca na fila"""
+        process = QProcess(self)
+        process.setProcessEnvironment(run_environment())
+        process.setWorkingDirectory(os.path.expanduser('~'))
+        process.finished.connect(self.idle_finished)
+        process.start(sys.executable, [BOOTSTRAP_PATH, '--warm'] + list(self.modules))
+        self.idle.append(process)
+
+    def refill(self):
+        """Completa o pool até o tamanho configurado"""
+        while len(self.idle) < self.size:
+            self.spawn()
+
+    def take(self):
+        """Retira um processo pronto (ou None, se não houver) e agenda a reposição"""
+        process = None
+        while self.idle and process is None:
+            candidate = self.idle.pop(0)
+            candidate.finished.disconnect(self.idle_finished)
+            if candidate.state() == QProcess.NotRunning:
+                candidate.deleteLater()
+            else:
+                process = candidate
+        if self.size:
+            self.refill_timer.start()
+        return process
+
+    def idle_finished(self, *args):
+        """Um processo ocioso terminou sozinho: descarta e repõe"""
+        process = self.sender()
+        if process in self.idle:
+            self.idle.remove(process)
+            process.deleteLater()
+            self.refill_timer.start()
+
+    def shutdown(self, *args):
+        """Encerra os processos ociosos"""
+        self.refill_timer.stop()
+        while self.idle:
+            process = self.idle.pop()
+            process.finished.disconnect(self.idle_finished)
+            process.kill()
+            process.waitForFinished(1000)
+            process.deleteLater()
+
+    def restart(self):
+        """Troca os processos ociosos por novos (pacotes instalados ou removidos)"""
+        self.shutdown()
+        self.refill()
@@ -0,0 +1,244 @@
+import os
+import re
+import sys
+import json
+import queue
+import platform
+import sysconfig
+import importlib.util
+import subprocess
+import threading
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QThread, pyqtSignal
+from .constants import CACHE_DIR
+from .package_manager import package_index
+from .performance import timed
+
+HELPER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'introspection_helper.py')
+
+# Tempo máximo de um import no processo auxiliar; depois disso ele é reiniciado
+IMPORT_TIMEOUT = 10.0
+
+# Caracteres que não podem ir para o nome do arquivo de cache
+UNSAFE_FILENAME_PATTERN = re.compile(r'[^\w.@+-]')
+
+
+def is_stdlib(top_level):
+    """Se o módulo de primeiro nível vem da biblioteca padrão"""
+    names = getattr(sys, 'stdlib_module_names', None)  # Python 3.10+
+    if names is not None:
+        return top_level in names or top_level in sys.builtin_module_names
+    if top_level in sys.builtin_module_names:
+        return True
+    try:
+        spec = importlib.util.find_spec(top_level)
+    except (ImportError, ValueError):
+        return False
+    if spec is None or spec.origin is None:
+        return False
+    if spec.origin == 'frozen':
+        return True
+    stdlib = os.path.normcase(os.path.abspath(sysconfig.get_paths()['stdlib']))
+    origin = os.path.normcase(os.path.abspath(spec.origin))
+    return origin.startswith(stdlib + os.sep) and 'site-packages' not in origin
+
+
+class ModuleAttributes:
+    """Atributos de um módulo, com a mesma interface ``search`` das outras fontes"""
+
+    def __init__(self, names):
+        self.names = [name for name, kind in names]
+        self.kinds = dict(names)
+        self.index = None
+        self.lock = threading.Lock()
+
+    def search(self, word, limit=50):
+        # Logo depois do ponto ainda não há palavra: mostra os primeiros nomes
+        if not word:
+            return self.names[:limit]
+        with self.lock:
+            if self.index is None:
+                # Importado aqui: autocomplete depende deste módulo
+                from .autocomplete import CompletionIndex
+                self.index = CompletionIndex(self.names)
+        return self.index.search(word, limit)
+
+
+class HelperProcess:
+    """Processo Python separado e reutilizável que importa os módulos"""
+
+    def __init__(self):
+        self.process = None
+        self.responses = None
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, HELPER_PATH], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, encoding='utf-8',
+            cwd=CACHE_DIR if os.path.isdir(CACHE_DIR) else None)
+        # As respostas são lidas numa thread para que o pedido possa ter timeout
+        self.responses = queue.Queue()
+        threading.Thread(target=self._read, args=(self.process, self.responses),
+                         daemon=True).start()
+
+    @staticmethod
+    def _read(process, responses):
+        for line in process.stdout:
+            responses.put(line)
+        responses.put(None)  # processo terminou
+
+    def describe(self, module):
+        """Pede os atributos de um módulo; retorna [(nome, tipo)] ou None se falhar"""
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+        try:
+            self.process.stdin.write(module + '\n')
+            self.process.stdin.flush()
+            line = self.responses.get(timeout=IMPORT_TIMEOUT)
+        except (OSError, queue.Empty):
+            line = None
+        if line is None:
+            self.stop()  # travou ou caiu: o próximo pedido começa um processo novo
+            return None
+        try:
+            response = json.loads(line)
+        except ValueError:
+            return None
+        if response.get('module') != module or response.get('error'):
+            return None
+        return [tuple(item) for item in response['names']]
+
+    def stop(self):
+        if self.process is not None:
+            try:
+                self.process.kill()
+                self.process.wait()
+            except OSError:
+                pass
+            self.process = None
+
+
+class ModuleInspector(QThread):
+    """Lista os atributos de módulos importados para o autocompletar.
+
+    Os módulos são importados num processo auxiliar, nunca na IDE. Os
+    resultados ficam em memória e em disco, por módulo e versão da
+    distribuição que o fornece (ou do Python, para a biblioteca padrão),
+    então só o primeiro uso de cada versão paga o import. Módulos que não
+    são da biblioteca padrão nem de um pacote instalado (código do próprio
+    projeto) não são importados, para não executar código do usuário.
+    """
+    attributes_signal = pyqtSignal(str)  # módulo cujos atributos ficaram prontos
+
+    def __init__(self, cache_dir=None):
+        super().__init__()
+        self.cache_dir = cache_dir or os.path.join(CACHE_DIR, 'module_attributes')
+        self.condition = threading.Condition()
+        self.pending = []  # módulos aguardando, o mais recente por último
+        self.results = {}  # módulo -> ModuleAttributes (vazio se não der para listar)
+        self.versions = None  # módulo de nível superior -> "distribuição-versão"
+        self.helper = HelperProcess()
+        self.running = True
+
+    def lookup(self, module):
+        """Retorna os atributos já conhecidos ou agenda a busca e retorna None.
+
+        Um módulo que não pôde ser listado fica com um resultado vazio.
+        """
+        with self.condition:
+            if module in self.results:
+                return self.results[module]
+            if module not in self.pending:
+                self.pending.append(module)
+                self.condition.notify()
+        return None
+
+    def invalidate(self):
+        """Esquece os resultados em memória (pacotes instalados ou removidos)"""
+        with self.condition:
+            self.results = {}
+            self.versions = None
+
+    def stop(self, *args):
+        """Encerra a thread e o processo auxiliar"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.wait()
+        self.helper.stop()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                module = self.pending.pop()
+            try:
+                attributes = self.load(module)
+            except Exception as e:
+                # Um módulo problemático não pode derrubar a thread
+                print(f"Erro ao listar atributos de {module}: {e}")
+                attributes = None
+            with self.condition:
+                self.results[module] = attributes or ModuleAttributes([])
+            self.attributes_signal.emit(module)
+
+    def version_of(self, module):
+        """Identifica a versão de quem fornece o módulo, ou None se for código local"""
+        top_level = module.split('.')[0]
+        if is_stdlib(top_level):
+            return f"python-{platform.python_version()}"
+        if self.versions is None:
+            package_index.refresh()
+            providers = {}
+            for distribution, info in package_index.get_distributions().items():
+                for name in info['modules']:
+                    providers.setdefault(name, []).append(f"{distribution}-{info['version']}")
+            # Vários pacotes podem fornecer o mesmo nome (ex.: PyQt5 e PyQt5_sip)
+            self.versions = {name: '+'.join(sorted(found)) for name, found in providers.items()}
+        return self.versions.get(top_level)
+
+    def cache_path(self, module, version):
+        filename = UNSAFE_FILENAME_PATTERN.sub('_', f"{module}@{version}") + '.json'
+        return os.path.join(self.cache_dir, filename)
+
+    @timed('module_attributes')
+    def load(self, module):
+        """Lê os atributos do cache em disco ou do processo auxiliar"""
+        version = self.version_of(module)
+        if version is None:
+            return None
+        path = self.cache_path(module, version)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                return ModuleAttributes([tuple(item) for item in json.load(file)])
+        except (OSError, ValueError, TypeError):
+            pass
+
+        names = self.helper.describe(module)
+        if names is None:
+            return None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporary = path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(names, file)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"Erro ao salvar atributos de {module}: {e}")
+        return ModuleAttributes(names)
+
+
+_module_inspector = None
+
+
+def get_module_inspector():
+    """Retorna o inspetor de módulos compartilhado, criando-o se necessário"""
+    global _module_inspector
+    if _module_inspector is None:
+        _module_inspector = ModuleInspector()
+        QApplication.instance().aboutToQuit.connect(_module_inspector.stop)
+        _module_inspector.start()
+    return _module_inspector
@@ -0,0 +1,77 @@
+"""Processo auxiliar que importa módulos e lista seus atributos.
+
+É executado como script por ``ModuleInspector`` (não importe este arquivo
+na IDE). Lê um nome de módulo por linha na entrada padrão e responde uma
+linha JSON por pedido: {"module", "names": [[nome, tipo], ...], "error"}.
+Durante o import, a saída padrão do módulo vai para stderr para não
+misturar com as respostas.
+"""
+import os
+import sys
+import json
+import inspect
+import pkgutil
+import importlib
+
+
+def resolve(name):
+    """Importa ``pacote.modulo`` ou, se não for módulo, busca o atributo no pai"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        if '.' not in name:
+            raise
+        parent, _, attribute = name.rpartition('.')
+        return getattr(resolve(parent), attribute)
+
+
+def kind_of(value):
+    if inspect.ismodule(value):
+        return 'module'
+    if inspect.isclass(value):
+        return 'class'
+    if callable(value):
+        return 'function'
+    return 'variable'
+
+
+def describe(name):
+    """Lista os atributos públicos (e submódulos ainda não importados)"""
+    target = resolve(name)
+    names = {}
+    for attribute in dir(target):
+        if attribute.startswith('_'):
+            continue
+        try:
+            names[attribute] = kind_of(getattr(target, attribute))
+        except Exception:
+            names[attribute] = 'variable'
+    if inspect.ismodule(target) and hasattr(target, '__path__'):
+        for submodule in pkgutil.iter_modules(target.__path__):
+            if not submodule.name.startswith('_'):
+                names.setdefault(submodule.name, 'module')
+    return sorted(names.items())
+
+
+def main():
+    # A pasta da IDE não deve sombrear módulos instalados
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [path for path in sys.path if os.path.abspath(path or '.') != here]
+    requests = sys.stdin
+    responses = sys.stdout
+    sys.stdin = open(os.devnull)  # input() no import não trava o processo
+    sys.stdout = sys.stderr
+    for line in requests:
+        name = line.strip()
+        if not name:
+            continue
+        try:
+            response = {'module': name, 'names': describe(name), 'error': None}
+        except BaseException as e:  # SystemExit e afins também não derrubam o processo
+            response = {'module': name, 'names': [], 'error': f"{type(e).__name__}: {e}"}
+        responses.write(json.dumps(response) + '\n')
+        responses.flush()
+
+
+if __name__ == '__main__':
+    main()
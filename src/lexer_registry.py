@@ -0,0 +1,112 @@
+import os
+import re
+import importlib
+
+
+class LexerRegistry:
+    """Registro de lexers do Pygments por extensão de arquivo e shebang.
+
+    Os módulos de lexer só são importados quando um arquivo daquele tipo é
+    aberto pela primeira vez, e cada lexer é instanciado uma única vez.
+    """
+
+    # Lexer usado para abas sem nome e arquivos sem tipo reconhecido
+    DEFAULT_LEXER = ('pygments.lexers.python', 'PythonLexer')
+
+    def __init__(self):
+        # Extensão -> (módulo do Pygments, nome da classe)
+        self.extensions = {
+            '.py': ('pygments.lexers.python', 'PythonLexer'),
+            '.pyw': ('pygments.lexers.python', 'PythonLexer'),
+            '.pyi': ('pygments.lexers.python', 'PythonLexer'),
+            '.pyx': ('pygments.lexers.python', 'CythonLexer'),
+            '.json': ('pygments.lexers.data', 'JsonLexer'),
+            '.yaml': ('pygments.lexers.data', 'YamlLexer'),
+            '.yml': ('pygments.lexers.data', 'YamlLexer'),
+            '.md': ('pygments.lexers.markup', 'MarkdownLexer'),
+            '.rst': ('pygments.lexers.markup', 'RstLexer'),
+            '.html': ('pygments.lexers.html', 'HtmlLexer'),
+            '.htm': ('pygments.lexers.html', 'HtmlLexer'),
+            '.xml': ('pygments.lexers.html', 'XmlLexer'),
+            '.css': ('pygments.lexers.css', 'CssLexer'),
+            '.js': ('pygments.lexers.javascript', 'JavascriptLexer'),
+            '.ts': ('pygments.lexers.javascript', 'TypeScriptLexer'),
+            '.sh': ('pygments.lexers.shell', 'BashLexer'),
+            '.bat': ('pygments.lexers.shell', 'BatchLexer'),
+            '.sql': ('pygments.lexers.sql', 'SqlLexer'),
+            '.toml': ('pygments.lexers.configs', 'TOMLLexer'),
+            '.ini': ('pygments.lexers.configs', 'IniLexer'),
+            '.cfg': ('pygments.lexers.configs', 'IniLexer'),
+            '.txt': ('pygments.lexers.special', 'TextLexer'),
+        }
+
+        # Interpretador do shebang -> (módulo do Pygments, nome da classe)
+        self.shebangs = {
+            'python': ('pygments.lexers.python', 'PythonLexer'),
+            'sh': ('pygments.lexers.shell', 'BashLexer'),
+            'bash': ('pygments.lexers.shell', 'BashLexer'),
+            'zsh': ('pygments.lexers.shell', 'BashLexer'),
+            'node': ('pygments.lexers.javascript', 'JavascriptLexer'),
+        }
+
+        self.lexers = {}  # (módulo, classe) -> instância
+
+    def register_extension(self, extension, module_name, class_name):
+        """Associa uma extensão (ex: '.vue') a um lexer do Pygments"""
+        self.extensions[extension.lower()] = (module_name, class_name)
+
+    def register_shebang(self, interpreter, module_name, class_name):
+        """Associa um interpretador de shebang (ex: 'ruby') a um lexer"""
+        self.shebangs[interpreter] = (module_name, class_name)
+
+    def get_lexer(self, filename=None, first_line=""):
+        """Retorna o lexer para um arquivo, importando-o se necessário"""
+        return self._load(self.find_lexer_spec(filename, first_line))
+
+    def find_lexer_spec(self, filename=None, first_line=""):
+        """Retorna o par (módulo, classe) do lexer adequado a um arquivo"""
+        if filename:
+            extension = os.path.splitext(filename)[1].lower()
+            if extension in self.extensions:
+                return self.extensions[extension]
+
+        interpreter = self._shebang_interpreter(first_line)
+        if interpreter in self.shebangs:
+            return self.shebangs[interpreter]
+
+        if filename:
+            # Último recurso: a tabela de nomes de arquivo do próprio Pygments
+            from pygments.lexers import find_lexer_class_for_filename
+            lexer_class = find_lexer_class_for_filename(os.path.basename(filename))
+            if lexer_class is not None:
+                return (lexer_class.__module__, lexer_class.__name__)
+            return ('pygments.lexers.special', 'TextLexer')
+
+        return self.DEFAULT_LEXER
+
+    def _shebang_interpreter(self, first_line):
+        """Extrai o nome do interpretador de uma linha de shebang"""
+        if not first_line or not first_line.startswith('#!'):
+            return None
+        parts = first_line[2:].split()
+        if not parts:
+            return None
+        program = os.path.basename(parts[0])
+        if program == 'env' and len(parts) > 1:
+            program = parts[1]
+        match = re.match(r'[a-z]+', program)
+        return match.group() if match else None
+
+    def _load(self, spec):
+        """Importa o módulo do lexer e cria a instância (uma única vez)"""
+        lexer = self.lexers.get(spec)
+        if lexer is None:
+            module_name, class_name = spec
+            module = importlib.import_module(module_name)
+            lexer = getattr(module, class_name)()
+            self.lexers[spec] = lexer
+        return lexer
+
+
+# Instância global
+lexer_registry = LexerRegistry()
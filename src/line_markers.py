@@ -0,0 +1,182 @@
+from bisect import bisect_left, bisect_right
+from PyQt5 import sip
+from PyQt5.QtGui import QTextBlockUserData
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class BlockMarkers(QTextBlockUserData):
+    """Marcas de uma linha, guardadas no próprio bloco do documento"""
+
+    def __init__(self, kinds=None):
+        super().__init__()
+        self.kinds = dict(kinds or {})  # tipo -> valor, ex.: 'breakpoint' -> condição
+
+
+class LineMarkers(QObject):
+    """Marcas da numeração de linhas (breakpoints, bookmarks...) que andam com o texto.
+
+    Cada marca fica nos dados do bloco (QTextBlockUserData), então o Qt a
+    leva junto quando linhas são inseridas ou apagadas acima dela. Para
+    "próxima marca" e para a faixa visível há, por tipo, uma lista ordenada
+    das linhas, corrigida a cada edição só a partir do trecho alterado.
+    """
+    changed = pyqtSignal(str)  # tipo cujas marcas foram criadas, removidas ou mudaram de linha
+
+    def __init__(self, document, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.blocks = {}  # BlockMarkers -> QTextBlock (acompanha o bloco nas edições)
+        self.index = {}  # tipo -> ([linhas em ordem], [BlockMarkers na mesma ordem])
+        self.block_count = document.blockCount()
+        document.contentsChange.connect(self.document_changed)
+
+    def value(self, line, kind):
+        """Valor da marca ``kind`` na linha (None se não houver)"""
+        data = self.document.findBlockByNumber(line - 1).userData()
+        return data.kinds.get(kind) if isinstance(data, BlockMarkers) else None
+
+    def kinds_at(self, line):
+        data = self.document.findBlockByNumber(line - 1).userData()
+        return dict(data.kinds) if isinstance(data, BlockMarkers) else {}
+
+    def lines(self, kind):
+        """Linhas com a marca ``kind``, em ordem"""
+        return list(self.index.get(kind, ([], []))[0])
+
+    def items(self, kind):
+        """{linha: valor} das marcas ``kind``"""
+        lines, markers = self.index.get(kind, ([], []))
+        return {line: data.kinds[kind] for line, data in zip(lines, markers)}
+
+    def in_range(self, first, last):
+        """{linha: {tipo: valor}} das marcas entre ``first`` e ``last`` (inclusive)"""
+        found = {}
+        for kind, (lines, markers) in self.index.items():
+            for position in range(bisect_left(lines, first), bisect_right(lines, last)):
+                found.setdefault(lines[position], {})[kind] = markers[position].kinds[kind]
+        return found
+
+    def next_line(self, kind, line, backwards=False):
+        """Primeira linha com a marca depois de ``line`` (ou antes), dando a volta no arquivo"""
+        lines = self.index.get(kind, ([], []))[0]
+        if not lines:
+            return None
+        if backwards:
+            position = bisect_left(lines, line) - 1
+            return lines[position]  # -1 dá a volta para a última
+        position = bisect_right(lines, line)
+        return lines[position] if position < len(lines) else lines[0]
+
+    def set(self, line, kind, value=True):
+        """Cria (ou altera) a marca ``kind`` na linha"""
+        block = self.document.findBlockByNumber(line - 1)
+        if not block.isValid():
+            return
+        data = block.userData()
+        if not isinstance(data, BlockMarkers):
+            data = BlockMarkers()
+            block.setUserData(data)
+            self.blocks[data] = block
+        if kind not in data.kinds:
+            lines, markers = self.index.setdefault(kind, ([], []))
+            position = bisect_left(lines, line)
+            lines.insert(position, line)
+            markers.insert(position, data)
+        data.kinds[kind] = value
+        self.changed.emit(kind)
+
+    def remove(self, line, kind):
+        block = self.document.findBlockByNumber(line - 1)
+        data = block.userData()
+        if not isinstance(data, BlockMarkers) or kind not in data.kinds:
+            return
+        del data.kinds[kind]
+        self._unindex(kind, line, data)
+        if not data.kinds:
+            del self.blocks[data]
+            block.setUserData(None)
+        self.changed.emit(kind)
+
+    def clear(self, kind):
+        """Remove todas as marcas ``kind``"""
+        for line in self.lines(kind):
+            self.remove(line, kind)
+
+    def _unindex(self, kind, line, data):
+        lines, markers = self.index[kind]
+        position = bisect_left(lines, line)
+        while markers[position] is not data:
+            position += 1
+        del lines[position]
+        del markers[position]
+
+    def document_changed(self, position, removed, added):
+        """Corrige as linhas do índice depois de uma edição.
+
+        Linhas antes do trecho alterado não mudam e as depois dele só se
+        deslocam; apenas os blocos do trecho são conferidos. Marcas de
+        blocos que o Qt apagou vão para a linha que ficou no lugar.
+        """
+        old_count, self.block_count = self.block_count, self.document.blockCount()
+        if not self.blocks:
+            return
+        start = self.document.findBlock(position)
+        first = start.blockNumber() + 1
+        inserted = self.document.findBlock(position + added).blockNumber() + 1 - first
+        deleted = old_count - self.block_count + inserted
+        shift = inserted - deleted
+
+        # Linhas first..first+deleted existiam antes da edição; delas, só uma sobrevive
+        moved = set()
+        lost = []
+        for kind, (lines, markers) in self.index.items():
+            low = bisect_left(lines, first)
+            high = bisect_right(lines, first + deleted)
+            if shift:
+                lines[high:] = [line + shift for line in lines[high:]]
+                if high < len(lines):
+                    moved.add(kind)
+            if low == high:
+                continue
+            window = []
+            for data in markers[low:high]:
+                if sip.isdeleted(data):
+                    lost.append(data)
+                else:
+                    window.append((self.blocks[data].blockNumber() + 1, data))
+            window.sort(key=lambda item: item[0])
+            lines[low:high] = [line for line, data in window]
+            markers[low:high] = [data for line, data in window]
+            moved.add(kind)
+
+        # Enter no começo de uma linha marcada: o Qt deixa os dados na linha
+        # vazia de cima, mas o código (e a marca) desceu
+        data = start.userData()
+        if not removed and inserted and position == start.position() and \
+                isinstance(data, BlockMarkers):
+            self._move(data, self.document.findBlockByNumber(first - 1 + inserted))
+            moved.update(data.kinds)
+
+        # Texto substituído por inteiro (ex.: recarregar o arquivo): as marcas somem
+        replaced = not position and added >= self.document.characterCount() - 1
+        for data in dict.fromkeys(lost):
+            del self.blocks[data]
+            if not replaced:
+                self._attach(start, data.kinds)
+        for kind in moved:
+            self.changed.emit(kind)
+
+    def _move(self, data, block):
+        kinds = dict(data.kinds)
+        origin = self.blocks.pop(data)
+        for kind in kinds:
+            self._unindex(kind, origin.blockNumber() + 1, data)
+        origin.setUserData(None)
+        self._attach(block, kinds)
+
+    def _attach(self, block, kinds):
+        """Junta as marcas a um bloco; as que ele já tem prevalecem"""
+        line = block.blockNumber() + 1
+        for kind, value in kinds.items():
+            if self.value(line, kind) is None:
+                self.set(line, kind, value)
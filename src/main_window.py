@@ -1,4 +1,6 @@
+import os
 import sys
+import tempfile
 import subprocess
 import io
 import contextlib
@@ -7,18 +9,38 @@ from PyQt5.QtWidgets import (QMainWindow, QApplication, QPlainTextEdit, QAction,
                                     QWidget, QSplitter, QShortcut, QMenu, QMenuBar,
                                     QStatusBar, QProgressBar, QLabel)
 from PyQt5.QtCore import Qt, QTimer, QSize
-from PyQt5.QtGui import QIcon, QKeySequence
+from PyQt5.QtGui import QIcon, QKeySequence, QTextCursor
 from .constants import IDE_TITLE, DRACULA_COLORS
 from .code_editor import CodeEditor
-from .syntax_highlighter import PythonHighlighter
+from .syntax_highlighter import PythonHighlighter, token_cache
 from .tab_manager import TabManager
 from .input_dialog import InputManager, CodeExecutor
+from .interpreter_pool import InterpreterPool
+from .console_output import ConsoleWriter
+from .output_spool import OutputSpool, OutputViewerDialog
 from .package_manager import PackageManagerDialog
-from .autocomplete import CodeEditorCompleter, SnippetManager
+from .autocomplete import SnippetManager, completion_vocabulary
 from .theme_manager import ThemeManager
 from .file_explorer import FileExplorer
 from .icons import modern_icons, TextIcons
 from .terminal_commands import TerminalCommands
+from .performance import performance_monitor, timed, EventLoopProbe, PerformancePanel
+from .workspace_index import workspace_index
+from .introspection import get_module_inspector
+from .profiler import ProfilerPanel, load_profile, load_line_heat, format_duration
+from .flame_graph import FlameGraphPanel, load_samples
+from .memory_profiler import MemoryPanel, load_memory, allocation_badges
+from .debugger import DebugSession, DebugPanel
+from .navigation import ReferencesPanel, word_at, byte_to_column, is_attribute, is_self_attribute
+
+
+# Modos de execução com profiler: mensagem no console, extensão do arquivo de resultados
+PROFILE_MODES = {
+    'profile': ("Executando com profiler...", '.prof'),
+    'sample': ("Executando com amostragem da pilha...", '.json'),
+    'lines': ("Executando com mapa de calor por linha...", '.json'),
+    'memory': ("Executando com perfil de memória (tracemalloc)...", '.json'),
+}
 
 
 class IDEMainWindow(QMainWindow):
@@ -32,10 +54,21 @@ class IDEMainWindow(QMainWindow):
         # Inicializar componentes
         self.tab_manager = TabManager()
         self.output_console = self._create_console()
+        self.console_writer = ConsoleWriter(self.output_console)
+        self.output_spool = OutputSpool()  # saída completa da execução, em disco
+        self.output_viewer = None
         
         # Sistema de input/output
         self.input_manager = InputManager(self)
-        self.code_executor = CodeExecutor(self.input_manager, self.append_to_console)
+        self.interpreter_pool = InterpreterPool(parent=self)
+        QTimer.singleShot(0, self.interpreter_pool.refill)
+        QApplication.instance().aboutToQuit.connect(self.interpreter_pool.shutdown)
+        self.code_executor = CodeExecutor(self.input_manager, self.write_program_output,
+                                          self.interpreter_pool)
+        self.code_executor.started.connect(self.run_started)
+        self.code_executor.finished.connect(self.run_finished)
+        QApplication.instance().aboutToQuit.connect(self.code_executor.kill)
+        QApplication.instance().aboutToQuit.connect(self.output_spool.close)
         
         # Sistema de comandos do terminal
         self.terminal_commands = TerminalCommands(self)
@@ -47,10 +80,44 @@ class IDEMainWindow(QMainWindow):
         self.theme_manager = ThemeManager()
         self.theme_manager.set_theme('vscode_dark')  # Usar tema VS Code por padrão
         
+        # Instrumentação de desempenho (desativada até ser ligada no painel)
+        performance_monitor.probe = EventLoopProbe(performance_monitor, parent=self)
+        self.performance_panel = None
+        
         # Explorador de arquivos
         self.file_explorer = FileExplorer()
         self.file_explorer.file_double_clicked.connect(self.open_file_from_explorer)
         
+        # Navegação: Ctrl+clique / F12 e painel de referências (Shift+F12)
+        self.tab_manager.definition_requested.connect(self.goto_definition)
+        self.references_panel = ReferencesPanel()
+        self.references_panel.location_selected.connect(self.navigate_to)
+        self.references_panel.hide()
+        QApplication.instance().aboutToQuit.connect(self.references_panel.cancel)
+        
+        # Profiler: tabela de funções e tempos ao lado dos "def" no editor
+        self.profiler_panel = ProfilerPanel()
+        self.profiler_panel.location_selected.connect(self.open_profile_location)
+        self.profiler_panel.hide()
+        self.flame_graph_panel = FlameGraphPanel()
+        self.flame_graph_panel.location_selected.connect(self.open_profile_location)
+        self.flame_graph_panel.hide()
+        self.memory_panel = MemoryPanel()
+        self.memory_panel.location_selected.connect(self.open_profile_location)
+        self.memory_panel.hide()
+        self.profile_run = None  # execução com profiler em andamento ou a última
+        
+        # Depurador: processo separado conectado por socket local
+        self.debug_session = None
+        self.debug_run = None  # {'editor', 'filename'} da depuração em andamento
+        self.execution_editor = None  # editor com a linha de execução destacada
+        self.debug_panel = DebugPanel()
+        self.debug_panel.command_requested.connect(self.debug_command)
+        self.debug_panel.frame_selected.connect(self.show_debug_frame)
+        self.debug_panel.variables_requested.connect(self.request_debug_variables)
+        self.debug_panel.hide()
+        self.tab_manager.breakpoints_changed.connect(self.update_breakpoints)
+        
         # Configurar layout
         self._setup_layout()
         self._create_toolbar()
@@ -69,12 +136,19 @@ class IDEMainWindow(QMainWindow):
         self.tab_manager.tab_closed.connect(self.on_tab_closed)
         self.tab_manager.tab_saved.connect(self.on_tab_saved)
         
-        # Configurar autocompletar para a primeira aba
-        self._setup_autocomplete()
-        
         # Adicionar primeira aba
         self.tab_manager.add_new_tab()
         
+        # Pacotes instalados entram no autocompletar depois que a janela abre
+        QTimer.singleShot(0, completion_vocabulary.update_packages)
+        
+        # Índice de símbolos do workspace aberto no explorador
+        self.file_explorer.directory_changed.connect(workspace_index.set_root)
+        workspace_index.progress_signal.connect(self.update_index_progress)
+        workspace_index.finished_signal.connect(self.index_finished)
+        QApplication.instance().aboutToQuit.connect(workspace_index.shutdown)
+        workspace_index.set_root(self.file_explorer.current_directory)
+        
         # Atalhos de teclado
         self._setup_shortcuts()
 
@@ -99,7 +173,12 @@ class IDEMainWindow(QMainWindow):
         editor_splitter = QSplitter(Qt.Vertical)
         editor_splitter.addWidget(self.tab_manager)
         editor_splitter.addWidget(self.output_console)
-        editor_splitter.setSizes([600, 200])
+        editor_splitter.addWidget(self.references_panel)
+        editor_splitter.addWidget(self.profiler_panel)
+        editor_splitter.addWidget(self.flame_graph_panel)
+        editor_splitter.addWidget(self.memory_panel)
+        editor_splitter.addWidget(self.debug_panel)
+        editor_splitter.setSizes([600, 200, 150, 200, 200, 250, 250])
         
         main_splitter.addWidget(editor_splitter)
         main_splitter.setSizes([250, 950])
@@ -148,6 +227,21 @@ class IDEMainWindow(QMainWindow):
         run_action.triggered.connect(self.run_code)
         toolbar.addAction(run_action)
         
+        # Botão Parar
+        self.stop_action = QAction("", self)
+        self.stop_action.setIcon(modern_icons.stop(24))
+        self.stop_action.setToolTip("Parar Execução (Shift+F5)")
+        self.stop_action.triggered.connect(self.stop_code)
+        self.stop_action.setEnabled(False)
+        toolbar.addAction(self.stop_action)
+        
+        # Botão Profiler
+        profile_action = QAction("", self)
+        profile_action.setIcon(modern_icons.profile(24))
+        profile_action.setToolTip("Executar com Profiler (Alt+F5)")
+        profile_action.triggered.connect(self.profile_code)
+        toolbar.addAction(profile_action)
+        
         # Botão Debug
         debug_action = QAction("", self)
         debug_action.setIcon(modern_icons.debug(24))
@@ -255,6 +349,31 @@ class IDEMainWindow(QMainWindow):
         
         edit_menu.addSeparator()
         
+        # Ação Ir para Definição
+        definition_action = QAction(f"{TextIcons.GOTO_DEFINITION} Ir para Definição", self)
+        definition_action.setShortcut("F12")
+        definition_action.triggered.connect(self.goto_definition)
+        edit_menu.addAction(definition_action)
+        
+        # Ação Encontrar Referências
+        references_action = QAction(f"{TextIcons.REFERENCES} Encontrar Referências", self)
+        references_action.setShortcut("Shift+F12")
+        references_action.triggered.connect(self.find_references)
+        edit_menu.addAction(references_action)
+        
+        edit_menu.addSeparator()
+        
+        # Bookmarks: marcar a linha e navegar entre as marcadas
+        for text, keys, slot in (("Marcar/Desmarcar Linha", "Ctrl+F2", self.toggle_bookmark),
+                                 ("Próximo Bookmark", "F2", lambda: self.goto_bookmark(False)),
+                                 ("Bookmark Anterior", "Shift+F2", lambda: self.goto_bookmark(True))):
+            bookmark_action = QAction(f"{TextIcons.BOOKMARK} {text}", self)
+            bookmark_action.setShortcut(keys)
+            bookmark_action.triggered.connect(slot)
+            edit_menu.addAction(bookmark_action)
+        
+        edit_menu.addSeparator()
+        
         # Menu Snippets
         snippets_menu = edit_menu.addMenu(f"{TextIcons.SNIPPETS} Snippets")
         self._populate_snippets_menu(snippets_menu)
@@ -278,6 +397,45 @@ class IDEMainWindow(QMainWindow):
         terminal_action.triggered.connect(self.toggle_terminal)
         tools_menu.addAction(terminal_action)
         
+        # Ação Diagnósticos
+        diagnostics_action = QAction(f"{TextIcons.DIAGNOSTICS} Diagnósticos", self)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        tools_menu.addAction(diagnostics_action)
+        
+        # Ação Performance
+        performance_action = QAction(f"{TextIcons.PERFORMANCE} Performance", self)
+        performance_action.triggered.connect(self.show_performance_panel)
+        tools_menu.addAction(performance_action)
+        
+        # Ação Executar com Profiler
+        profile_menu_action = QAction(f"{TextIcons.PROFILE} Executar com Profiler", self)
+        profile_menu_action.triggered.connect(self.profile_code)
+        tools_menu.addAction(profile_menu_action)
+        
+        # Ação Executar com Amostragem
+        sample_action = QAction(f"{TextIcons.PROFILE} Executar com Amostragem (Flame Graph)", self)
+        sample_action.setShortcut("Alt+Shift+F5")
+        sample_action.triggered.connect(self.sample_code)
+        tools_menu.addAction(sample_action)
+        
+        # Ação Executar com Mapa de Calor
+        line_heat_action = QAction(f"{TextIcons.PROFILE} Executar com Mapa de Calor por Linha", self)
+        line_heat_action.setShortcut("Ctrl+Shift+F5")
+        line_heat_action.triggered.connect(self.line_heat_code)
+        tools_menu.addAction(line_heat_action)
+        
+        # Ação Executar com Perfil de Memória
+        memory_action = QAction(f"{TextIcons.MEMORY} Executar com Perfil de Memória", self)
+        memory_action.setShortcut("Ctrl+Alt+M")
+        memory_action.triggered.connect(self.memory_code)
+        tools_menu.addAction(memory_action)
+        
+        # Ação Saída Completa
+        output_action = QAction(f"{TextIcons.OUTPUT} Saída Completa", self)
+        output_action.setShortcut("Ctrl+Shift+L")
+        output_action.triggered.connect(self.show_output_viewer)
+        tools_menu.addAction(output_action)
+        
         # Menu Visual
         visual_menu = self.menuBar().addMenu(f"{TextIcons.VIEW_MENU} Visual")
         
@@ -324,8 +482,7 @@ class IDEMainWindow(QMainWindow):
                     self.tab_manager.setCurrentIndex(existing_tab)
                 else:
                     # Adiciona nova aba com o conteúdo
-                    index = self.tab_manager.add_new_tab(filename, content)
-                    self._setup_autocomplete_for_tab(index)
+                    self.tab_manager.add_new_tab(filename, content)
                 
                 self.setWindowTitle(f"{IDE_TITLE} - {filename}")
                 self.file_info_label.setText(f"Arquivo aberto: {filename}")
@@ -352,6 +509,7 @@ class IDEMainWindow(QMainWindow):
                     file.write(content)
                 
                 self.tab_manager.set_tab_modified(current_index, False)
+                workspace_index.update_file(filename)
                 QMessageBox.information(self, "Salvo", "Arquivo salvo com sucesso!")
                 self.file_info_label.setText(f"Arquivo salvo: {filename}")
                 
@@ -379,6 +537,8 @@ class IDEMainWindow(QMainWindow):
                     if current_index in self.tab_manager.tab_info:
                         self.tab_manager.tab_info[current_index]['filename'] = filename
                         self.tab_manager.set_tab_modified(current_index, False)
+                        self.tab_manager.update_tab_lexer(current_index)
+                    workspace_index.update_file(filename)
                     
                     # Atualiza nome da aba
                     tab_name = filename.split('/')[-1]
@@ -392,48 +552,187 @@ class IDEMainWindow(QMainWindow):
 
     def run_code(self):
         """Executa o código Python no editor"""
+        self.execute_current('run')
+    
+    def profile_code(self):
+        """Executa o código sob cProfile e mostra onde o tempo foi gasto"""
+        self.execute_current('profile')
+    
+    def sample_code(self):
+        """Executa o código amostrando a pilha e mostra o flame graph"""
+        self.execute_current('sample')
+    
+    def line_heat_code(self):
+        """Executa o código medindo cada linha e pinta o mapa de calor no editor"""
+        self.execute_current('lines')
+    
+    def memory_code(self):
+        """Executa o código com tracemalloc e mostra onde a memória é alocada"""
+        self.execute_current('memory')
+    
+    def execute_current(self, mode):
+        """Executa o código da aba atual no modo pedido ("run" ou um de PROFILE_MODES)"""
         code = self.tab_manager.get_current_content()
         if not code.strip():
             self.append_to_console(f"{TextIcons.ERROR} Nenhum código para executar.\n")
             return
             
+        if self.code_executor.is_running():
+            self.append_to_console(f"{TextIcons.ERROR} Já existe um programa em execução "
+                                   f"(Shift+F5 para parar).\n")
+            return
+            
         # Limpa o console
+        self.console_writer.reset()
+        self.output_spool.reset()
         self.output_console.clear()
-        self.append_to_console(f"{TextIcons.RUN_CODE} Executando código...\n")
+        filename = self.tab_manager.get_current_tab_info().get('filename')
+        output = None
+        if mode in PROFILE_MODES:
+            message, suffix = PROFILE_MODES[mode]
+            self.append_to_console(f"{TextIcons.PROFILE} {message}\n")
+            descriptor, output = tempfile.mkstemp(prefix='pypy_ide_profile_', suffix=suffix)
+            os.close(descriptor)
+            self.profile_run = {'mode': mode, 'editor': self.tab_manager.get_current_editor(),
+                                'filename': filename or '<editor>', 'output': output}
+        else:
+            self.append_to_console(f"{TextIcons.RUN_CODE} Executando código...\n")
         
-        # Executa o código com suporte a input/output
-        self.code_executor.execute_code(code)
+        # Executa num processo separado; a saída chega ao console aos poucos
+        self.code_executor.execute_code(code, filename, mode, output)
+    
+    def stop_code(self):
+        """Interrompe o programa em execução"""
+        self.code_executor.stop()
+    
+    def run_started(self):
+        self.stop_action.setEnabled(True)
+    
+    def run_finished(self, exit_code):
+        self.stop_action.setEnabled(False)
+        if self.debug_session is not None:
+            self.debug_session.close()
+            self.debug_session.deleteLater()
+            self.debug_session = None
+            self.set_execution_line(None, None)
+            self.debug_panel.finish()
+        self.console_writer.flush()
+        dropped = self.console_writer.dropped_lines
+        if dropped:
+            size = self.output_spool.size / (1024 * 1024)
+            self.append_to_console(f"{TextIcons.INFO} {dropped} linhas mais antigas saíram do console "
+                                   f"(limite de {self.console_writer.max_blocks} linhas). A saída "
+                                   f"completa ({size:.1f} MB) está em Ferramentas > Saída Completa "
+                                   f"(Ctrl+Shift+L)")
+        if self.profile_run is not None and self.profile_run.get('output'):
+            self.show_profile()
+        self.output_console.appendPlainText(">> ")
+    
+    def show_profile(self):
+        """Lê os resultados da execução com profiler e os mostra"""
+        output = self.profile_run.pop('output')
+        show = {'profile': self.show_cprofile, 'sample': self.show_samples,
+                'lines': self.show_line_heat, 'memory': self.show_memory}
+        try:
+            show[self.profile_run['mode']](output)
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            self.append_to_console(f"{TextIcons.ERROR} O programa terminou sem gravar os "
+                                   f"resultados do profiler.")
+        finally:
+            try:
+                os.remove(output)
+            except OSError:
+                pass
+    
+    def profiled_editor(self):
+        """Editor que foi executado com profiler, se a aba ainda existir"""
+        editor = self.profile_run['editor'] if self.profile_run else None
+        if editor is None or self.tab_manager.indexOf(editor) == -1:
+            return None
+        return editor
+    
+    def show_samples(self, output):
+        root, per_sample = load_samples(output)
+        self.flame_graph_panel.show_samples(root, per_sample)
+    
+    def show_line_heat(self, output):
+        heat, hottest = load_line_heat(output)
+        editor = self.profiled_editor()
+        if editor is None:
+            return  # a aba foi fechada durante a execução
+        editor.setLineHeat(heat)
+        if hottest is not None:
+            self.append_to_console(f"{TextIcons.PROFILE} Linha mais quente: {heat[hottest][1]}")
+    
+    def show_memory(self, output):
+        data = load_memory(output)
+        self.memory_panel.show_memory(data)
+        editor = self.profiled_editor()
+        if editor is not None:
+            editor.setLineBadges(allocation_badges(data, self.profile_run['filename']))
+    
+    def show_cprofile(self, output):
+        entries, total_time = load_profile(output)
+        self.profiler_panel.show_profile(entries, total_time)
+        
+        # Tempo total de cada função do arquivo executado, ao lado do seu "def"
+        editor = self.profiled_editor()
+        if editor is None:
+            return  # a aba foi fechada durante a execução
+        badges = {}
+        for entry in entries:
+            if entry.path != self.profile_run['filename'] or entry.name == '<module>':
+                continue
+            share = entry.total_time / total_time * 100 if total_time else 0.0
+            badges[entry.line] = (format_duration(entry.total_time),
+                                  f"{entry.name}: {entry.calls_text()} chamada(s), "
+                                  f"total {format_duration(entry.total_time)} ({share:.1f}%), "
+                                  f"próprio {format_duration(entry.self_time)}")
+        editor.setLineBadges(badges)
+    
+    def open_profile_location(self, path, line, column):
+        """Duplo clique no profiler: código sem arquivo fica no editor executado"""
+        if path == '<editor>':
+            editor = self.profiled_editor()
+            if editor is not None:
+                self.tab_manager.setCurrentWidget(editor)
+                self.move_cursor(editor, line, column)
+        elif os.path.isfile(path):
+            self.navigate_to(path, line, column)
+    
+    def write_program_output(self, text):
+        """Saída do programa: vai para o arquivo da saída completa e para o console"""
+        self.output_spool.write(text)
+        self.console_writer.write(text)
+    
+    def show_output_viewer(self):
+        """Mostra a saída completa da última execução"""
+        if self.output_viewer is None:
+            self.output_viewer = OutputViewerDialog(self.output_spool, self)
+        self.output_viewer.refresh_timer.start()
+        self.output_viewer.show()
+        self.output_viewer.raise_()
     
     def append_to_console(self, text):
         """Adiciona texto ao console"""
+        self.console_writer.flush()  # mantém a ordem com a saída pendente do programa
         self.output_console.appendPlainText(text)
     
     def add_new_tab(self):
-        """Adiciona uma nova aba"""
-        index = self.tab_manager.add_new_tab()
-        self._setup_autocomplete_for_tab(index)
-    
-    def _setup_autocomplete(self):
-        """Configura autocompletar para a aba atual"""
-        current_editor = self.tab_manager.get_current_editor()
-        if current_editor:
-            self.completer = CodeEditorCompleter(current_editor)
-    
-    def _setup_autocomplete_for_tab(self, tab_index):
-        """Configura autocompletar para uma aba específica"""
-        editor = self.tab_manager.widget(tab_index)
-        if editor:
-            completer = CodeEditorCompleter(editor)
+        """Adiciona uma nova aba (o autocompletar é criado pelo TabManager)"""
+        self.tab_manager.add_new_tab()
     
     def update_autocomplete(self):
         """Atualiza o autocompletar com pacotes instalados"""
-        if hasattr(self, 'completer'):
-            self.completer.update_package_completions()
+        completion_vocabulary.update_packages()
+        get_module_inspector().invalidate()
+        self.interpreter_pool.restart()  # os módulos pré-carregados podem ter mudado
         self.append_to_console(f"{TextIcons.SUCCESS} Autocompletar atualizado!\n")
     
     def show_package_manager(self):
         """Mostra o gerenciador de pacotes"""
         dialog = PackageManagerDialog(self)
+        dialog.packages_changed.connect(self.update_autocomplete)
         dialog.exec_()
     
     def _populate_snippets_menu(self, menu):
@@ -472,6 +771,23 @@ class IDEMainWindow(QMainWindow):
         run_shortcut = QShortcut(QKeySequence("F5"), self)
         run_shortcut.activated.connect(self.run_code)
         
+        # Shift+F5 para parar a execução
+        stop_shortcut = QShortcut(QKeySequence("Shift+F5"), self)
+        stop_shortcut.activated.connect(self.stop_code)
+        
+        # F6 para depurar; F8, F10, F11 e Shift+F11 controlam o depurador
+        for keys, slot in (("F6", self.debug_code),
+                           ("F8", lambda: self.debug_command('continue')),
+                           ("F10", lambda: self.debug_command('over')),
+                           ("F11", lambda: self.debug_command('into')),
+                           ("Shift+F11", lambda: self.debug_command('out'))):
+            shortcut = QShortcut(QKeySequence(keys), self)
+            shortcut.activated.connect(slot)
+        
+        # Alt+F5 para executar com profiler
+        profile_shortcut = QShortcut(QKeySequence("Alt+F5"), self)
+        profile_shortcut.activated.connect(self.profile_code)
+        
         # Ctrl+T para nova aba
         new_tab_shortcut = QShortcut(QKeySequence("Ctrl+T"), self)
         new_tab_shortcut.activated.connect(self.add_new_tab)
@@ -509,6 +825,20 @@ class IDEMainWindow(QMainWindow):
         self.insert_mode_label = QLabel("INS")
         status_bar.addPermanentWidget(self.insert_mode_label)
         
+        # Progresso do highlighting de arquivos grandes
+        self.highlight_progress_bar = QProgressBar()
+        self.highlight_progress_bar.setMaximumWidth(120)
+        self.highlight_progress_bar.setMaximumHeight(14)
+        self.highlight_progress_bar.setFormat("Highlight %p%")
+        self.highlight_progress_bar.hide()
+        status_bar.addPermanentWidget(self.highlight_progress_bar)
+        self.tab_manager.highlight_progress.connect(self.update_highlight_progress)
+        
+        # Progresso da indexação do workspace
+        self.index_status_label = QLabel()
+        self.index_status_label.hide()
+        status_bar.addPermanentWidget(self.index_status_label)
+        
         # Conectar sinais para atualizar posição do cursor
         self.tab_manager.currentChanged.connect(self.update_cursor_position)
         
@@ -517,7 +847,8 @@ class IDEMainWindow(QMainWindow):
         
         self.setStatusBar(status_bar)
         
-    def update_cursor_position(self):
+    @timed('update_cursor_position')
+    def update_cursor_position(self, *args):
         """Atualiza a posição do cursor na barra de status"""
         current_editor = self.tab_manager.get_current_editor()
         if current_editor:
@@ -535,6 +866,22 @@ class IDEMainWindow(QMainWindow):
             else:
                 self.file_info_label.setText("Nenhum arquivo aberto")
     
+    def update_highlight_progress(self, percent):
+        """Mostra o progresso do highlighting em segundo plano"""
+        self.highlight_progress_bar.setValue(percent)
+        self.highlight_progress_bar.setVisible(percent < 100)
+    
+    def update_index_progress(self, done, total):
+        """Mostra o progresso da indexação do workspace"""
+        self.index_status_label.setText(f"🔎 Indexando {done}/{total}")
+        self.index_status_label.show()
+    
+    def index_finished(self, parsed, total):
+        """Esconde o progresso quando a indexação termina"""
+        self.index_status_label.hide()
+        if parsed:
+            self.file_info_label.setText(f"🔎 Workspace indexado: {total} arquivos")
+    
     def on_tab_closed(self, index):
         """Chamado quando uma aba é fechada"""
         self.file_info_label.setText(f"Aba {index} fechada")
@@ -556,8 +903,7 @@ class IDEMainWindow(QMainWindow):
                 self.tab_manager.setCurrentIndex(existing_tab)
             else:
                 # Adiciona nova aba com o conteúdo
-                index = self.tab_manager.add_new_tab(file_path, content)
-                self._setup_autocomplete_for_tab(index)
+                self.tab_manager.add_new_tab(file_path, content)
             
             self.setWindowTitle(f"{IDE_TITLE} - {file_path}")
             self.file_info_label.setText(f"Arquivo aberto: {file_path}")
@@ -588,6 +934,7 @@ class IDEMainWindow(QMainWindow):
         """Muda o tema da aplicação"""
         self.theme_manager.set_theme(theme_name)
         self.theme_manager.apply_theme_to_widget(self)
+        self.tab_manager.set_theme_colors(self.theme_manager.get_theme(theme_name))
         self.file_info_label.setText(f"{TextIcons.THEMES} Tema: {self.theme_manager.get_theme(theme_name)['name']}")
     
     def show_theme_selector(self):
@@ -637,15 +984,102 @@ class IDEMainWindow(QMainWindow):
         dialog.accept()
     
     def debug_code(self):
-        """Executa o código em modo debug"""
+        """Executa o código no depurador, parando nos breakpoints dos editores"""
         code = self.tab_manager.get_current_content()
         if not code.strip():
             self.append_to_console(f"{TextIcons.ERROR} Nenhum código para executar em debug.\n")
             return
         
+        if self.code_executor.is_running():
+            self.append_to_console(f"{TextIcons.ERROR} Já existe um programa em execução "
+                                   f"(Shift+F5 para parar).\n")
+            return
+        
+        self.console_writer.reset()
+        self.output_spool.reset()
+        self.output_console.clear()
         self.append_to_console(f"{TextIcons.DEBUG} Iniciando debug...\n")
-        # Aqui você pode implementar funcionalidades de debug mais avançadas
-        self.append_to_console(f"{TextIcons.INFO} Debug iniciado. Use breakpoints para controlar a execução.\n")
+        
+        filename = self.tab_manager.get_current_tab_info().get('filename')
+        self.debug_run = {'editor': self.tab_manager.get_current_editor(),
+                          'filename': filename or '<editor>'}
+        self.debug_session = DebugSession(self)
+        self.debug_session.stopped.connect(self.debug_stopped)
+        self.debug_session.running.connect(self.debug_running)
+        self.debug_session.variables_ready.connect(self.debug_panel.show_variables)
+        options = self.debug_session.listen()
+        options['breakpoints'] = self.collect_breakpoints()
+        self.debug_panel.set_running()
+        self.debug_panel.show()
+        self.code_executor.execute_code(code, filename, 'debug', None, options)
+    
+    def collect_breakpoints(self):
+        """Breakpoints de todas as abas: {arquivo: {linha: condição}}"""
+        breakpoints = {}
+        for info in self.tab_manager.tab_info.values():
+            editor = info.get('editor')
+            lines = editor.breakpoints() if editor is not None else None
+            if not lines:
+                continue
+            if self.debug_run and editor is self.debug_run['editor']:
+                filename = self.debug_run['filename']  # o nome com que o código foi compilado
+            elif info.get('filename'):
+                filename = os.path.abspath(info['filename'])
+            else:
+                continue  # aba sem arquivo que não está sendo depurada
+            breakpoints[filename] = {str(line): condition for line, condition in lines.items()}
+        return breakpoints
+    
+    def update_breakpoints(self):
+        """Envia os breakpoints alterados ao programa em depuração"""
+        if self.debug_session is not None:
+            self.debug_session.set_breakpoints(self.collect_breakpoints())
+    
+    def debug_command(self, command):
+        if self.debug_session is None:
+            return
+        if command == 'pause':
+            self.debug_session.pause()
+        else:
+            self.debug_session.resume(command)
+    
+    def request_debug_variables(self, frame, path):
+        if self.debug_session is not None:
+            self.debug_session.request_variables(frame, path)
+    
+    def debug_stopped(self, message):
+        self.debug_panel.show_stop(message)
+        self.activateWindow()
+    
+    def debug_running(self):
+        self.debug_panel.set_running()
+        self.set_execution_line(None, None)
+    
+    def show_debug_frame(self, row):
+        """Abre o código do quadro escolhido na pilha e destaca a linha"""
+        location = self.debug_panel.frame_location(row)
+        if location is None:
+            return
+        path, line = location
+        editor = None
+        if path == self.debug_run['filename'] and \
+                self.tab_manager.indexOf(self.debug_run['editor']) != -1:
+            editor = self.debug_run['editor']
+            self.tab_manager.setCurrentWidget(editor)
+            self.move_cursor(editor, line, 0)
+        elif os.path.isfile(path):
+            self.navigate_to(path, line)
+            editor = self.tab_manager.get_current_editor()
+        self.set_execution_line(editor, line)
+    
+    def set_execution_line(self, editor, line):
+        """Move o destaque da linha de execução para ``editor`` (None remove)"""
+        if self.execution_editor is not None and \
+                self.tab_manager.indexOf(self.execution_editor) != -1:
+            self.execution_editor.setExecutionLine(None)
+        self.execution_editor = editor
+        if editor is not None:
+            editor.setExecutionLine(line)
     
     def toggle_terminal(self):
         """Mostra/oculta o terminal integrado"""
@@ -777,8 +1211,7 @@ class IDEMainWindow(QMainWindow):
                 self.tab_manager.setCurrentIndex(existing_tab)
             else:
                 # Adiciona nova aba com o conteúdo
-                index = self.tab_manager.add_new_tab(file_path, content)
-                self._setup_autocomplete_for_tab(index)
+                self.tab_manager.add_new_tab(file_path, content)
             
             self.setWindowTitle(f"{IDE_TITLE} - {file_path}")
             self.file_info_label.setText(f"Arquivo aberto: {file_path}")
@@ -786,6 +1219,157 @@ class IDEMainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao abrir arquivo: {e}")
     
+    def word_under_cursor(self):
+        """Retorna (editor, nome, coluna inicial) do identificador sob o cursor"""
+        editor = self.tab_manager.get_current_editor()
+        if not editor:
+            return None, None, 0
+        cursor = editor.textCursor()
+        name, start = word_at(cursor.block().text(), cursor.positionInBlock())
+        if not name:
+            self.statusBar().showMessage("Nenhum nome sob o cursor", 3000)
+        return editor, name, start
+
+    def toggle_bookmark(self):
+        editor = self.tab_manager.get_current_editor()
+        if editor:
+            editor.toggleBookmark()
+    
+    def goto_bookmark(self, backwards):
+        """Vai ao próximo bookmark da aba (F2) ou ao anterior (Shift+F2)"""
+        editor = self.tab_manager.get_current_editor()
+        if editor and not editor.gotoMarker('bookmark', backwards):
+            self.statusBar().showMessage("Nenhum bookmark nesta aba (Ctrl+F2 marca a linha)", 3000)
+    
+    def goto_definition(self):
+        """Vai para a definição do nome sob o cursor (F12 / Ctrl+clique)"""
+        editor, name, start = self.word_under_cursor()
+        if not name:
+            return
+        cursor = editor.textCursor()
+        text = cursor.block().text()
+        attribute = is_attribute(text, start)
+
+        # Nomes do próprio arquivo vêm da tabela de símbolos, que acompanha
+        # o texto ainda não salvo; o resto vem do índice do workspace
+        local = None
+        symbols = self.tab_manager.get_current_tab_info().get('completer').symbols
+        if symbols is not None and (not attribute or is_self_attribute(text, start)):
+            indent = len(text) - len(text.lstrip())
+            local = symbols.definition_at(cursor.blockNumber() + 1, name, indent, attribute)
+        if local and local[0] != 'import':
+            self.move_cursor(editor, local[1], local[2])
+            return
+
+        definitions = workspace_index.find_definitions(name)
+        if attribute:
+            definitions = [d for d in definitions if d[3] in ('attribute', 'function')] or definitions
+        if len(definitions) == 1:
+            self.navigate_to(*definitions[0][:3])
+        elif definitions:
+            self.choose_definition(editor, name, definitions)
+        elif local:
+            self.move_cursor(editor, local[1], local[2])  # só o import é conhecido
+        else:
+            self.statusBar().showMessage(f"Definição de '{name}' não encontrada", 3000)
+
+    def choose_definition(self, editor, name, definitions):
+        """Mostra um menu no cursor para escolher entre várias definições"""
+        menu = QMenu(self)
+        for path, line, column, kind, scope in definitions:
+            location = f"{scope}.{name}" if scope else name
+            action = menu.addAction(f"{kind} {location} — {path}:{line}")
+            action.triggered.connect(
+                lambda checked, p=path, l=line, c=column: self.navigate_to(p, l, c))
+        menu.exec_(editor.viewport().mapToGlobal(editor.cursorRect().bottomRight()))
+
+    def find_references(self):
+        """Lista no painel as referências do nome sob o cursor (Shift+F12)"""
+        editor, name, start = self.word_under_cursor()
+        if not name:
+            return
+        if workspace_index.connection() is None:
+            self.statusBar().showMessage("Nenhum workspace indexado", 3000)
+            return
+        self.references_panel.start(name, workspace_index.find_definitions(name))
+
+    def navigate_to(self, path, line, column=0):
+        """Abre o arquivo (se ainda não for a aba atual) e posiciona o cursor"""
+        filename = self.tab_manager.get_current_tab_info().get('filename')
+        if not filename or os.path.abspath(filename) != os.path.abspath(path):
+            self.open_file_from_path(path)
+            filename = self.tab_manager.get_current_tab_info().get('filename')
+            if not filename or os.path.abspath(filename) != os.path.abspath(path):
+                return  # não foi possível abrir
+        self.move_cursor(self.tab_manager.get_current_editor(), line, column)
+
+    def move_cursor(self, editor, line, column):
+        """Posiciona o cursor na linha (1-based) e coluna em bytes da AST"""
+        block = editor.document().findBlockByNumber(max(0, line - 1))
+        if not block.isValid():
+            block = editor.document().lastBlock()
+        offset = min(byte_to_column(block.text(), column), block.length() - 1)
+        cursor = QTextCursor(block)
+        cursor.setPosition(block.position() + offset)
+        editor.setTextCursor(cursor)
+        editor.centerCursor()
+        editor.setFocus()
+
+    def show_diagnostics(self):
+        """Mostra estatísticas internas da IDE (cache de tokens)"""
+        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"{TextIcons.DIAGNOSTICS} Diagnósticos - PyPy IDE")
+        dialog.setGeometry(400, 300, 420, 240)
+        
+        layout = QVBoxLayout()
+        
+        stats_label = QLabel()
+        layout.addWidget(stats_label)
+        
+        def refresh():
+            stats = token_cache.get_stats()
+            stats_label.setText(
+                "Cache de tokens (compartilhado entre as abas):\n\n"
+                f"  Entradas: {stats['entries']} / {stats['max_entries']}\n"
+                f"  Caracteres: {stats['chars']} / {stats['max_chars']}\n"
+                f"  Hits: {stats['hits']}\n"
+                f"  Misses: {stats['misses']}\n"
+                f"  Taxa de acerto: {stats['hit_rate']:.1%}\n"
+                f"  Remoções (LRU): {stats['evictions']}"
+            )
+        
+        def clear():
+            token_cache.clear()
+            refresh()
+        
+        refresh()
+        
+        # Botões
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton("🔄 Atualizar")
+        refresh_button.clicked.connect(refresh)
+        clear_button = QPushButton(f"{TextIcons.CLEAR_CONSOLE} Limpar Cache")
+        clear_button.clicked.connect(clear)
+        ok_button = QPushButton(f"{TextIcons.SUCCESS} OK")
+        ok_button.clicked.connect(dialog.accept)
+        
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(clear_button)
+        button_layout.addWidget(ok_button)
+        layout.addLayout(button_layout)
+        
+        dialog.setLayout(layout)
+        dialog.exec_()
+    
+    def show_performance_panel(self):
+        """Mostra o painel de desempenho (não modal)"""
+        if self.performance_panel is None:
+            self.performance_panel = PerformancePanel(performance_monitor, self)
+        self.performance_panel.show()
+        self.performance_panel.raise_()
+    
     def show_about(self):
         """Mostra a janela Sobre"""
         from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
@@ -875,9 +1459,23 @@ ATALHOS DE TECLADO:
 
 🚀 Execução:
   F5         - Executar código
-  F6         - Debug
+  Shift+F5   - Parar a execução
+  Alt+F5     - Executar com profiler
+  Alt+Shift+F5  - Executar com amostragem (flame graph)
+  Ctrl+Shift+F5 - Executar com mapa de calor por linha
+  Ctrl+Alt+M - Executar com perfil de memória
+  Ctrl+Shift+L  - Saída completa da última execução
+  F6         - Depurar
+  F8         - Continuar (depurador)
+  F10/F11    - Passar por cima / entrar
+  Shift+F11  - Sair da função
   Ctrl+`     - Terminal integrado
 
+🔖 Bookmarks:
+  Ctrl+F2    - Marcar/desmarcar linha
+  F2         - Próximo bookmark
+  Shift+F2   - Bookmark anterior
+
 🗂️ Navegação:
   Ctrl+E     - Mostrar/ocultar explorador
   Ctrl+F     - Buscar
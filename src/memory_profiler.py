@@ -0,0 +1,246 @@
+import os
+import json
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+                             QSplitter)
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt5.QtCore import Qt, QPointF, pyqtSignal
+from .constants import DRACULA_COLORS
+from .profiler import SortableItem
+
+MEMORY_COLUMNS = ["Local", "Tamanho", "Blocos", "Δ Tamanho", "Δ Blocos"]
+
+# Linhas do arquivo executado marcadas no editor
+MEMORY_GUTTER_LINES = 10
+
+
+def format_size(size):
+    """Formata bytes (com sinal, para as diferenças)"""
+    sign = '-' if size < 0 else ''
+    size = abs(size)
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}" if unit == 'B' else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.2f} GB"
+
+
+def load_memory(path):
+    """Lê o resultado do modo "memory": {'elapsed', 'series', 'snapshots'}"""
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    for snapshot in data['snapshots']:
+        snapshot['by_line'] = {(filename, line): (size, count)
+                               for filename, line, size, count in snapshot['lines']}
+    return data
+
+
+def snapshot_line(snapshot, key):
+    """(tamanho, blocos) da linha na fotografia; None se ficou fora da lista guardada"""
+    value = snapshot['by_line'].get(key)
+    if value is None and snapshot['complete']:
+        return (0, 0)  # a lista tem todas as linhas: essa não tinha nada alocado
+    return value
+
+
+def largest_snapshot(data):
+    return max(data['snapshots'], key=lambda snapshot: snapshot['size'], default=None)
+
+
+def allocation_badges(data, filename):
+    """Marcas do editor: as linhas do arquivo que mais alocaram no momento de pico"""
+    snapshot = largest_snapshot(data)
+    if snapshot is None:
+        return {}
+    lines = [(path, line, size, count) for path, line, size, count in snapshot['lines']
+             if path == filename]
+    lines.sort(key=lambda item: item[2], reverse=True)
+    return {line: (format_size(size),
+                   f"Linha {line}: {format_size(size)} em {count} bloco(s) vivos "
+                   f"em t={snapshot['time']:.1f}s")
+            for path, line, size, count in lines[:MEMORY_GUTTER_LINES]}
+
+
+class MemoryPlot(QWidget):
+    """Gráfico da memória ao longo da execução: residente, pico residente e rastreada"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.series = []
+        self.snapshot_times = []
+        self.setMinimumHeight(120)
+
+    def set_data(self, series, snapshot_times):
+        self.series = series
+        self.snapshot_times = snapshot_times
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(DRACULA_COLORS['background']))
+        if len(self.series) < 2:
+            return
+        painter.setRenderHint(QPainter.Antialiasing)
+        duration = self.series[-1][0] or 1.0
+        highest = max(max(rss, current) for moment, rss, current, peak in self.series) or 1
+        left, top, bottom = 4, 18, self.height() - 4
+        width = self.width() - left - 4
+        height = bottom - top
+
+        def point(moment, value):
+            return QPointF(left + moment / duration * width, bottom - value / highest * height)
+
+        # Fotografias como linhas verticais
+        painter.setPen(QPen(QColor(DRACULA_COLORS['comment']), 1, Qt.DotLine))
+        for moment in self.snapshot_times:
+            x = left + moment / duration * width
+            painter.drawLine(QPointF(x, top), QPointF(x, bottom))
+
+        running_peak = 0
+        peaks = []
+        for moment, rss, current, peak in self.series:
+            running_peak = max(running_peak, rss)
+            peaks.append(point(moment, running_peak))
+        curves = [
+            ("Pico RSS", DRACULA_COLORS['error'], peaks),
+            ("RSS", DRACULA_COLORS['identifier'], [point(row[0], row[1]) for row in self.series]),
+            ("tracemalloc", DRACULA_COLORS['class'], [point(row[0], row[2]) for row in self.series]),
+        ]
+        x = left
+        for label, color, points in curves:
+            painter.setPen(QPen(QColor(color), 2))
+            painter.drawPolyline(QPolygonF(points))
+            painter.drawText(int(x), 13, label)
+            x += painter.fontMetrics().horizontalAdvance(label) + 16
+        painter.setPen(QColor(DRACULA_COLORS['foreground']))
+        painter.drawText(self.rect().adjusted(0, 2, -4, 0), Qt.AlignRight | Qt.AlignTop,
+                         f"máx. {format_size(highest)} em {duration:.1f}s")
+
+
+class MemoryPanel(QWidget):
+    """Painel do modo de memória: gráfico, fotografias e linhas que mais alocam.
+
+    Escolhendo uma segunda fotografia em "Comparar com", a tabela mostra
+    quanto cada linha cresceu ou diminuiu entre as duas. Cada fotografia
+    guarda só as maiores linhas; uma linha que ficou fora da lista de uma
+    delas não tem tamanho conhecido ali, e a diferença fica em branco.
+    """
+    location_selected = pyqtSignal(str, int, int)  # caminho, linha, coluna
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header = QHBoxLayout()
+        self.status_label = QLabel()
+        header.addWidget(self.status_label)
+        header.addStretch()
+        header.addWidget(QLabel("Fotografia:"))
+        self.snapshot_combo = QComboBox()
+        self.snapshot_combo.currentIndexChanged.connect(self.update_table)
+        header.addWidget(self.snapshot_combo)
+        header.addWidget(QLabel("Comparar com:"))
+        self.base_combo = QComboBox()
+        self.base_combo.currentIndexChanged.connect(self.update_table)
+        header.addWidget(self.base_combo)
+        close_button = QPushButton("✖")
+        close_button.setFlat(True)
+        close_button.setToolTip("Fechar painel")
+        close_button.clicked.connect(self.hide)
+        header.addWidget(close_button)
+        layout.addLayout(header)
+
+        splitter = QSplitter(Qt.Horizontal)
+        self.table = QTableWidget(0, len(MEMORY_COLUMNS))
+        self.table.setHorizontalHeaderLabels(MEMORY_COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setStyleSheet(f"background-color: {DRACULA_COLORS['background']}; "
+                                 f"color: {DRACULA_COLORS['foreground']};")
+        self.table.cellDoubleClicked.connect(self.open_row)
+        splitter.addWidget(self.table)
+        self.plot = MemoryPlot()
+        splitter.addWidget(self.plot)
+        splitter.setSizes([500, 300])
+        layout.addWidget(splitter)
+
+        self.setLayout(layout)
+
+    def show_memory(self, data):
+        self.data = data
+        self.plot.set_data(data['series'], [snapshot['time'] for snapshot in data['snapshots']])
+        labels = [f"t={snapshot['time']:.1f}s — {format_size(snapshot['size'])}"
+                  for snapshot in data['snapshots']]
+        for combo in (self.snapshot_combo, self.base_combo):
+            combo.blockSignals(True)
+            combo.clear()
+        self.base_combo.addItem("—")
+        self.snapshot_combo.addItems(labels)
+        self.base_combo.addItems(labels)
+        # Começa pela fotografia de maior uso, onde costuma estar o problema
+        largest = largest_snapshot(data)
+        if largest is not None:
+            self.snapshot_combo.setCurrentIndex(data['snapshots'].index(largest))
+        for combo in (self.snapshot_combo, self.base_combo):
+            combo.blockSignals(False)
+
+        peak_rss = max((row[1] for row in data['series']), default=0)
+        peak_traced = max((row[3] for row in data['series']), default=0)
+        self.status_label.setText(f"🧠 Memória: pico RSS {format_size(peak_rss)}, "
+                                  f"pico rastreado {format_size(peak_traced)}, "
+                                  f"{len(data['snapshots'])} fotografia(s)")
+        self.update_table()
+        self.show()
+
+    def update_table(self, *args):
+        if not self.data or self.snapshot_combo.currentIndex() < 0:
+            return
+        snapshot = self.data['snapshots'][self.snapshot_combo.currentIndex()]
+        base_index = self.base_combo.currentIndex() - 1
+        base = self.data['snapshots'][base_index] if base_index >= 0 else None
+
+        keys = set(snapshot['by_line'])
+        if base is not None:
+            keys |= set(base['by_line'])  # linhas que liberaram toda a memória também aparecem
+        self.table.setSortingEnabled(False)
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(keys))
+        for row, key in enumerate(keys):
+            path, line = key
+            current = snapshot_line(snapshot, key)
+            location = QTableWidgetItem(f"{os.path.basename(path)}:{line}")
+            location.setData(Qt.UserRole, key)
+            location.setToolTip(path)
+            self.table.setItem(row, 0, location)
+            if current is not None:
+                size, count = current
+                self.table.setItem(row, 1, SortableItem(format_size(size), size))
+                self.table.setItem(row, 2, SortableItem(str(count), count))
+            else:
+                self.table.setItem(row, 1, SortableItem("—", 0))
+                self.table.setItem(row, 2, SortableItem("—", 0))
+            previous = snapshot_line(base, key) if base is not None else None
+            if current is not None and previous is not None:
+                size, count = current
+                base_size, base_count = previous
+                self.table.setItem(row, 3, SortableItem(format_size(size - base_size),
+                                                        size - base_size))
+                self.table.setItem(row, 4, SortableItem(f"{count - base_count:+d}",
+                                                        count - base_count))
+            else:
+                self.table.setItem(row, 3, SortableItem("", 0))
+                self.table.setItem(row, 4, SortableItem("", 0))
+        self.table.setSortingEnabled(True)
+        self.table.sortItems(3 if base is not None else 1, Qt.DescendingOrder)
+        self.table.setUpdatesEnabled(True)
+
+    def open_row(self, row, column=0):
+        path, line = self.table.item(row, 0).data(Qt.UserRole)
+        self.location_selected.emit(path, line, 0)
@@ -0,0 +1,170 @@
+import re
+import os
+import linecache
+import threading
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTreeWidget, QTreeWidgetItem, QHeaderView)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from .constants import DRACULA_COLORS
+from .workspace_index import workspace_index
+
+# Identificador Python (inclui letras acentuadas)
+IDENTIFIER_PATTERN = re.compile(r'\w+')
+
+# Referências enviadas ao painel por vez
+REFERENCE_BATCH = 200
+
+
+def word_at(text, column):
+    """Identificador sob a coluna: (palavra, coluna inicial) ou (None, column)"""
+    for match in IDENTIFIER_PATTERN.finditer(text):
+        if match.start() <= column <= match.end():
+            if match.group()[0].isdigit():
+                break
+            return match.group(), match.start()
+        if match.start() > column:
+            break
+    return None, column
+
+
+def byte_to_column(text, offset):
+    """Converte a coluna em bytes UTF-8 da AST para a coluna em caracteres"""
+    return len(text.encode('utf-8')[:offset].decode('utf-8', errors='ignore'))
+
+
+def is_self_attribute(text, start):
+    """Verifica se a palavra que começa em ``start`` é acessada como ``self.nome``"""
+    return text[:start].rstrip().endswith('self.')
+
+
+def is_attribute(text, start):
+    """Verifica se a palavra que começa em ``start`` vem depois de um ponto"""
+    return text[:start].rstrip().endswith('.')
+
+
+class ReferenceSearch(QThread):
+    """Lê as referências de um nome do índice e as envia em lotes"""
+    batch_signal = pyqtSignal(int, list)  # id da busca, [(caminho, linha, coluna, texto)]
+    finished_signal = pyqtSignal(int, int)  # id da busca, total de referências
+
+    def __init__(self, search_id, name):
+        super().__init__()
+        self.search_id = search_id
+        self.name = name
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        total = 0
+        for rows in workspace_index.iter_references(self.name, REFERENCE_BATCH):
+            if self.cancelled.is_set():
+                return
+            # O texto da linha é lido aqui para não travar a interface
+            batch = [(path, line, column, linecache.getline(path, line).strip())
+                     for path, line, column in rows]
+            total += len(batch)
+            self.batch_signal.emit(self.search_id, batch)
+        self.finished_signal.emit(self.search_id, total)
+
+
+class ReferencesPanel(QWidget):
+    """Painel com os resultados de "Encontrar Referências", agrupados por arquivo"""
+    location_selected = pyqtSignal(str, int, int)  # caminho, linha, coluna
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search = None
+        self.search_id = 0
+        self.name = ''
+        self.file_items = {}  # caminho -> item do arquivo na árvore
+        self.count = 0
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header = QHBoxLayout()
+        self.status_label = QLabel()
+        header.addWidget(self.status_label)
+        header.addStretch()
+        close_button = QPushButton("✖")
+        close_button.setFlat(True)
+        close_button.setToolTip("Fechar painel")
+        close_button.clicked.connect(self.close_panel)
+        header.addWidget(close_button)
+        layout.addLayout(header)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Local", "Código"])
+        self.tree.setUniformRowHeights(True)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.tree.setStyleSheet(f"background-color: {DRACULA_COLORS['background']}; "
+                                f"color: {DRACULA_COLORS['foreground']};")
+        self.tree.itemActivated.connect(self.open_item)
+        layout.addWidget(self.tree)
+
+        self.setLayout(layout)
+
+    def start(self, name, definitions=()):
+        """Inicia uma busca; as definições aparecem primeiro, as referências
+        vão chegando em lotes enquanto são lidas do índice"""
+        self.cancel()
+        self.tree.clear()
+        self.file_items = {}
+        self.count = 0
+        self.name = name
+        self.search_id += 1
+
+        for path, line, column, kind, scope in definitions:
+            self.add_location(path, line, column, f"{kind} {name}  (definição)")
+        self.status_label.setText(f"🔗 Referências de '{name}': buscando...")
+        self.show()
+
+        self.search = ReferenceSearch(self.search_id, name)
+        self.search.batch_signal.connect(self.add_batch)
+        self.search.finished_signal.connect(self.search_finished)
+        self.search.start()
+
+    def cancel(self):
+        """Interrompe a busca em andamento"""
+        if self.search is not None:
+            self.search.cancel()
+            self.search.wait()
+            self.search = None
+
+    def add_batch(self, search_id, batch):
+        if search_id != self.search_id:
+            return  # lote de uma busca anterior
+        self.tree.setUpdatesEnabled(False)
+        for path, line, column, text in batch:
+            self.add_location(path, line, column, text)
+        self.tree.setUpdatesEnabled(True)
+        self.status_label.setText(f"🔗 Referências de '{self.name}': {self.count} (buscando...)")
+
+    def search_finished(self, search_id, total):
+        if search_id != self.search_id:
+            return
+        self.status_label.setText(f"🔗 Referências de '{self.name}': {self.count} "
+                                  f"em {len(self.file_items)} arquivo(s)")
+
+    def add_location(self, path, line, column, text):
+        file_item = self.file_items.get(path)
+        if file_item is None:
+            file_item = QTreeWidgetItem(self.tree, [os.path.basename(path), path])
+            file_item.setExpanded(True)
+            self.file_items[path] = file_item
+        item = QTreeWidgetItem(file_item, [f"{line}:{column + 1}", text])
+        item.setData(0, Qt.UserRole, (path, line, column))
+        self.count += 1
+
+    def open_item(self, item, column=0):
+        location = item.data(0, Qt.UserRole)
+        if location:
+            self.location_selected.emit(*location)
+
+    def close_panel(self):
+        self.cancel()
+        self.hide()
@@ -0,0 +1,297 @@
+import os
+import re
+import mmap
+import bisect
+import tempfile
+from array import array
+from PyQt5.QtWidgets import (QAbstractScrollArea, QDialog, QVBoxLayout, QHBoxLayout, QLineEdit,
+                             QPushButton, QLabel, QSpinBox)
+from PyQt5.QtGui import QFont, QColor, QPainter
+from PyQt5.QtCore import Qt, QTimer
+from .constants import DRACULA_COLORS, EDITOR_CONFIG, RUN_CONFIG
+
+# Bytes indexados por passo, para não travar a interface em saídas enormes
+INDEX_STEP_BYTES = 8 * 1024 * 1024
+
+NEWLINE_PATTERN = re.compile(b'\n')
+
+# Caracteres desenhados por linha (o resto de linhas gigantes é cortado)
+MAX_PAINTED_CHARS = 2000
+
+
+def search_pattern(text):
+    """Regex de bytes UTF-8 que acha o texto ignorando maiúsculas (inclusive acentuadas)"""
+    parts = []
+    for char in text:
+        variants = {char, char.lower(), char.upper()}
+        if len(variants) == 1 or any(len(variant) != 1 for variant in variants):
+            parts.append(re.escape(char.encode('utf-8')))
+        else:
+            parts.append(b'(?:' + b'|'.join(re.escape(variant.encode('utf-8'))
+                                             for variant in sorted(variants)) + b')')
+    return re.compile(b''.join(parts))
+
+
+class OutputSpool:
+    """Saída completa de uma execução, gravada num arquivo temporário.
+
+    O texto vai direto para o disco; o índice com o início de cada linha é
+    montado aos poucos (``index_step``) sobre um mapeamento em memória do
+    arquivo, e as linhas são lidas do mapeamento só quando são desenhadas.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.file = None
+        self.map = None
+        self.mapped_size = 0
+        self.offsets = array('Q', [0])  # início de cada linha
+        self.indexed = 0  # bytes já percorridos pelo índice
+        self.size = 0
+
+    def reset(self):
+        """Descarta a saída anterior e começa um arquivo novo"""
+        self.close()
+        descriptor, self.path = tempfile.mkstemp(prefix='pypy_ide_output_', suffix='.log')
+        self.file = os.fdopen(descriptor, 'wb')
+        self.offsets = array('Q', [0])
+        self.indexed = 0
+        self.size = 0
+
+    def write(self, text):
+        if self.file is None:
+            self.reset()
+        data = text.encode('utf-8')
+        self.file.write(data)
+        self.size += len(data)
+
+    def _remap(self):
+        """Atualiza o mapeamento se o arquivo cresceu"""
+        if self.file is None or self.size == self.mapped_size:
+            return
+        self.file.flush()
+        if self.map is not None:
+            self.map.close()
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.mapped_size = len(self.map)
+
+    def index_step(self, limit=INDEX_STEP_BYTES):
+        """Indexa mais um trecho do arquivo; retorna True se ainda falta"""
+        self._remap()
+        if self.map is None:
+            return False
+        end = min(self.mapped_size, self.indexed + limit)
+        self.offsets.extend(match.end()
+                            for match in NEWLINE_PATTERN.finditer(self.map, self.indexed, end))
+        self.indexed = end
+        return end < self.mapped_size
+
+    def index_all(self):
+        while self.index_step():
+            pass
+
+    def line_count(self):
+        """Linhas indexadas até agora (sem a linha vazia depois do último \\n)"""
+        if self.offsets[-1] == self.indexed and len(self.offsets) > 1:
+            return len(self.offsets) - 1
+        return len(self.offsets)
+
+    def line(self, number):
+        """Texto da linha ``number`` (0-based)"""
+        if self.map is None or number >= len(self.offsets):
+            return ''
+        start = self.offsets[number]
+        end = self.offsets[number + 1] - 1 if number + 1 < len(self.offsets) else self.indexed
+        end = min(end, start + MAX_PAINTED_CHARS * 4)
+        return self.map[start:end].decode('utf-8', errors='replace').rstrip('\r')
+
+    def line_at(self, offset):
+        """Número da linha que contém o byte ``offset``"""
+        return bisect.bisect_right(self.offsets, offset) - 1
+
+    def find(self, text, start_line=0, backwards=False):
+        """Próxima linha (0-based) que contém o texto, ou None; ignora maiúsculas"""
+        self.index_all()
+        if self.map is None or not text:
+            return None
+        pattern = search_pattern(text)
+        if backwards:
+            end = self.offsets[max(0, start_line)]
+            last = None
+            for match in pattern.finditer(self.map, 0, end):
+                last = match
+            return self.line_at(last.start()) if last else None
+        start = self.offsets[min(start_line, len(self.offsets) - 1)]
+        match = pattern.search(self.map, start)
+        return self.line_at(match.start()) if match else None
+
+    def close(self):
+        """Fecha e apaga o arquivo"""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.mapped_size = 0
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+class SpoolView(QAbstractScrollArea):
+    """Visualizador virtual: desenha só as linhas visíveis de um OutputSpool"""
+
+    def __init__(self, spool, parent=None):
+        super().__init__(parent)
+        self.spool = spool
+        self.highlighted = None  # linha marcada pela busca / "ir para linha"
+        font = QFont(EDITOR_CONFIG['font_family'], EDITOR_CONFIG['font_size'])
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+        self.viewport().setAutoFillBackground(False)
+        self.verticalScrollBar().valueChanged.connect(self.viewport().update)
+        self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+        self.update_range()
+
+    def line_height(self):
+        return self.fontMetrics().height()
+
+    def visible_lines(self):
+        return max(1, self.viewport().height() // self.line_height())
+
+    def gutter_width(self):
+        return self.fontMetrics().horizontalAdvance('9') * (len(str(self.spool.line_count())) + 2)
+
+    def update_range(self):
+        """Ajusta as barras de rolagem ao número de linhas indexadas"""
+        scrollbar = self.verticalScrollBar()
+        at_end = scrollbar.value() >= scrollbar.maximum()
+        scrollbar.setRange(0, max(0, self.spool.line_count() - self.visible_lines()))
+        scrollbar.setPageStep(self.visible_lines())
+        self.horizontalScrollBar().setRange(
+            0, self.fontMetrics().horizontalAdvance('M') * MAX_PAINTED_CHARS)
+        self.horizontalScrollBar().setPageStep(self.viewport().width())
+        if at_end and self.highlighted is None:
+            scrollbar.setValue(scrollbar.maximum())  # acompanha o fim enquanto a saída cresce
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_range()
+
+    def go_to_line(self, number):
+        """Mostra e marca a linha ``number`` (0-based)"""
+        self.highlighted = number
+        self.verticalScrollBar().setValue(max(0, number - self.visible_lines() // 2))
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), QColor(DRACULA_COLORS['background']))
+        height = self.line_height()
+        ascent = self.fontMetrics().ascent()
+        gutter = self.gutter_width()
+        left = gutter + 4 - self.horizontalScrollBar().value()
+        first = self.verticalScrollBar().value()
+        last = min(self.spool.line_count(), first + self.visible_lines() + 1)
+
+        for row, number in enumerate(range(first, last)):
+            top = row * height
+            if number == self.highlighted:
+                painter.fillRect(0, top, self.viewport().width(), height,
+                                 QColor(DRACULA_COLORS['selection']))
+            painter.setPen(QColor(DRACULA_COLORS['foreground']))
+            painter.drawText(left, top + ascent, self.spool.line(number)[:MAX_PAINTED_CHARS])
+
+        # Números de linha por cima do texto rolado na horizontal
+        painter.fillRect(0, 0, gutter, self.viewport().height(),
+                         QColor(DRACULA_COLORS['line_number_bg']))
+        painter.setPen(QColor(DRACULA_COLORS['line_number_fg']))
+        for row, number in enumerate(range(first, last)):
+            painter.drawText(0, row * height, gutter - 6, height, Qt.AlignRight, str(number + 1))
+
+
+class OutputViewerDialog(QDialog):
+    """Janela com a saída completa da última execução, com busca e "ir para linha\""""
+
+    def __init__(self, spool, parent=None):
+        super().__init__(parent)
+        self.spool = spool
+        self.setWindowTitle("📜 Saída Completa - PyPy IDE")
+        self.setGeometry(300, 200, 900, 600)
+        self.setup_ui()
+
+        # Indexa aos poucos e acompanha a saída enquanto o programa roda
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(RUN_CONFIG['viewer_refresh_ms'])
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start()
+        self.refresh()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        search_layout = QHBoxLayout()
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("Buscar...")
+        self.search_field.returnPressed.connect(self.find_next)
+        search_layout.addWidget(self.search_field)
+        previous_button = QPushButton("⬆️ Anterior")
+        previous_button.clicked.connect(self.find_previous)
+        search_layout.addWidget(previous_button)
+        next_button = QPushButton("⬇️ Próximo")
+        next_button.clicked.connect(self.find_next)
+        search_layout.addWidget(next_button)
+
+        search_layout.addWidget(QLabel("Linha:"))
+        self.line_field = QSpinBox()
+        self.line_field.setRange(1, 1)
+        self.line_field.editingFinished.connect(self.jump_to_line)
+        search_layout.addWidget(self.line_field)
+        layout.addLayout(search_layout)
+
+        self.view = SpoolView(self.spool)
+        layout.addWidget(self.view)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        self.setLayout(layout)
+
+    def refresh(self):
+        self.spool.index_step()
+        lines = self.spool.line_count()
+        self.line_field.setMaximum(max(1, lines))
+        self.view.update_range()
+        size = self.spool.size / (1024 * 1024)
+        indexing = " (indexando...)" if self.spool.indexed < self.spool.size else ""
+        self.status_label.setText(f"{lines} linhas, {size:.1f} MB{indexing}")
+
+    def find_next(self):
+        start = self.view.highlighted + 1 if self.view.highlighted is not None \
+            else self.view.verticalScrollBar().value()
+        self.show_result(self.spool.find(self.search_field.text(), start))
+
+    def find_previous(self):
+        start = self.view.highlighted if self.view.highlighted is not None \
+            else self.view.verticalScrollBar().value()
+        self.show_result(self.spool.find(self.search_field.text(), start, backwards=True))
+
+    def show_result(self, number):
+        if number is None:
+            self.status_label.setText(f"'{self.search_field.text()}' não encontrado")
+            return
+        self.view.go_to_line(number)
+        self.line_field.setValue(number + 1)
+
+    def jump_to_line(self):
+        self.spool.index_all()
+        self.view.update_range()
+        self.view.go_to_line(min(self.line_field.value(), self.spool.line_count()) - 1)
+
+    def closeEvent(self, event):
+        self.refresh_timer.stop()
+        super().closeEvent(event)
@@ -1,8 +1,170 @@
 import subprocess
 import sys
 import os
+import json
+import threading
+from importlib import metadata
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTextEdit, QLabel, QMessageBox
 from PyQt5.QtCore import QThread, pyqtSignal
+from .constants import CACHE_DIR
+
+
+class PackageIndex:
+    """Índice dos pacotes instalados lido em processo com importlib.metadata.
+
+    Cada distribuição é mapeada para os módulos que ela torna importáveis
+    (top_level.txt ou, na falta dele, os arquivos do RECORD). O resultado
+    fica em cache no disco por diretório site-packages: um diretório só é
+    relido quando seu mtime muda, e mesmo assim só as pastas .dist-info
+    novas são abertas.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path or os.path.join(CACHE_DIR, 'package_index.json')
+        self.directories = None  # diretório -> {'mtime', 'distributions'}
+        self.lock = threading.Lock()
+
+    def site_directories(self):
+        """Retorna os diretórios site-packages do interpretador atual"""
+        directories = []
+        for path in sys.path:
+            if path and os.path.basename(path) in ('site-packages', 'dist-packages') \
+                    and os.path.isdir(path) and path not in directories:
+                directories.append(path)
+        return directories
+
+    def refresh(self):
+        """Relê os diretórios alterados; retorna True se algo mudou"""
+        with self.lock:
+            if self.directories is None:
+                self.directories = self._load_cache()
+
+            changed = False
+            current = self.site_directories()
+            for directory in list(self.directories):
+                if directory not in current:
+                    del self.directories[directory]
+                    changed = True
+
+            for directory in current:
+                try:
+                    mtime = os.stat(directory).st_mtime
+                except OSError:
+                    continue
+                entry = self.directories.get(directory)
+                if entry is None or entry['mtime'] != mtime:
+                    previous = entry['distributions'] if entry else {}
+                    self.directories[directory] = {
+                        'mtime': mtime,
+                        'distributions': self._scan_directory(directory, previous)
+                    }
+                    changed = True
+
+            if changed:
+                self._save_cache()
+            return changed
+
+    def _scan_directory(self, directory, previous):
+        """Lê as distribuições de um site-packages, reaproveitando as já conhecidas"""
+        distributions = {}
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            return distributions
+        for entry in entries:
+            if not entry.endswith(('.dist-info', '.egg-info')):
+                continue
+            if entry in previous:
+                distributions[entry] = previous[entry]
+                continue
+            info = self._read_distribution(os.path.join(directory, entry))
+            if info:
+                distributions[entry] = info
+        return distributions
+
+    def _read_distribution(self, path):
+        """Lê nome, versão e módulos importáveis de uma pasta .dist-info"""
+        try:
+            distribution = metadata.Distribution.at(path)
+            name = distribution.metadata['Name']
+            if not name:
+                return None
+            return {
+                'name': name,
+                'version': distribution.version or '',
+                'modules': sorted(self._distribution_modules(distribution))
+            }
+        except Exception:
+            return None
+
+    def _distribution_modules(self, distribution):
+        """Módulos de nível superior fornecidos por uma distribuição"""
+        top_level = distribution.read_text('top_level.txt')
+        if top_level:
+            return {line.strip().replace('/', '.') for line in top_level.splitlines()
+                    if line.strip() and not line.startswith('_')}
+
+        modules = set()
+        for file in distribution.files or []:
+            parts = file.parts
+            if not parts or parts[0] in ('..', '__pycache__') or \
+                    parts[0].endswith(('.dist-info', '.egg-info', '.data', '.pth')):
+                continue
+            if len(parts) > 1:
+                name = parts[0]  # pacote
+            elif parts[0].endswith(('.py', '.pyd', '.so')):
+                name = parts[0].split('.')[0]  # módulo ou extensão
+            else:
+                continue
+            if name.isidentifier() and not name.startswith('_'):
+                modules.add(name)
+        return modules
+
+    def _load_cache(self):
+        """Carrega o índice salvo, se for deste interpretador"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') == self.CACHE_VERSION and data.get('python') == sys.executable:
+                return data['directories']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def _save_cache(self):
+        """Grava o índice no disco"""
+        data = {'version': self.CACHE_VERSION, 'python': sys.executable,
+                'directories': self.directories}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temporary = self.cache_path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(temporary, self.cache_path)
+        except OSError as e:
+            print(f"Erro ao salvar índice de pacotes: {e}")
+
+    def get_distributions(self):
+        """Retorna {nome da distribuição: {'version', 'modules'}}"""
+        if self.directories is None:
+            self.refresh()
+        with self.lock:
+            return {
+                info['name']: {'version': info['version'], 'modules': info['modules']}
+                for entry in self.directories.values()
+                for info in entry['distributions'].values()
+            }
+
+    def get_modules(self):
+        """Retorna os nomes importáveis de todos os pacotes instalados"""
+        return sorted({module for info in self.get_distributions().values()
+                       for module in info['modules']})
+
+
+# Instância global
+package_index = PackageIndex()
 
 
 class PackageInstallerThread(QThread):
@@ -39,6 +201,7 @@ class PackageInstallerThread(QThread):
             # Verifica se houve erro
             return_code = process.poll()
             if return_code == 0:
+                package_index.refresh()
                 self.finished_signal.emit(True, f"Pacote {self.package_name} instalado com sucesso!")
             else:
                 error_output = process.stderr.read()
@@ -50,6 +213,7 @@ class PackageInstallerThread(QThread):
 
 class PackageManagerDialog(QDialog):
     """Dialog para gerenciar pacotes Python"""
+    packages_changed = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -112,6 +276,7 @@ class PackageManagerDialog(QDialog):
     def installation_finished(self, success, message):
         self.install_button.setEnabled(True)
         if success:
+            self.packages_changed.emit()
             self.output_area.append(f"\n✅ {message}")
             QMessageBox.information(self, "Sucesso", message)
         else:
@@ -120,17 +285,14 @@ class PackageManagerDialog(QDialog):
     
     def list_installed_packages(self):
         try:
-            result = subprocess.run(
-                [sys.executable, "-m", "pip", "list"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                self.output_area.clear()
-                self.output_area.append("📦 Pacotes Instalados:\n")
-                self.output_area.append(result.stdout)
-            else:
-                self.output_area.append(f"Erro ao listar pacotes: {result.stderr}")
+            package_index.refresh()
+            distributions = package_index.get_distributions()
+            self.output_area.clear()
+            self.output_area.append("📦 Pacotes Instalados:\n")
+            for name in sorted(distributions, key=str.lower):
+                info = distributions[name]
+                modules = ", ".join(info['modules'])
+                self.output_area.append(f"{name} {info['version']}  ({modules})")
         except Exception as e:
             self.output_area.append(f"Erro: {str(e)}")
 
@@ -138,18 +300,16 @@ class PackageManagerDialog(QDialog):
 def get_installed_packages():
     """Retorna lista de pacotes instalados"""
     try:
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "list", "--format=freeze"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            packages = []
-            for line in result.stdout.split('\n'):
-                if line.strip():
-                    package_name = line.split('==')[0].lower()
-                    packages.append(package_name)
-            return packages
+        package_index.refresh()
+        return sorted(name.lower() for name in package_index.get_distributions())
+    except Exception:
+        return []
+
+
+def get_installed_modules():
+    """Retorna os módulos importáveis dos pacotes instalados"""
+    try:
+        package_index.refresh()
+        return package_index.get_modules()
+    except Exception:
         return []
-    except:
-        return [] 
\ No newline at end of file
@@ -0,0 +1,288 @@
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog,
+                             QMessageBox)
+from PyQt5.QtCore import QObject, QTimer
+
+
+# Limites dos histogramas (ms); o último intervalo é "acima de 100 ms"
+HISTOGRAM_BUCKETS = (0.5, 1, 2, 4, 8, 16, 33, 50, 100)
+
+
+class PerformanceMonitor:
+    """Coleta tempos de operações do editor para diagnóstico de lentidão.
+
+    Desativado por padrão: nesse estado cada ponto instrumentado custa só
+    uma verificação de ``enabled``. Quando ativo, guarda uma janela
+    deslizante de amostras por operação e os eventos para exportar no
+    formato de trace do Chrome (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, window_size=2000, max_trace_events=200000):
+        self.enabled = False
+        self.window_size = window_size
+        self.samples = {}
+        self.trace_events = deque(maxlen=max_trace_events)
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+        self.probe = None  # EventLoopProbe, ligado só durante a coleta
+
+    def enable(self):
+        """Ativa a coleta"""
+        self.enabled = True
+        if self.probe is not None:
+            self.probe.start()
+
+    def disable(self):
+        """Desativa a coleta (as amostras já coletadas são mantidas)"""
+        self.enabled = False
+        if self.probe is not None:
+            self.probe.stop()
+
+    def clear(self):
+        """Descarta as amostras e eventos coletados"""
+        with self.lock:
+            self.samples.clear()
+            self.trace_events.clear()
+            self.origin = time.perf_counter()
+
+    def record(self, name, start, end):
+        """Registra uma operação que começou em ``start`` e terminou em ``end``
+        (valores de time.perf_counter)"""
+        duration = (end - start) * 1000
+        with self.lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window_size)
+            samples.append(duration)
+            self.trace_events.append((name, start, end, threading.get_ident()))
+
+    def timed(self, name):
+        """Decorator que mede o tempo de cada chamada da função"""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, start, time.perf_counter())
+            return wrapper
+        return decorator
+
+    def get_stats(self):
+        """Retorna estatísticas e histograma de cada operação"""
+        with self.lock:
+            snapshot = {name: list(samples) for name, samples in self.samples.items()}
+
+        stats = {}
+        for name, samples in snapshot.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            count = len(ordered)
+            histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+            for value in ordered:
+                for index, limit in enumerate(HISTOGRAM_BUCKETS):
+                    if value <= limit:
+                        histogram[index] += 1
+                        break
+                else:
+                    histogram[-1] += 1
+            stats[name] = {
+                'count': count,
+                'mean': sum(ordered) / count,
+                'p50': ordered[int(0.50 * (count - 1))],
+                'p90': ordered[int(0.90 * (count - 1))],
+                'p99': ordered[int(0.99 * (count - 1))],
+                'max': ordered[-1],
+                'histogram': histogram
+            }
+        return stats
+
+    def export_chrome_trace(self, path):
+        """Grava os eventos coletados no formato JSON de trace do Chrome"""
+        with self.lock:
+            events = list(self.trace_events)
+            origin = self.origin
+
+        pid = os.getpid()
+        trace = {
+            'traceEvents': [
+                {
+                    'name': name,
+                    'cat': 'pypy-ide',
+                    'ph': 'X',
+                    'ts': round((start - origin) * 1e6, 3),
+                    'dur': round((end - start) * 1e6, 3),
+                    'pid': pid,
+                    'tid': tid
+                }
+                for name, start, end, tid in events
+            ],
+            'displayTimeUnit': 'ms'
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(trace, file)
+        return len(events)
+
+
+# Instância global
+performance_monitor = PerformanceMonitor()
+
+
+def timed(name):
+    """Atalho para ``performance_monitor.timed(name)``"""
+    return performance_monitor.timed(name)
+
+
+class EventLoopProbe(QObject):
+    """Mede o atraso do loop de eventos com um timer periódico.
+
+    Se o timer dispara depois do intervalo esperado, a diferença é o tempo
+    em que o loop ficou ocupado sem processar eventos.
+    """
+
+    def __init__(self, monitor, interval=50, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self.interval = interval
+        self.last = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        now = time.perf_counter()
+        expected = self.last + self.interval / 1000
+        if self.monitor.enabled and now > expected:
+            self.monitor.record('event_loop_lag', expected, now)
+        self.last = now
+
+
+class PerformancePanel(QDialog):
+    """Painel com histogramas das operações instrumentadas"""
+
+    COLUMNS = ["Operação", "Chamadas", "Média", "p50", "p90", "p99", "Máx", "Histograma"]
+
+    def __init__(self, monitor=performance_monitor, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self.setWindowTitle("⏱️ Performance - PyPy IDE")
+        self.setGeometry(400, 300, 820, 360)
+        self.setup_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(500)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        legend = " ".join(f"≤{limit}" for limit in HISTOGRAM_BUCKETS) + " >100 (ms)"
+        layout.addWidget(QLabel(f"Intervalos do histograma: {legend}"))
+
+        # Botões
+        button_layout = QHBoxLayout()
+        self.toggle_button = QPushButton()
+        self.toggle_button.clicked.connect(self.toggle_monitoring)
+        clear_button = QPushButton("🧹 Limpar")
+        clear_button.clicked.connect(self.clear)
+        export_button = QPushButton("💾 Exportar Trace")
+        export_button.clicked.connect(self.export_trace)
+        close_button = QPushButton("✅ Fechar")
+        close_button.clicked.connect(self.close)
+
+        button_layout.addWidget(self.toggle_button)
+        button_layout.addWidget(clear_button)
+        button_layout.addWidget(export_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def toggle_monitoring(self):
+        """Ativa ou desativa a coleta"""
+        if self.monitor.enabled:
+            self.monitor.disable()
+        else:
+            self.monitor.enable()
+        self.refresh()
+
+    def clear(self):
+        self.monitor.clear()
+        self.refresh()
+
+    def export_trace(self):
+        """Exporta os eventos para um arquivo de trace do Chrome"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Trace", "pypy_ide_trace.json",
+            "Trace JSON (*.json);;Todos os Arquivos (*)"
+        )
+        if filename:
+            try:
+                count = self.monitor.export_chrome_trace(filename)
+                QMessageBox.information(self, "Trace Exportado",
+                                        f"{count} eventos gravados em {filename}.\n"
+                                        "Abra em chrome://tracing ou ui.perfetto.dev.")
+            except Exception as e:
+                QMessageBox.critical(self, "Erro", f"Erro ao exportar trace: {e}")
+
+    def refresh(self):
+        """Atualiza a tabela com as estatísticas atuais"""
+        if self.monitor.enabled:
+            self.status_label.setText("🟢 Coleta ativa")
+            self.toggle_button.setText("⏸️ Desativar")
+        else:
+            self.status_label.setText("⚪ Coleta desativada")
+            self.toggle_button.setText("▶️ Ativar")
+
+        stats = self.monitor.get_stats()
+        self.table.setRowCount(len(stats))
+        for row, name in enumerate(sorted(stats)):
+            data = stats[name]
+            values = [name, str(data['count'])]
+            values += [f"{data[key]:.2f}" for key in ('mean', 'p50', 'p90', 'p99', 'max')]
+            values.append(self.histogram_bar(data['histogram']))
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+
+    def histogram_bar(self, histogram):
+        """Desenha o histograma como uma barra de caracteres"""
+        blocks = " ▁▂▃▄▅▆▇█"
+        peak = max(histogram) or 1
+        return "".join(blocks[round(count / peak * (len(blocks) - 1))] for count in histogram)
+
+    def showEvent(self, event):
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
@@ -0,0 +1,162 @@
+import os
+import json
+import pstats
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt, pyqtSignal
+from .constants import DRACULA_COLORS
+
+# Entrada que o próprio cProfile deixa ao ser desligado no fim da execução
+PROFILER_DISABLE = ('~', 0, "<method 'disable' of '_lsprof.Profiler' objects>")
+
+PROFILE_COLUMNS = ["Função", "Local", "Chamadas", "Tempo próprio", "Tempo total", "% total"]
+
+
+class ProfileEntry:
+    """Estatísticas de uma função numa execução com cProfile"""
+    __slots__ = ('name', 'path', 'line', 'calls', 'primitive_calls', 'self_time', 'total_time')
+
+    def __init__(self, name, path, line, calls, primitive_calls, self_time, total_time):
+        self.name = name
+        self.path = path
+        self.line = line
+        self.calls = calls
+        self.primitive_calls = primitive_calls  # chamadas que não são recursivas
+        self.self_time = self_time
+        self.total_time = total_time
+
+    def is_builtin(self):
+        return self.path == '~'
+
+    def location(self):
+        if self.is_builtin():
+            return "(embutida)"
+        return f"{os.path.basename(self.path)}:{self.line}"
+
+    def calls_text(self):
+        # Igual ao pstats: "total/primitivas" quando há recursão
+        if self.calls != self.primitive_calls:
+            return f"{self.calls}/{self.primitive_calls}"
+        return str(self.calls)
+
+
+def load_profile(path):
+    """Lê o arquivo gravado pelo cProfile; retorna (entradas, tempo total)"""
+    stats = pstats.Stats(path)
+    entries = []
+    for (filename, line, name), (primitive, calls, self_time, total_time, callers) \
+            in stats.stats.items():
+        if (filename, line, name) == PROFILER_DISABLE:
+            continue
+        entries.append(ProfileEntry(name, filename, line, calls, primitive, self_time, total_time))
+    return entries, stats.total_tt
+
+
+def format_duration(seconds):
+    """Formata um tempo para a tabela e para as marcas do editor"""
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 0.001:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds * 1000000:.0f} µs"
+
+
+def load_line_heat(path):
+    """Lê o resultado do modo "lines"; retorna ({linha: (intensidade, dica)}, linha mais quente)"""
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    total = sum(seconds for line, hits, seconds in data['lines'])
+    hottest = max(data['lines'], key=lambda item: item[2], default=None)
+    if hottest is None:
+        return {}, None
+    heat = {}
+    for line, hits, seconds in data['lines']:
+        # Relativa à linha mais quente, para que o laço principal fique vermelho
+        intensity = seconds / hottest[2] if hottest[2] else 0.0
+        share = seconds / total * 100 if total else 0.0
+        heat[line] = (intensity, f"Linha {line}: {hits} execução(ões), "
+                                 f"{format_duration(seconds)} ({share:.1f}% do tempo)")
+    return heat, hottest[0]
+
+
+class SortableItem(QTableWidgetItem):
+    """Célula que ordena pelo valor numérico em vez do texto exibido"""
+
+    def __init__(self, text, value):
+        super().__init__(text)
+        self.setData(Qt.UserRole, value)
+        self.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+    def __lt__(self, other):
+        return self.data(Qt.UserRole) < other.data(Qt.UserRole)
+
+
+class ProfilerPanel(QWidget):
+    """Painel com as funções mais caras da última execução com profiler.
+
+    As colunas podem ser ordenadas (clique no cabeçalho); duplo clique numa
+    função abre o arquivo na linha da definição.
+    """
+    location_selected = pyqtSignal(str, int, int)  # caminho, linha, coluna
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header = QHBoxLayout()
+        self.status_label = QLabel()
+        header.addWidget(self.status_label)
+        header.addStretch()
+        close_button = QPushButton("✖")
+        close_button.setFlat(True)
+        close_button.setToolTip("Fechar painel")
+        close_button.clicked.connect(self.hide)
+        header.addWidget(close_button)
+        layout.addLayout(header)
+
+        self.table = QTableWidget(0, len(PROFILE_COLUMNS))
+        self.table.setHorizontalHeaderLabels(PROFILE_COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setStyleSheet(f"background-color: {DRACULA_COLORS['background']}; "
+                                 f"color: {DRACULA_COLORS['foreground']};")
+        self.table.cellDoubleClicked.connect(self.open_row)
+        layout.addWidget(self.table)
+
+        self.setLayout(layout)
+
+    def show_profile(self, entries, total_time):
+        """Preenche a tabela, ordenada pelo tempo total"""
+        self.table.setSortingEnabled(False)
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            name_item = QTableWidgetItem(entry.name)
+            name_item.setData(Qt.UserRole, (entry.path, entry.line))
+            name_item.setToolTip(entry.path)
+            self.table.setItem(row, 0, name_item)
+            self.table.setItem(row, 1, QTableWidgetItem(entry.location()))
+            self.table.setItem(row, 2, SortableItem(entry.calls_text(), entry.calls))
+            self.table.setItem(row, 3, SortableItem(format_duration(entry.self_time),
+                                                    entry.self_time))
+            self.table.setItem(row, 4, SortableItem(format_duration(entry.total_time),
+                                                    entry.total_time))
+            share = entry.total_time / total_time * 100 if total_time else 0.0
+            self.table.setItem(row, 5, SortableItem(f"{share:.1f}%", share))
+        self.table.setSortingEnabled(True)
+        self.table.sortItems(4, Qt.DescendingOrder)
+        self.table.setUpdatesEnabled(True)
+        self.status_label.setText(f"🔥 Profiler: {len(entries)} funções, "
+                                  f"{format_duration(total_time)} no total")
+        self.show()
+
+    def open_row(self, row, column=0):
+        path, line = self.table.item(row, 0).data(Qt.UserRole)
+        if path != '~':
+            self.location_selected.emit(path, line, 0)
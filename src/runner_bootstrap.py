@@ -0,0 +1,711 @@
+"""Ponto de entrada do processo que executa o código do usuário.
+
+É executado como script por ``CodeExecutor`` (a IDE só importa
+``INPUT_REQUEST`` daqui): ``python runner_bootstrap.py --job <json>``, onde
+o trabalho é {"script": arquivo temporário, "filename": nome exibido,
+"cwd", "mode", "output"}. ``mode`` é "run", "profile" (cProfile, com as
+estatísticas gravadas em ``output``) ou "sample" (amostras da pilha a cada
+``interval`` segundos, gravadas em ``output`` como JSON) ou "lines"
+(execuções e tempo de cada linha do arquivo executado, em JSON) ou
+"memory" (tracemalloc, com fotografias periódicas e a memória do processo
+ao longo do tempo, em JSON). No modo "debug" o processo se conecta à IDE
+em ``port`` (apresentando ``token``) e para nos ``breakpoints``
+({arquivo: {linha: condição}}).
+
+Com ``--warm <módulos...>`` o processo importa os módulos e fica esperando
+o trabalho numa linha da entrada padrão; é assim que o InterpreterPool
+mantém interpretadores prontos.
+
+O código é compilado com o nome exibido, para que tracebacks apontem para o
+arquivo do editor, e ``input()`` pede a resposta à IDE escrevendo
+``INPUT_REQUEST`` na saída padrão e lendo uma linha da entrada padrão.
+"""
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import reprlib
+import builtins
+import tracemalloc
+import importlib
+import threading
+import traceback
+
+# Sequência que a IDE reconhece na saída como pedido de input()
+INPUT_REQUEST = '\x1b]pypy-ide;input\x07'
+
+# Intervalo (s) entre esvaziamentos do buffer da saída padrão
+OUTPUT_FLUSH_INTERVAL = 0.05
+
+
+def ide_input(prompt=''):
+    sys.stdout.write(str(prompt) + INPUT_REQUEST)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line[:-1] if line.endswith('\n') else line
+
+
+def flush_periodically():
+    """Esvazia a saída padrão de tempos em tempos.
+
+    A saída fica em buffer de bloco (uma escrita no pipe a cada poucos KB,
+    em vez de uma por print) e esta thread garante que ela apareça na IDE
+    em no máximo OUTPUT_FLUSH_INTERVAL, como num terminal.
+    """
+    while True:
+        time.sleep(OUTPUT_FLUSH_INTERVAL)
+        try:
+            sys.stdout.flush()
+        except Exception:
+            return
+
+
+class OrderedStderr:
+    """sys.stderr que esvazia a saída padrão antes de cada escrita.
+
+    Com a saída padrão em buffer, avisos, logging e ``print(...,
+    file=sys.stderr)`` passariam na frente dos prints anteriores.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        sys.stdout.flush()
+        return self.stream.write(text)
+
+    def writelines(self, lines):
+        sys.stdout.flush()
+        self.stream.writelines(lines)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def preload(modules):
+    """Importa os módulos pedidos; os que falharem ficam para o programa"""
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except BaseException:
+            pass
+
+
+class StackSampler:
+    """Amostra a pilha da thread principal numa thread separada.
+
+    Ao contrário do cProfile, o programa não paga nada por chamada: a cada
+    ``interval`` a thread acorda, copia a sequência de funções em execução e
+    conta quantas vezes cada pilha foi vista. Amostras sem quadros do
+    programa (ex.: esperando a resposta de ``input()`` na IDE) são
+    descartadas, e o tempo delas é somado em ``dropped``.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.counts = {}  # (código mais interno, ..., <module>) -> amostras
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, name='pypy-ide-sampler', daemon=True)
+        self.started = 0.0
+        self.dropped = 0.0  # segundos cobertos pelas amostras descartadas
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def sample(self):
+        main_id = threading.main_thread().ident
+        counts = self.counts
+        previous = self.started
+        while not self.stopped.wait(self.interval):
+            # As amostras atrasam quando o programa segura o GIL: cada uma
+            # vale o tempo desde a anterior
+            now = time.perf_counter()
+            covered, previous = now - previous, now
+            frame = sys._current_frames().get(main_id)
+            stack = []
+            # Para nos quadros deste script: o programa começa logo acima deles
+            while frame is not None and frame.f_code.co_filename != __file__:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if stack:
+                key = tuple(stack)
+                counts[key] = counts.get(key, 0) + 1
+            else:
+                self.dropped += covered
+
+    def dump(self, path):
+        """Grava as pilhas (da raiz para a folha) com o número de amostras"""
+        samples = [[[[code.co_filename, getattr(code, 'co_qualname', code.co_name),
+                      code.co_firstlineno] for code in reversed(stack)], count]
+                   for stack, count in self.counts.items()]
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'interval': self.interval,
+                       'elapsed': time.perf_counter() - self.started,
+                       'dropped': self.dropped,
+                       'samples': samples}, file)
+
+
+class LineHeat:
+    """Conta execuções e tempo de cada linha do arquivo executado.
+
+    No Python 3.12+ usa ``sys.monitoring``: linhas de outros arquivos
+    devolvem DISABLE e deixam de gerar eventos, então bibliotecas rodam na
+    velocidade normal. Nas versões anteriores usa ``sys.settrace``, que só
+    liga o rastreio de linhas nos quadros do arquivo executado.
+
+    O tempo de uma linha vai até o próximo evento de linha, então inclui o
+    que ela chamou fora do arquivo (bibliotecas, funções embutidas).
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.hits = {}  # linha -> execuções
+        self.times = {}  # linha -> segundos
+        self.last_line = None
+        self.last_time = 0.0
+        self.started = 0.0
+
+    def line_event(self, line):
+        now = time.perf_counter()
+        last = self.last_line
+        if last is not None:
+            self.times[last] = self.times.get(last, 0.0) + now - self.last_time
+        self.hits[line] = self.hits.get(line, 0) + 1
+        self.last_line = line
+        self.last_time = time.perf_counter()
+
+    def start(self):
+        self.started = time.perf_counter()
+        monitoring = getattr(sys, 'monitoring', None)
+        if monitoring is not None:
+            filename = self.filename
+            line_event = self.line_event
+
+            def on_line(code, line):
+                if code.co_filename != filename:
+                    return monitoring.DISABLE
+                line_event(line)
+
+            monitoring.use_tool_id(monitoring.PROFILER_ID, 'pypy-ide')
+            monitoring.register_callback(monitoring.PROFILER_ID, monitoring.events.LINE, on_line)
+            monitoring.set_events(monitoring.PROFILER_ID, monitoring.events.LINE)
+        else:
+            sys.settrace(self.trace_call)
+
+    def trace_call(self, frame, event, arg):
+        # Só os quadros do arquivo executado recebem eventos de linha
+        if frame.f_code.co_filename == self.filename:
+            return self.trace_line
+        return None
+
+    def trace_line(self, frame, event, arg):
+        if event == 'line':
+            self.line_event(frame.f_lineno)
+        return self.trace_line
+
+    def stop(self):
+        monitoring = getattr(sys, 'monitoring', None)
+        if monitoring is not None:
+            monitoring.set_events(monitoring.PROFILER_ID, 0)
+            monitoring.register_callback(monitoring.PROFILER_ID, monitoring.events.LINE, None)
+            monitoring.free_tool_id(monitoring.PROFILER_ID)
+        else:
+            sys.settrace(None)
+        self.line_event(None)  # fecha o tempo da última linha
+
+    def dump(self, path):
+        lines = [[line, hits, self.times.get(line, 0.0)] for line, hits in self.hits.items()
+                 if line is not None]
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'filename': self.filename,
+                       'elapsed': time.perf_counter() - self.started,
+                       'lines': lines}, file)
+
+
+def current_rss():
+    """Memória residente do processo em bytes (0 se não der para medir)"""
+    try:
+        with open('/proc/self/statm', 'r') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Fora do Linux só há o pico (em KB, ou bytes no macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryTracker:
+    """Acompanha as alocações do programa com tracemalloc.
+
+    Uma thread anota a cada ``interval`` a memória residente e a rastreada
+    e, a cada ``snapshot_interval``, fotografa as alocações vivas agrupadas
+    por linha (só as ``MEMORY_TOP_LINES`` maiores, para o arquivo de
+    resultado não crescer com o programa). Fotografar percorre todas as
+    alocações vivas segurando o GIL, então o intervalo cresce para pelo
+    menos ``SNAPSHOT_COST_FACTOR`` vezes o custo da última fotografia.
+    Uma última é tirada no fim, com o que o programa deixou alocado.
+    """
+    MEMORY_TOP_LINES = 500
+    SNAPSHOT_COST_FACTOR = 10
+
+    def __init__(self, interval, snapshot_interval):
+        self.interval = interval
+        self.snapshot_interval = snapshot_interval
+        self.series = []  # [segundos, rss, rastreada atual, pico rastreado]
+        self.snapshots = []
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.watch, name='pypy-ide-memory', daemon=True)
+        self.started = 0.0
+        self.ignored = {tracemalloc.__file__, __file__}  # alocações do próprio rastreamento
+
+    def start(self):
+        self.started = time.perf_counter()
+        tracemalloc.start()
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.record()
+        self.snapshot(last=True)
+
+    def record(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.series.append([time.perf_counter() - self.started, current_rss(), current, peak])
+
+    def snapshot(self, last=False):
+        """Fotografa as alocações; retorna quanto tempo levou"""
+        moment = time.perf_counter() - self.started
+        snapshot = tracemalloc.take_snapshot()
+        if last:
+            # Agrupar com o rastreamento desligado é bem mais rápido: as
+            # alocações do próprio agrupamento deixam de ser rastreadas
+            tracemalloc.stop()
+        # Sem filter_traces: filtrar as linhas já agrupadas é muito mais barato
+        # que copiar a lista de todas as alocações
+        statistics = [stat for stat in snapshot.statistics('lineno')
+                      if stat.traceback[0].filename not in self.ignored]
+        self.snapshots.append({
+            'time': moment,
+            'size': sum(stat.size for stat in statistics),
+            'count': sum(stat.count for stat in statistics),
+            'lines': [[stat.traceback[0].filename, stat.traceback[0].lineno, stat.size, stat.count]
+                      for stat in statistics[:self.MEMORY_TOP_LINES]],
+            'complete': len(statistics) <= self.MEMORY_TOP_LINES,  # há linhas fora da lista?
+        })
+        return time.perf_counter() - self.started - moment
+
+    def watch(self):
+        next_snapshot = self.snapshot_interval
+        while not self.stopped.wait(self.interval):
+            self.record()
+            if self.series[-1][0] >= next_snapshot:
+                cost = self.snapshot()
+                next_snapshot = time.perf_counter() - self.started + \
+                    max(self.snapshot_interval, cost * self.SNAPSHOT_COST_FACTOR)
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'elapsed': time.perf_counter() - self.started,
+                       'series': self.series, 'snapshots': self.snapshots}, file)
+
+
+# Representação curta dos valores mostrados no depurador
+VALUE_REPR = reprlib.Repr()
+VALUE_REPR.maxstring = 200
+VALUE_REPR.maxother = 200
+
+# Filhos listados por variável expandida no depurador
+DEBUG_MAX_CHILDREN = 100
+
+
+def children_of(value):
+    """Itens mostrados ao expandir um valor no depurador: [(rótulo, valor)]"""
+    if isinstance(value, dict):
+        items = [(VALUE_REPR.repr(key), item) for key, item in value.items()]
+    elif isinstance(value, (list, tuple)):
+        items = [(f"[{index}]", item) for index, item in enumerate(value)]
+    elif isinstance(value, (set, frozenset)):
+        items = [(f"{{{index}}}", item) for index, item in enumerate(value)]
+    elif isinstance(value, type) or callable(value) or type(value).__name__ == 'module':
+        items = []
+    else:
+        try:
+            items = list(vars(value).items())
+        except TypeError:
+            items = []
+    return items[:DEBUG_MAX_CHILDREN]
+
+
+def describe_value(name, value):
+    try:
+        text = VALUE_REPR.repr(value)
+    except Exception as error:
+        text = f"<erro no repr: {error!r}>"
+    return [name, type(value).__name__, text, bool(children_of(value))]
+
+
+def frame_depth(frame):
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def is_program_frame(frame):
+    """Quadros do programa (nem deste script, nem módulos congelados do Python)"""
+    filename = frame.f_code.co_filename
+    return filename != __file__ and not filename.startswith('<frozen')
+
+
+class Debugger:
+    """Depurador conectado à IDE por um socket local (mensagens JSON por linha).
+
+    No Python 3.12+ usa ``sys.monitoring``: só os objetos de código que
+    contêm breakpoints recebem eventos de linha, e mesmo neles as linhas
+    sem breakpoint são desativadas no primeiro evento, então o programa
+    roda quase na velocidade normal até parar. Os passos (entrar, passar
+    por cima, sair) ligam os eventos de linha globalmente até a próxima
+    parada. Nas versões anteriores usa ``sys.settrace``, rastreando linhas
+    só nos quadros de arquivos com breakpoints ou durante os passos.
+
+    Só a thread principal é depurada. Enquanto o programa está parado, a
+    thread principal espera os comandos; uma thread leitora recebe tudo do
+    socket e aplica na hora mudanças de breakpoints e pedidos de pausa.
+    """
+
+    def __init__(self, job):
+        self.breakpoints = {}  # arquivo -> {linha: condição ('' = sempre)}
+        self.codes = {}  # arquivo -> objetos de código já executados
+        self.code_lines = {}  # objeto de código -> linhas que ele contém
+        self.step = None  # None ou (tipo, profundidade do quadro onde o passo começou)
+        self.paused_frames = []  # pilha do programa enquanto parado, a mais interna primeiro
+        self.commands = queue.Queue()
+        self.send_lock = threading.Lock()
+        self.main_id = threading.main_thread().ident
+        self.monitoring = getattr(sys, 'monitoring', None)
+        self.set_breakpoints(job['breakpoints'])
+
+        self.connection = socket.create_connection(('127.0.0.1', job['port']))
+        self.send({'event': 'hello', 'token': job['token']})
+        threading.Thread(target=self.read_commands, name='pypy-ide-debugger', daemon=True).start()
+
+    # --- comunicação com a IDE ---
+
+    def send(self, message):
+        data = (json.dumps(message) + '\n').encode('utf-8')
+        with self.send_lock:
+            try:
+                self.connection.sendall(data)
+            except OSError:
+                pass
+
+    def read_commands(self):
+        with self.connection.makefile('r', encoding='utf-8') as reader:
+            for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                command = message.get('command')
+                if command == 'breakpoints':
+                    self.set_breakpoints(message['breakpoints'])
+                    self.refresh_events()
+                elif command == 'pause':
+                    self.begin_step('into', None)
+                else:
+                    self.commands.put(message)
+        # A IDE fechou a conexão: o programa segue sem depurador
+        self.breakpoints = {}
+        self.step = None
+        self.refresh_events()
+        self.commands.put({'command': 'continue'})
+
+    def set_breakpoints(self, breakpoints):
+        self.breakpoints = {filename: {int(line): condition for line, condition in lines.items()}
+                            for filename, lines in breakpoints.items() if lines}
+
+    # --- eventos ---
+
+    def start(self):
+        if self.monitoring is not None:
+            monitoring = self.monitoring
+            tool = monitoring.DEBUGGER_ID
+            monitoring.use_tool_id(tool, 'pypy-ide')
+            monitoring.register_callback(tool, monitoring.events.PY_START, self.on_start)
+            monitoring.register_callback(tool, monitoring.events.LINE, self.on_line)
+            monitoring.set_events(tool, monitoring.events.PY_START)
+        else:
+            sys.settrace(self.trace_call)
+
+    def stop(self):
+        if self.monitoring is not None:
+            tool = self.monitoring.DEBUGGER_ID
+            self.monitoring.set_events(tool, 0)
+            for code in self.code_lines:
+                self.monitoring.set_local_events(tool, code, 0)
+            self.monitoring.register_callback(tool, self.monitoring.events.PY_START, None)
+            self.monitoring.register_callback(tool, self.monitoring.events.LINE, None)
+            self.monitoring.free_tool_id(tool)
+        else:
+            sys.settrace(None)
+        try:
+            self.connection.close()
+        except OSError:
+            pass
+
+    def refresh_events(self):
+        """Reaplica os eventos depois de mudar breakpoints ou passos"""
+        if self.monitoring is not None:
+            monitoring = self.monitoring
+            events = monitoring.events.PY_START
+            if self.step is not None:
+                events |= monitoring.events.LINE
+            monitoring.set_events(monitoring.DEBUGGER_ID, events)
+            for filename, codes in list(self.codes.items()):
+                for code in list(codes):
+                    self.arm(code)
+            # Linhas desativadas voltam a gerar eventos (podem ter ganhado breakpoints)
+            monitoring.restart_events()
+        else:
+            # Quadros que já estão rodando precisam de f_trace para parar
+            frame = sys._current_frames().get(self.main_id)
+            while frame is not None:
+                if is_program_frame(frame) and (
+                        self.step is not None or frame.f_code.co_filename in self.breakpoints):
+                    frame.f_trace = self.trace_line
+                frame = frame.f_back
+
+    def arm(self, code):
+        """Liga eventos de linha só nos objetos de código com breakpoints"""
+        breakpoints = self.breakpoints.get(code.co_filename)
+        events = 0
+        if breakpoints:
+            lines = self.code_lines.get(code)
+            if lines is None:
+                lines = self.code_lines[code] = {line for start, end, line in code.co_lines()
+                                                 if line}
+            if lines.intersection(breakpoints):
+                events = self.monitoring.events.LINE
+        if events or code in self.code_lines:
+            self.monitoring.set_local_events(self.monitoring.DEBUGGER_ID, code, events)
+
+    def on_start(self, code, offset):
+        filename = code.co_filename
+        if filename != __file__:
+            self.codes.setdefault(filename, set()).add(code)
+            self.arm(code)
+        return self.monitoring.DISABLE
+
+    def on_line(self, code, line):
+        if threading.get_ident() != self.main_id:
+            return None
+        frame = sys._getframe(1)
+        if self.step is not None:
+            self.check_step(frame)
+            return None
+        conditions = self.breakpoints.get(code.co_filename)
+        if conditions is None or line not in conditions:
+            return self.monitoring.DISABLE
+        self.check_breakpoint(frame, conditions[line])
+        return None
+
+    def trace_call(self, frame, event, arg):
+        if not is_program_frame(frame):
+            return None
+        if self.step is not None or frame.f_code.co_filename in self.breakpoints:
+            return self.trace_line
+        return None
+
+    def trace_line(self, frame, event, arg):
+        if event == 'line':
+            if self.step is not None:
+                self.check_step(frame)
+            else:
+                conditions = self.breakpoints.get(frame.f_code.co_filename)
+                if conditions is not None and frame.f_lineno in conditions:
+                    self.check_breakpoint(frame, conditions[frame.f_lineno])
+        return self.trace_line
+
+    # --- paradas ---
+
+    def check_breakpoint(self, frame, condition):
+        if condition:
+            try:
+                if not eval(condition, frame.f_globals, frame.f_locals):
+                    return
+            except Exception as error:
+                # Condição inválida: para e mostra o erro, como o pdb
+                self.pause(frame, f"erro na condição '{condition}': {error!r}")
+                return
+        self.pause(frame, 'breakpoint')
+
+    def check_step(self, frame):
+        if not is_program_frame(frame):
+            return
+        kind, depth = self.step
+        if depth is None or kind == 'into' or \
+                (kind == 'over' and frame_depth(frame) <= depth) or \
+                (kind == 'out' and frame_depth(frame) < depth):
+            self.pause(frame, 'step')
+
+    def begin_step(self, kind, frame):
+        self.step = (kind, frame_depth(frame) if frame is not None else None)
+        self.refresh_events()
+
+    def pause(self, frame, reason):
+        """Para o programa e atende a IDE até um comando de continuar ou de passo"""
+        self.step = None
+        self.paused_frames = []
+        current = frame
+        while current is not None:
+            if is_program_frame(current):
+                self.paused_frames.append(current)
+            current = current.f_back
+        self.send({'event': 'stopped', 'reason': reason,
+                   'stack': [[current.f_code.co_filename,
+                              getattr(current.f_code, 'co_qualname', current.f_code.co_name),
+                              current.f_lineno] for current in self.paused_frames]})
+        while True:
+            message = self.commands.get()
+            command = message.get('command')
+            if command == 'variables':
+                self.send_variables(message)
+            elif command in ('into', 'over', 'out'):
+                self.begin_step(command, frame)
+                break
+            elif command == 'continue':
+                self.refresh_events()
+                break
+        self.paused_frames = []
+        self.send({'event': 'running'})
+
+    def frame_variables(self, frame):
+        if frame.f_code.co_name == '<module>':
+            # Nível de módulo: as variáveis do programa, sem o que o Python define
+            return [(name, value) for name, value in frame.f_globals.items()
+                    if not name.startswith('__') and type(value).__name__ != 'module']
+        return list(frame.f_locals.items())
+
+    def send_variables(self, message):
+        """Responde com as variáveis de um quadro ou os filhos do valor em ``path``"""
+        items = []
+        index = message.get('frame', 0)
+        if 0 <= index < len(self.paused_frames):
+            items = self.frame_variables(self.paused_frames[index])
+            try:
+                for position in message.get('path', []):
+                    items = children_of(items[position][1])
+            except (IndexError, TypeError):
+                items = []
+        self.send({'event': 'variables', 'frame': index, 'path': message.get('path', []),
+                   'items': [describe_value(name, value) for name, value in items]})
+
+
+def execute(code, namespace, job):
+    """Executa o código no modo pedido"""
+    if job.get('mode') == 'debug':
+        debugger = Debugger(job)
+        debugger.start()
+        try:
+            exec(code, namespace)
+        finally:
+            debugger.stop()
+    elif job.get('mode') == 'memory':
+        tracker = MemoryTracker(job['interval'], job['snapshot_interval'])
+        tracker.start()
+        try:
+            exec(code, namespace)
+        finally:
+            tracker.stop()
+            tracker.dump(job['output'])
+    elif job.get('mode') == 'lines':
+        heat = LineHeat(job['filename'])
+        heat.start()
+        try:
+            exec(code, namespace)
+        finally:
+            heat.stop()
+            heat.dump(job['output'])
+    elif job.get('mode') == 'sample':
+        sampler = StackSampler(job['interval'])
+        sampler.start()
+        try:
+            exec(code, namespace)
+        finally:
+            sampler.stop()
+            sampler.dump(job['output'])
+    elif job.get('mode') == 'profile':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            exec(code, namespace)
+        finally:
+            # Grava as estatísticas mesmo se o programa falhar ou for interrompido
+            profiler.disable()
+            profiler.dump_stats(job['output'])
+    else:
+        exec(code, namespace)
+
+
+def user_traceback(traceback_object):
+    """Omite os quadros deste script do início do traceback"""
+    while traceback_object is not None and \
+            traceback_object.tb_frame.f_code.co_filename == __file__:
+        traceback_object = traceback_object.tb_next
+    return traceback_object
+
+
+def run(job):
+    filename = job['filename']
+    with open(job['script'], 'r', encoding='utf-8') as file:
+        source = file.read()
+
+    # O processo deve se parecer com "python arquivo.py"
+    os.chdir(job['cwd'])
+    sys.argv = [filename]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(filename)))
+    builtins.input = ide_input
+    sys.stderr = OrderedStderr(sys.stderr)
+    threading.Thread(target=flush_periodically, name='pypy-ide-output', daemon=True).start()
+    namespace = {'__name__': '__main__', '__file__': filename, '__builtins__': builtins}
+
+    try:
+        execute(compile(source, filename, 'exec'), namespace, job)
+    except SystemExit:
+        raise
+    except BaseException as error:
+        traceback.print_exception(type(error), error, user_traceback(error.__traceback__))
+        sys.exit(130 if isinstance(error, KeyboardInterrupt) else 1)
+
+
+def main():
+    # A pasta da IDE não deve sombrear os módulos do programa
+    del sys.path[0]
+    if sys.argv[1] == '--warm':
+        preload(sys.argv[2:])
+        line = sys.stdin.readline()
+        if not line:
+            return  # o pool foi encerrado sem usar este processo
+        run(json.loads(line))
+    else:
+        run(json.loads(sys.argv[2]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,489 @@
+import re
+import ast
+import bisect
+import itertools
+import threading
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QThread, pyqtSignal
+from .performance import timed
+
+
+class Scope:
+    """Escopo do código (módulo, classe ou função) com os nomes definidos nele"""
+
+    __slots__ = ('kind', 'name', 'start', 'end', 'column', 'names', 'children', 'starts',
+                 'attributes', 'positions', 'attribute_positions', 'offset', 'imports')
+
+    def __init__(self, kind, name, start, end, column=-1):
+        self.kind = kind  # 'module', 'class' ou 'function'
+        self.name = name
+        self.start = start  # primeira e última linha (1-based)
+        self.end = end
+        self.column = column  # indentação do def/class
+        self.names = {}  # nome -> tipo ('function', 'class', 'variable', 'import', 'parameter')
+        self.children = []
+        self.starts = []  # linhas iniciais dos filhos, para busca binária
+        self.attributes = {}  # só em classes: atributos de self e métodos
+        # nome -> (linha, coluna) da primeira definição, somando ``offset`` à linha
+        self.positions = {}
+        self.attribute_positions = {}
+        self.offset = 0
+        self.imports = {}  # nome importado -> módulo (ou atributo) completo
+
+    def shifted(self, offset):
+        """Cópia do escopo (e filhos) deslocada ``offset`` linhas"""
+        scope = Scope(self.kind, self.name, self.start + offset, self.end + offset, self.column)
+        scope.names = self.names
+        scope.attributes = self.attributes
+        scope.positions = self.positions
+        scope.attribute_positions = self.attribute_positions
+        scope.offset = self.offset + offset
+        scope.imports = self.imports
+        scope.children = [child.shifted(offset) for child in self.children]
+        scope.starts = [start + offset for start in self.starts]
+        return scope
+
+    def child_at(self, line, indent=None):
+        """Retorna o escopo filho que contém a linha, se houver.
+
+        Com ``indent`` (indentação da linha), linhas logo depois do fim de
+        um bloco que ainda estão indentadas dentro dele, como a linha em
+        branco onde se está digitando, também contam como parte do bloco.
+        """
+        position = bisect.bisect_right(self.starts, line) - 1
+        if position < 0:
+            return None
+        child = self.children[position]
+        if child.end >= line or (indent is not None and indent > child.column):
+            return child
+        return None
+
+    def position_of(self, name, attribute=False):
+        """Linha e coluna onde o nome (ou atributo) é definido, ou None"""
+        position = (self.attribute_positions if attribute else self.positions).get(name)
+        if position is None:
+            return None
+        return position[0] + self.offset, position[1]
+
+
+class SymbolCollector(ast.NodeVisitor):
+    """Percorre a AST montando a árvore de escopos"""
+
+    def __init__(self, line_count):
+        self.root = Scope('module', '', 1, max(1, line_count))
+        self.stack = [self.root]
+
+    @property
+    def scope(self):
+        return self.stack[-1]
+
+    def define(self, name, kind, line, column):
+        if name not in self.scope.names:
+            self.scope.names[name] = kind
+            self.scope.positions[name] = (line, column)
+
+    def define_attribute(self, scope, name, kind, line, column):
+        if name not in scope.attributes:
+            scope.attributes[name] = kind
+            scope.attribute_positions[name] = (line, column)
+
+    def enter(self, node, kind):
+        scope = Scope(kind, node.name, node.lineno, node.end_lineno or node.lineno, node.col_offset)
+        # Decorators ficam antes da linha do def, mas pertencem ao escopo externo
+        parent = self.scope
+        parent.children.append(scope)
+        parent.starts.append(scope.start)
+        return scope
+
+    def visit_FunctionDef(self, node):
+        # A coluna aponta para o nome, depois de "def " ou "async def "
+        column = node.col_offset + (len('async def ') if isinstance(node, ast.AsyncFunctionDef)
+                                    else len('def '))
+        self.define(node.name, 'function', node.lineno, column)
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self.visit_arguments_defaults(node.args)
+        if node.returns:
+            self.visit(node.returns)
+
+        scope = self.enter(node, 'function')
+        if self.scope.kind == 'class':
+            self.define_attribute(self.scope, node.name, 'function', node.lineno, column)
+        self.stack.append(scope)
+        arguments = node.args
+        for argument in arguments.posonlyargs + arguments.args + arguments.kwonlyargs:
+            self.define(argument.arg, 'parameter', argument.lineno, argument.col_offset)
+        for argument in (arguments.vararg, arguments.kwarg):
+            if argument:
+                self.define(argument.arg, 'parameter', argument.lineno, argument.col_offset)
+        for statement in node.body:
+            self.visit(statement)
+        self.stack.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_arguments_defaults(self, arguments):
+        for default in arguments.defaults + [d for d in arguments.kw_defaults if d]:
+            self.visit(default)
+
+    def visit_ClassDef(self, node):
+        self.define(node.name, 'class', node.lineno, node.col_offset + len('class '))
+        for expression in node.decorator_list + node.bases + [k.value for k in node.keywords]:
+            self.visit(expression)
+        scope = self.enter(node, 'class')
+        self.stack.append(scope)
+        for statement in node.body:
+            self.visit(statement)
+        for name, kind in scope.names.items():
+            if kind != 'function':
+                self.define_attribute(scope, name, kind, *scope.positions[name])
+        self.stack.pop()
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            # "import a.b" define "a"; "import a.b as c" define "c" = a.b
+            name = alias.asname or alias.name.split('.')[0]
+            self.define(name, 'import', alias.lineno, alias.col_offset)
+            self.scope.imports.setdefault(name, alias.name if alias.asname else name)
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name != '*':
+                name = alias.asname or alias.name
+                self.define(name, 'import', alias.lineno, alias.col_offset)
+                if node.module and not node.level:  # imports relativos ficam de fora
+                    self.scope.imports.setdefault(name, f"{node.module}.{alias.name}")
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            self.define(node.id, 'variable', node.lineno, node.col_offset)
+
+    def visit_Attribute(self, node):
+        # self.nome = ... dentro de um método vira atributo da classe
+        if isinstance(node.ctx, ast.Store) and isinstance(node.value, ast.Name) \
+                and node.value.id == 'self' and len(self.stack) >= 2 \
+                and self.scope.kind == 'function' and self.stack[-2].kind == 'class':
+            self.define_attribute(self.stack[-2], node.attr, 'variable', node.end_lineno,
+                                  node.end_col_offset - len(node.attr))
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            self.define(node.name, 'variable', node.lineno, node.col_offset)
+        self.generic_visit(node)
+
+    def visit_Lambda(self, node):
+        # Parâmetros de lambda não são visíveis fora dela
+        self.visit(node.body)
+
+
+class SymbolTable:
+    """Tabela de símbolos de um documento Python, consultada por posição"""
+
+    def __init__(self, root):
+        self.root = root
+        self._sources = {}  # cadeia de escopos -> ScopedSymbols
+        self.lock = threading.Lock()
+
+    def chain_at(self, line, indent=None):
+        """Retorna os escopos que contêm a linha, do módulo ao mais interno"""
+        chain = [self.root]
+        while True:
+            child = chain[-1].child_at(line, indent)
+            if child is None:
+                return chain
+            chain.append(child)
+
+    def names_at(self, line, indent=None):
+        """Nomes visíveis na linha, seguindo as regras de escopo do Python"""
+        return self.names_in(self.chain_at(line, indent))
+
+    def attributes_at(self, line, indent=None):
+        """Atributos de ``self`` da classe do método que contém a linha"""
+        return self.attributes_in(self.chain_at(line, indent))
+
+    @staticmethod
+    def names_in(chain):
+        """Nomes visíveis no escopo mais interno de uma cadeia"""
+        names = {}
+        for depth, scope in enumerate(reversed(chain)):
+            # O corpo de uma classe não é visível dentro dos seus métodos
+            if scope.kind == 'class' and depth > 0:
+                continue
+            for name, kind in scope.names.items():
+                names.setdefault(name, kind)
+        return names
+
+    @staticmethod
+    def attributes_in(chain):
+        """Atributos de ``self`` da classe do método mais interno da cadeia"""
+        for position in range(len(chain) - 1, 0, -1):
+            if chain[position].kind == 'function' and chain[position - 1].kind == 'class':
+                return dict(chain[position - 1].attributes)
+        return {}
+
+    def definition_at(self, line, name, indent=None, attribute=False):
+        """Definição de ``name`` visível na linha: (tipo, linha, coluna) ou None.
+
+        Com ``attribute``, procura ``self.name`` na classe do método.
+        """
+        chain = self.chain_at(line, indent)
+        if attribute:
+            for position in range(len(chain) - 1, 0, -1):
+                scope = chain[position - 1]
+                if chain[position].kind == 'function' and scope.kind == 'class':
+                    location = scope.position_of(name, attribute=True)
+                    return (scope.attributes[name],) + location if location else None
+            return None
+        for depth, scope in enumerate(reversed(chain)):
+            if scope.kind == 'class' and depth > 0:
+                continue
+            location = scope.position_of(name)
+            if location:
+                return (scope.names[name],) + location
+        return None
+
+    def import_at(self, line, name, indent=None):
+        """Módulo completo a que ``name`` se refere na linha, se for um import"""
+        for depth, scope in enumerate(reversed(self.chain_at(line, indent))):
+            if scope.kind == 'class' and depth > 0:
+                continue
+            if name in scope.names:
+                return scope.imports.get(name)
+        return None
+
+    def source_at(self, line, indent=None, attributes=False):
+        """Fonte de sugestões (objeto com ``search``) para a linha"""
+        chain = self.chain_at(line, indent)
+        key = (tuple(id(scope) for scope in chain), attributes)
+        with self.lock:
+            source = self._sources.get(key)
+            if source is None:
+                source = self._sources[key] = ScopedSymbols(self, chain, attributes)
+        return source
+
+
+class ScopedSymbols:
+    """Nomes visíveis num escopo, indexados só quando a primeira busca chega"""
+
+    def __init__(self, table, chain, attributes):
+        self.table = table
+        self.chain = chain
+        self.attributes = attributes
+        self.index = None
+        self.lock = threading.Lock()
+
+    def search(self, word):
+        with self.lock:
+            if self.index is None:
+                # Importado aqui: autocomplete depende deste módulo
+                from .autocomplete import CompletionIndex
+                if self.attributes:
+                    names = SymbolTable.attributes_in(self.chain)
+                else:
+                    names = SymbolTable.names_in(self.chain)
+                self.index = CompletionIndex(names)
+        return self.index.search(word)
+
+
+# "... does not match opening parenthesis '(' on line N": o erro está na linha N
+OPENING_LINE_PATTERN = re.compile(r'on line (\d+)')
+
+
+def parse_source(source):
+    """Faz o parse do código; se só uma linha estiver incompleta (o caso comum
+    durante a digitação), troca essa linha por ``pass`` com a mesma
+    indentação e tenta de novo. Levanta SyntaxError se ainda falhar."""
+    try:
+        return ast.parse(source)
+    except SyntaxError as error:
+        lines = source.split('\n')
+        match = OPENING_LINE_PATTERN.search(error.msg or '')
+        number = int(match.group(1)) if match else error.lineno
+        if not number or number > len(lines):
+            raise
+        line = lines[number - 1]
+        lines[number - 1] = line[:len(line) - len(line.lstrip())] + 'pass'
+        return ast.parse('\n'.join(lines))
+
+
+def collect_scopes(tree, line_count):
+    """Monta a árvore de escopos de uma AST"""
+    collector = SymbolCollector(line_count)
+    for statement in tree.body:
+        collector.visit(statement)
+    return collector.root
+
+
+@timed('build_symbol_table')
+def build_symbol_table(source):
+    """Monta a tabela de símbolos do documento inteiro"""
+    return SymbolTable(collect_scopes(parse_source(source), source.count('\n') + 1))
+
+
+# Linhas na coluna 0 que continuam a instrução anterior
+CONTINUATION_PATTERN = re.compile(r'(else|elif|except|finally)\b')
+
+# Quantos trechos seguintes podem ser juntados a um que não compila sozinho
+MAX_CHUNK_MERGE = 3
+
+
+def split_top_level(lines):
+    """Índices das linhas onde começam instruções de nível superior"""
+    starts = [0]
+    statement = 0
+    # Estimativa de strings de várias linhas: aspas triplas em número ímpar
+    in_string = (lines[0].count('"""') + lines[0].count("'''")) % 2 if lines else 0
+    for number in range(1, len(lines)):
+        line = lines[number]
+        quotes = line.count('"""') + line.count("'''")
+        if in_string or not line or line[0] in ' \t#)]}' or CONTINUATION_PATTERN.match(line):
+            in_string ^= quotes % 2
+            continue
+        in_string ^= quotes % 2
+        if not lines[statement].startswith('@'):
+            starts.append(number)
+        statement = number  # depois de um decorator o def continua o trecho
+    return starts
+
+
+class IncrementalParser:
+    """Reanalisa só as instruções de nível superior que mudaram.
+
+    O documento é dividido em trechos que começam em linhas da coluna 0;
+    os escopos de cada trecho ficam em cache pelo texto dele, então uma
+    edição dentro de uma função só refaz o parse daquela função. Um trecho
+    que não compila sozinho (por exemplo, um corte no meio de uma string de
+    várias linhas) é juntado aos seguintes; se ainda assim falhar, o
+    documento inteiro é analisado de uma vez.
+    """
+
+    def __init__(self):
+        self.chunks = {}  # texto do trecho -> (linha inicial, Scope)
+
+    @timed('parse_symbols')
+    def parse(self, source):
+        """Retorna a SymbolTable do texto; levanta SyntaxError se não compilar"""
+        lines = source.split('\n')
+        starts = split_top_level(lines)
+        bounds = list(zip(starts, starts[1:] + [len(lines)]))
+        root = Scope('module', '', 1, len(lines))
+        chunks = {}
+
+        position = 0
+        while position < len(bounds):
+            start, end = bounds[position]
+            text = '\n'.join(lines[start:end])
+            cached = self.chunks.get(text) or chunks.get(text)
+            if cached is None:
+                position, end, text, scope = self._parse_chunk(lines, bounds, position)
+                cached = (start, scope)
+            elif cached[0] != start:
+                cached = (start, cached[1].shifted(start - cached[0]))
+            chunks[text] = cached
+            scope = cached[1]
+            for name, kind in scope.names.items():
+                if name not in root.names:
+                    root.names[name] = kind
+                    root.positions[name] = scope.position_of(name)
+            for name, module in scope.imports.items():
+                root.imports.setdefault(name, module)
+            root.children.extend(scope.children)
+            root.starts.extend(scope.starts)
+            position += 1
+
+        self.chunks = chunks
+        return SymbolTable(root)
+
+    def _parse_chunk(self, lines, bounds, position):
+        """Faz o parse de um trecho, juntando os seguintes se preciso"""
+        start, end = bounds[position]
+        last = min(len(bounds) - 1, position + MAX_CHUNK_MERGE)
+        for merged in range(position, last + 1):
+            end = bounds[merged][1]
+            text = '\n'.join(lines[start:end])
+            try:
+                tree = ast.parse(text)
+            except SyntaxError:
+                continue
+            return merged, end, text, collect_scopes(tree, end - start).shifted(start)
+
+        # Erro de verdade no trecho: tenta só a correção da linha incompleta
+        end = bounds[position][1]
+        text = '\n'.join(lines[start:end])
+        scope = collect_scopes(parse_source(text), end - start).shifted(start)
+        return position, end, text, scope
+
+
+class SymbolWorker(QThread):
+    """Analisa documentos fora da thread da interface.
+
+    Guarda só o texto mais recente de cada editor; uma edição nova
+    substitui a anterior que ainda não foi analisada.
+    """
+    table_signal = pyqtSignal(int, object)  # id do pedido, SymbolTable ou None
+
+    def __init__(self):
+        super().__init__()
+        self.condition = threading.Condition()
+        self.pending = {}  # dono -> (id do pedido, texto)
+        self.parsers = {}  # dono -> IncrementalParser
+        self.running = True
+        self.request_ids = itertools.count(1)
+
+    def submit(self, owner, text):
+        """Agenda a análise de um texto e retorna o id do pedido"""
+        request_id = next(self.request_ids)
+        with self.condition:
+            self.pending[owner] = (request_id, text)
+            self.condition.notify()
+        return request_id
+
+    def cancel(self, owner):
+        """Descarta o pedido pendente de um editor"""
+        with self.condition:
+            self.pending.pop(owner, None)
+
+    def forget(self, owner):
+        """Descarta o cache de um editor fechado"""
+        self.cancel(owner)
+        with self.condition:
+            self.parsers.pop(owner, None)
+
+    def stop(self, *args):
+        """Encerra a thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                owner, (request_id, text) = self.pending.popitem()
+                parser = self.parsers.setdefault(owner, IncrementalParser())
+            try:
+                table = parser.parse(text)
+            except (SyntaxError, ValueError, RecursionError):
+                try:
+                    table = build_symbol_table(text)
+                except (SyntaxError, ValueError, RecursionError):
+                    table = None  # o editor continua com a última tabela válida
+            self.table_signal.emit(request_id, table)
+
+
+_symbol_worker = None
+
+
+def get_symbol_worker():
+    """Retorna a thread de análise compartilhada, criando-a se necessário"""
+    global _symbol_worker
+    if _symbol_worker is None:
+        _symbol_worker = SymbolWorker()
+        QApplication.instance().aboutToQuit.connect(_symbol_worker.stop)
+        _symbol_worker.start()
+    return _symbol_worker
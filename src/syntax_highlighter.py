@@ -1,44 +1,543 @@
+import threading
+from collections import OrderedDict
 from PyQt5.QtGui import QTextCharFormat, QColor, QSyntaxHighlighter
-from pygments import lex
-from pygments.lexers import PythonLexer
-from pygments.token import Token
-from .constants import DRACULA_COLORS
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
+from pygments.lexer import RegexLexer
+from pygments.token import Token, STANDARD_TYPES, _TokenType
+from .constants import DRACULA_COLORS, EDITOR_CONFIG
+from .lexer_registry import lexer_registry
+from .performance import timed
+
+
+# Pilha de estados inicial dos lexers do Pygments
+ROOT_STACK = ('root',)
+
+# Tabela global que converte pilhas de estado do lexer em inteiros,
+# já que o QSyntaxHighlighter só guarda um int por bloco
+_stack_ids = {ROOT_STACK: 0}
+_stacks = [ROOT_STACK]
+_stacks_lock = threading.Lock()
+
+# Estado dos blocos que ainda não foram tokenizados (padrão do Qt)
+UNHIGHLIGHTED_STATE = -1
+
+
+def stack_to_state(stack):
+    """Retorna o número de estado de bloco associado a uma pilha do lexer"""
+    state = _stack_ids.get(stack)
+    if state is None:
+        with _stacks_lock:
+            state = _stack_ids.get(stack)
+            if state is None:
+                state = len(_stacks)
+                _stacks.append(stack)
+                _stack_ids[stack] = state
+    return state
+
+
+def state_to_stack(state):
+    """Retorna a pilha do lexer associada a um estado de bloco"""
+    if 0 <= state < len(_stacks):
+        return _stacks[state]
+    return ROOT_STACK
+
+
+def is_stateful(lexer):
+    """Indica se o lexer pode continuar de uma pilha de estados salva.
+
+    Só vale para RegexLexer que usam o laço padrão de tokenização; lexers
+    que o sobrescrevem (ex: CLexer) ou usam callbacks com contexto
+    (ExtendedRegexLexer) são tokenizados linha a linha, sem estado.
+    """
+    lexer_class = type(lexer)
+    return (issubclass(lexer_class, RegexLexer)
+            and lexer_class.get_tokens_unprocessed is RegexLexer.get_tokens_unprocessed)
+
+
+def lex_line(lexer, text, stack=ROOT_STACK):
+    """Tokeniza uma linha a partir da pilha de estados informada.
+
+    Retorna a lista de tokens ``(offset, token, conteúdo)`` e a pilha de
+    estados ao final da linha. ``text`` deve terminar com '\\n' para que as
+    regras de fim de linha do lexer funcionem.
+    """
+    if not is_stateful(lexer):
+        # Lexers sem pilha de estados são tokenizados linha a linha
+        return list(lexer.get_tokens_unprocessed(text)), ROOT_STACK
+
+    # Mesmo laço de RegexLexer.get_tokens_unprocessed, mas devolvendo
+    # a pilha final para que a próxima linha continue de onde esta parou
+    tokens = []
+    pos = 0
+    tokendefs = lexer._tokens
+    statestack = list(stack)
+    statetokens = tokendefs[statestack[-1]]
+    while True:
+        for rexmatch, action, new_state in statetokens:
+            m = rexmatch(text, pos)
+            if m:
+                if action is not None:
+                    if type(action) is _TokenType:
+                        tokens.append((pos, action, m.group()))
+                    else:
+                        tokens.extend(action(lexer, m))
+                pos = m.end()
+                if new_state is not None:
+                    if isinstance(new_state, tuple):
+                        for state in new_state:
+                            if state == '#pop':
+                                if len(statestack) > 1:
+                                    statestack.pop()
+                            elif state == '#push':
+                                statestack.append(statestack[-1])
+                            else:
+                                statestack.append(state)
+                    elif isinstance(new_state, int):
+                        if abs(new_state) >= len(statestack):
+                            del statestack[1:]
+                        else:
+                            del statestack[new_state:]
+                    elif new_state == '#push':
+                        statestack.append(statestack[-1])
+                    statetokens = tokendefs[statestack[-1]]
+                break
+        else:
+            if pos >= len(text):
+                break
+            if text[pos] == '\n':
+                # Fim de linha sem regra correspondente: volta para "root"
+                statestack = list(ROOT_STACK)
+                statetokens = tokendefs['root']
+                tokens.append((pos, Token.Text.Whitespace, '\n'))
+            else:
+                tokens.append((pos, Token.Error, text[pos]))
+            pos += 1
+    return tokens, tuple(statestack)
+
+
+def line_runs(lexer, text, stack=ROOT_STACK):
+    """Retorna os trechos ``(offset, tamanho, token)`` de uma linha sem '\\n'
+    e a pilha de estados ao final dela"""
+    tokens, end_stack = lex_line(lexer, text + '\n', stack)
+    length = len(text)
+    runs = []
+    for offset, token, content in tokens:
+        if offset >= length:
+            break
+        runs.append((offset, min(len(content), length - offset), token))
+    return runs, end_stack
+
+
+class TokenCache:
+    """Cache LRU de trechos tokenizados, compartilhado entre todas as abas.
+
+    A chave é ``(lexer, estado de entrada, texto da linha)`` e o valor são
+    os trechos ``(offset, tamanho, token)`` com o estado final da linha.
+    Os formatos são resolvidos na hora de aplicar, então o cache continua
+    válido depois de uma troca de tema.
+    """
+
+    def __init__(self, max_entries, max_chars):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.entries = OrderedDict()
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def line_runs(self, lexer, text, state):
+        """Retorna ``(trechos, estado final)`` da linha, tokenizando só em caso de miss"""
+        if state < 0:
+            state = 0
+        key = (type(lexer), state, text)
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        runs, end_stack = line_runs(lexer, text, state_to_stack(state))
+        value = (tuple(runs), stack_to_state(end_stack))
+
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = value
+                self.chars += len(text)
+                while self.entries and (len(self.entries) > self.max_entries
+                                        or self.chars > self.max_chars):
+                    old_key, _ = self.entries.popitem(last=False)
+                    self.chars -= len(old_key[2])
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores"""
+        with self.lock:
+            self.entries.clear()
+            self.chars = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self):
+        """Retorna as estatísticas de uso do cache"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'chars': self.chars,
+                'max_chars': self.max_chars,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Instância global compartilhada por todos os highlighters
+token_cache = TokenCache(EDITOR_CONFIG['token_cache_entries'],
+                         EDITOR_CONFIG['token_cache_chars'])
+
+
+# Chave de cor do tema usada por cada tipo de token; subtipos como
+# Token.Keyword.Namespace herdam a cor do ancestral mais próximo
+TOKEN_COLOR_KEYS = {
+    Token.Keyword: 'keyword',
+    Token.Name.Function: 'function',
+    Token.Name.Variable: 'variable',
+    Token.Name.Class: 'class',
+    Token.Name: 'identifier',
+    Token.Comment: 'comment',
+    Token.String: 'string',
+    Token.Error: 'error',
+    Token.Number: 'number',
+    Token.Operator: 'operator',
+    Token.Name.Tag: 'keyword',
+    Token.Name.Attribute: 'function',
+    Token.Generic.Heading: 'keyword',
+    Token.Generic.Subheading: 'keyword',
+    Token.Generic.Emph: 'variable',
+    Token.Generic.Strong: 'class',
+    Token.Generic.Inserted: 'function',
+    Token.Generic.Deleted: 'error'
+}
+
+
+def resolve_format(token, formats):
+    """Retorna o formato do ancestral mais próximo de ``token`` que tem
+    formato definido, ou None"""
+    while token is not None:
+        if token in formats:
+            return formats[token]
+        token = token.parent
+    return None
+
+
+def build_format_table(formats):
+    """Pré-calcula o formato de todos os tipos de token conhecidos"""
+    return {token: resolve_format(token, formats) for token in STANDARD_TYPES}
+
+
+# Workers em execução; mantidos aqui para que a thread não seja destruída
+# junto com o editor enquanto ainda está rodando
+_active_threads = set()
+
+
+class HighlighterThread(QThread):
+    """Thread que tokeniza um documento inteiro sem bloquear a interface"""
+    chunk_signal = pyqtSignal(int, list)
+
+    def __init__(self, lexer, lines, chunk_size):
+        super().__init__()
+        # Cada thread usa sua própria instância do lexer
+        self.lexer = type(lexer)(**lexer.options)
+        self.lines = lines
+        self.chunk_size = chunk_size
+
+    def stop(self, *args):
+        """Pede para a thread parar assim que possível"""
+        self.requestInterruption()
+
+    def run(self):
+        state = 0
+        start = 0
+        chunk = []
+        for line in self.lines:
+            if self.isInterruptionRequested():
+                return
+            runs, end_state = token_cache.line_runs(self.lexer, line, state)
+            chunk.append((line, state, runs, end_state))
+            state = end_state
+            if len(chunk) >= self.chunk_size:
+                self.chunk_signal.emit(start, chunk)
+                start += len(chunk)
+                chunk = []
+        if chunk:
+            self.chunk_signal.emit(start, chunk)
 
 
 class PythonHighlighter(QSyntaxHighlighter):
-    """Syntax highlighter para código Python com tema Dracula"""
-    
-    def __init__(self, document):
+    """Syntax highlighter com tema Dracula, para Python por padrão.
+
+    O lexer vem de ``lexer_registry``, então a mesma classe colore JSON,
+    Markdown, HTML, JavaScript etc. conforme o arquivo aberto.
+
+    O highlighting é incremental: cada bloco guarda a pilha de estados do
+    lexer ao final da linha (via ``setCurrentBlockState``) e o próximo bloco
+    continua a partir dela. O Qt só re-highlighta os blocos seguintes
+    enquanto o estado final de um bloco mudar, então uma edição custa
+    normalmente uma única linha.
+    """
+    progress_signal = pyqtSignal(int)
+
+    def __init__(self, document, lexer=None):
         super().__init__(document)
-        self.lexer = PythonLexer()
-        self.formats = {
-            Token.Keyword: QTextCharFormat(),
-            Token.Name.Function: QTextCharFormat(),
-            Token.Name.Variable: QTextCharFormat(),
-            Token.Name.Class: QTextCharFormat(),
-            Token.Name: QTextCharFormat(),
-            Token.Comment: QTextCharFormat(),
-            Token.String: QTextCharFormat(),
-            Token.Error: QTextCharFormat(),
-            Token.Number: QTextCharFormat(),
-            Token.Operator: QTextCharFormat()
-        }
-
-        # Definir cores estilo Dracula Theme
-        self.formats[Token.Keyword].setForeground(QColor(DRACULA_COLORS['keyword']))
-        self.formats[Token.Name.Function].setForeground(QColor(DRACULA_COLORS['function']))
-        self.formats[Token.Name.Variable].setForeground(QColor(DRACULA_COLORS['variable']))
-        self.formats[Token.Name.Class].setForeground(QColor(DRACULA_COLORS['class']))
-        self.formats[Token.Name].setForeground(QColor(DRACULA_COLORS['identifier']))
-        self.formats[Token.Comment].setForeground(QColor(DRACULA_COLORS['comment']))
-        self.formats[Token.String].setForeground(QColor(DRACULA_COLORS['string']))
-        self.formats[Token.Error].setForeground(QColor(DRACULA_COLORS['error']))
-        self.formats[Token.Number].setForeground(QColor(DRACULA_COLORS['number']))
-        self.formats[Token.Operator].setForeground(QColor(DRACULA_COLORS['operator']))
+        self.lexer = lexer or lexer_registry.get_lexer()
+        self.formats = {}
+        self.format_table = {}
+
+        # Tokenização em segundo plano (arquivos grandes)
+        self.editor = None
+        self._results = None
+        self._released_upto = 0
+        self._released = set()
+        self._block_count = 0
+        self._thread = None
+        self._skip_blocks = False
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setInterval(0)
+        self._apply_timer.timeout.connect(self._apply_pending)
+
+        self.set_colors(DRACULA_COLORS)
+
+    def set_colors(self, colors):
+        """Define as cores dos tokens a partir de um tema.
+
+        Todos os tipos de token são resolvidos para um formato aqui, uma
+        única vez, para que highlightBlock faça só uma consulta por trecho.
+        """
+        self.formats = {}
+        for token, color_key in TOKEN_COLOR_KEYS.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(colors[color_key]))
+            self.formats[token] = text_format
+        self.format_table = build_format_table(self.formats)
+
+        if not self.document().isEmpty():
+            self._rehighlight_quietly()
+
+    def set_lexer(self, lexer):
+        """Troca o lexer usado pelo highlighter e re-highlighta o documento"""
+        if type(lexer) is type(self.lexer):
+            return
+        if self.is_loading():
+            self._finish_loading()
+        self.lexer = lexer
+        if not self.document().isEmpty():
+            self._rehighlight_quietly()
+
+    def load_in_background(self, editor, content):
+        """Carrega o conteúdo no editor tokenizando-o em segundo plano.
+
+        A área visível do editor é formatada primeiro; o resto do documento
+        é tokenizado numa thread e aplicado em blocos nos momentos ociosos
+        do loop de eventos, emitindo ``progress_signal``.
+        """
+        self.editor = editor
+        self._results = []
+        self._released_upto = 0
+        self._released = set()
+
+        # Durante o setPlainText nenhum bloco é formatado, então a abertura
+        # não paga o custo de tokenizar o arquivo inteiro
+        self._skip_blocks = True
+        editor.setPlainText(content)
+        self._skip_blocks = False
+        self._block_count = self.document().blockCount()
+        editor.updateRequest.connect(self._release_viewport)
+        self.document().contentsChange.connect(self._document_changed)
+
+        self._thread = HighlighterThread(self.lexer,
+                                         self.document().toPlainText().split('\n'),
+                                         EDITOR_CONFIG['highlight_chunk_lines'])
+        self._thread.chunk_signal.connect(self._on_chunk_ready)
+        self._thread.finished.connect(self._on_thread_finished)
+        self.document().destroyed.connect(self._thread.stop)
+        _active_threads.add(self._thread)
+        self._thread.start()
 
+        self.progress_signal.emit(0)
+        self._release_viewport()
+        self._apply_timer.start()
+
+    def is_loading(self):
+        """Indica se o documento ainda está sendo tokenizado em segundo plano"""
+        return self._results is not None
+
+    def _on_chunk_ready(self, start, chunk):
+        """Recebe um lote de linhas tokenizadas pela thread"""
+        if self.sender() is self._thread and start == len(self._results):
+            self._results.extend(chunk)
+            self._release_viewport()
+
+    def _on_thread_finished(self):
+        """Libera a referência da thread quando ela termina"""
+        thread = self.sender()
+        _active_threads.discard(thread)
+        if thread is self._thread:
+            self._thread = None
+
+    def _stop_thread(self):
+        """Interrompe a tokenização em segundo plano"""
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+    def _release_viewport(self, *args):
+        """Formata imediatamente os blocos visíveis que ainda não foram formatados"""
+        if self._results is None or self.editor is None:
+            return
+        editor = self.editor
+        block = editor.firstVisibleBlock()
+        top = editor.blockBoundingGeometry(block).translated(editor.contentOffset()).top()
+        height = editor.viewport().height()
+        while block.isValid() and top <= height:
+            number = block.blockNumber()
+            if number >= self._released_upto and number not in self._released:
+                self._released.add(number)
+                if block.userState() == UNHIGHLIGHTED_STATE:
+                    self._rehighlight_quietly(block)
+            top += editor.blockBoundingRect(block).height()
+            block = block.next()
+
+    def _document_changed(self, position, removed, added):
+        """Acompanha linhas inseridas ou apagadas durante o carregamento"""
+        if self._results is not None:
+            self._shift_blocks(self.document().findBlock(position).blockNumber())
+
+    def _shift_blocks(self, first):
+        """Corrige os números de bloco depois de uma edição a partir do bloco ``first``.
+
+        Os blocos já liberados andam junto com o texto e o que a thread
+        calculou dali em diante é descartado. O QSyntaxHighlighter reage
+        ao contentsChange antes de nós, então highlightBlock também chama
+        isto ao ver a contagem de blocos mudar.
+        """
+        count = self.document().blockCount()
+        shift, self._block_count = count - self._block_count, count
+        if not shift:
+            return
+        if first < self._released_upto:
+            self._released_upto = max(self._released_upto + shift, first + 1)
+        self._released = {number if number <= first else number + shift
+                          for number in self._released if number <= first or number > first - shift}
+        del self._results[first + 1:]
+        self._stop_thread()
+
+    def _rehighlight_quietly(self, block=None):
+        """Re-highlighta um bloco (ou o documento todo) sem emitir
+        contentsChanged no documento, que marcaria a aba como modificada"""
+        document = self.document()
+        blocked = document.blockSignals(True)
+        if block is None:
+            self.rehighlight()
+        else:
+            self.rehighlightBlock(block)
+        document.blockSignals(blocked)
+
+    def _apply_pending(self):
+        """Formata o próximo lote de blocos durante o tempo ocioso"""
+        if self._results is None:
+            self._apply_timer.stop()
+            return
+
+        block_count = self.document().blockCount()
+        # Sem a thread, os blocos restantes são tokenizados aqui mesmo
+        available = len(self._results) if self._thread is not None else block_count
+        end = min(self._released_upto + EDITOR_CONFIG['highlight_chunk_lines'], available)
+        if end > self._released_upto:
+            block = self.document().findBlockByNumber(self._released_upto)
+            self._released_upto = end
+            while block.isValid() and block.blockNumber() < end:
+                if block.userState() == UNHIGHLIGHTED_STATE:
+                    # rehighlightBlock segue pelos blocos seguintes enquanto
+                    # o estado final mudar, cobrindo o lote de uma vez
+                    self._rehighlight_quietly(block)
+                block = block.next()
+            self.progress_signal.emit(int(100 * end / block_count))
+
+        if self._released_upto >= block_count:
+            self._finish_loading()
+
+    def _finish_loading(self):
+        """Encerra o modo de tokenização em segundo plano"""
+        self._apply_timer.stop()
+        self._stop_thread()
+        if self.editor is not None:
+            self.editor.updateRequest.disconnect(self._release_viewport)
+            self.document().contentsChange.disconnect(self._document_changed)
+        self._results = None
+        self._released = set()
+        self.progress_signal.emit(100)
+
+    def _apply_runs(self, runs):
+        """Aplica os formatos de uma lista de trechos ``(offset, tamanho, token)``.
+
+        Trechos vizinhos com o mesmo formato são aplicados numa única
+        chamada a setFormat.
+        """
+        table = self.format_table
+        current = None
+        start = end = 0
+        for offset, length, token in runs:
+            try:
+                text_format = table[token]
+            except KeyError:
+                # Tipo de token criado depois da montagem da tabela
+                text_format = table[token] = resolve_format(token, self.formats)
+            if text_format is not current or offset != end:
+                if current is not None:
+                    self.setFormat(start, end - start, current)
+                current = text_format
+                start = offset
+            end = offset + length
+        if current is not None:
+            self.setFormat(start, end - start, current)
+
+    @timed('highlightBlock')
     def highlightBlock(self, text):
         """Aplica highlighting ao bloco de texto"""
-        for token, content in lex(text, self.lexer):
-            length = len(content)
-            if token in self.formats:
-                self.setFormat(text.find(content), length, self.formats[token]) 
\ No newline at end of file
+        if self._skip_blocks:
+            return
+        if self._results is not None:
+            number = self.currentBlock().blockNumber()
+            if self.document().blockCount() != self._block_count:
+                self._shift_blocks(number)  # primeiro bloco da edição
+            if number >= self._released_upto and number not in self._released:
+                # Ainda não é a vez deste bloco
+                self.setCurrentBlockState(UNHIGHLIGHTED_STATE)
+                return
+            if number < len(self._results):
+                # Depois de inserir ou apagar linhas os números não batem mais
+                # com os da thread: só reaproveita a mesma linha vinda do mesmo estado
+                line, start_state, runs, state = self._results[number]
+                if line == text and start_state == max(self.previousBlockState(), 0):
+                    self._apply_runs(runs)
+                    self.setCurrentBlockState(state)
+                    return
+
+        runs, state = token_cache.line_runs(self.lexer, text, self.previousBlockState())
+        self._apply_runs(runs)
+        self.setCurrentBlockState(state)
+
+        if self._results is not None and number < len(self._results) \
+                and self._results[number][3] != state:
+            # O bloco foi editado e mudou o estado final: o que a thread
+            # calculou daqui para frente não vale mais
+            del self._results[number + 1:]
+            self._stop_thread()
@@ -3,6 +3,9 @@ from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtGui import QFont
 from .code_editor import CodeEditor
 from .syntax_highlighter import PythonHighlighter
+from .lexer_registry import lexer_registry
+from .autocomplete import CodeEditorCompleter
+from .constants import EDITOR_CONFIG
 
 
 class TabManager(QTabWidget):
@@ -11,6 +14,9 @@ class TabManager(QTabWidget):
     tab_closed = pyqtSignal(int)
     tab_saved = pyqtSignal(int, str)
     textChanged = pyqtSignal()  # Sinal para mudanças de texto
+    highlight_progress = pyqtSignal(int)  # Progresso do highlighting de arquivos grandes
+    definition_requested = pyqtSignal()  # Ctrl+clique em um editor
+    breakpoints_changed = pyqtSignal()  # breakpoint criado, removido ou alterado em um editor
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -29,6 +35,9 @@ class TabManager(QTabWidget):
         # Dicionário para armazenar informações das abas
         self.tab_info = {}
         
+        # Cores do tema usadas pelo syntax highlighting (None = Dracula)
+        self.theme_colors = None
+        
         # Conectar sinais para detectar mudanças
         self.currentChanged.connect(self._on_tab_changed)
     
@@ -76,11 +85,21 @@ class TabManager(QTabWidget):
         """Adiciona uma nova aba"""
         # Cria o editor
         editor = CodeEditor()
-        highlighter = PythonHighlighter(editor.document())
+        first_line = content[:200].split('\n', 1)[0]
+        highlighter = PythonHighlighter(editor.document(),
+                                        lexer_registry.get_lexer(filename, first_line))
+        highlighter.progress_signal.connect(self.highlight_progress)
+        if self.theme_colors:
+            highlighter.set_colors(self.theme_colors)
         
         # Define o conteúdo se fornecido
         if content:
-            editor.setPlainText(content)
+            if content.count('\n') >= EDITOR_CONFIG['background_highlight_lines']:
+                # Arquivos grandes: a área visível é formatada primeiro e o
+                # resto em segundo plano, sem travar a abertura da aba
+                highlighter.load_in_background(editor, content)
+            else:
+                editor.setPlainText(content)
         
         # Nome da aba
         if filename:
@@ -97,14 +116,35 @@ class TabManager(QTabWidget):
         self.tab_info[index] = {
             'filename': filename,
             'modified': False,
-            'editor': editor
+            'editor': editor,
+            'highlighter': highlighter,
+            'completer': CodeEditorCompleter(editor)
         }
         
         # Conectar sinais do editor
         editor.document().contentsChanged.connect(lambda: self._on_text_changed(index))
+        editor.definition_requested.connect(self.definition_requested)
+        editor.breakpoints_changed.connect(self.breakpoints_changed)
         
         return index
     
+    def update_tab_lexer(self, index):
+        """Atualiza o lexer da aba de acordo com o nome do arquivo atual"""
+        info = self.tab_info.get(index, {})
+        highlighter = info.get('highlighter')
+        if highlighter:
+            editor = info['editor']
+            first_line = editor.document().firstBlock().text()
+            highlighter.set_lexer(lexer_registry.get_lexer(info.get('filename'), first_line))
+    
+    def set_theme_colors(self, colors):
+        """Aplica as cores de um tema ao highlighting de todas as abas"""
+        self.theme_colors = colors
+        for info in self.tab_info.values():
+            highlighter = info.get('highlighter')
+            if highlighter:
+                highlighter.set_colors(colors)
+    
     def close_tab(self, index):
         """Fecha uma aba"""
         if index >= 0 and index < self.count():
@@ -0,0 +1,515 @@
+import os
+import sys
+import ast
+import builtins
+import hashlib
+import sqlite3
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from .constants import CACHE_DIR, EDITOR_CONFIG
+
+
+# Pastas que nunca fazem parte do código do projeto
+IGNORED_DIRECTORIES = {
+    '.git', '.hg', '.svn', '.tox', '.nox', '.venv', 'venv', 'env', '__pycache__',
+    'node_modules', 'site-packages', 'dist-packages', 'build', 'dist', '.mypy_cache',
+    '.pytest_cache', '.idea', '.vscode'
+}
+
+# Nomes cujas referências não são gravadas (aparecem em quase toda linha)
+IGNORED_REFERENCES = frozenset(dir(builtins)) | {'self', 'cls'}
+
+# Abaixo deste número de arquivos o parse é feito na própria thread do indexador
+POOL_MIN_FILES = 64
+
+# Arquivos gravados no banco por transação
+WRITE_BATCH = 200
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS definitions (
+    file_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    column INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS imports (
+    file_id INTEGER NOT NULL,
+    module TEXT NOT NULL,
+    name TEXT NOT NULL,
+    alias TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    file_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    column INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS definitions_name ON definitions(name);
+CREATE INDEX IF NOT EXISTS definitions_key ON definitions(key);
+CREATE INDEX IF NOT EXISTS definitions_file ON definitions(file_id);
+CREATE INDEX IF NOT EXISTS imports_file ON imports(file_id);
+CREATE INDEX IF NOT EXISTS refs_name ON refs(name);
+CREATE INDEX IF NOT EXISTS refs_file ON refs(file_id);
+"""
+
+
+def file_hash(data):
+    """Hash do conteúdo de um arquivo"""
+    return hashlib.sha1(data).hexdigest()
+
+
+class DefinitionCollector(ast.NodeVisitor):
+    """Coleta definições, imports e referências de um módulo"""
+
+    def __init__(self):
+        self.definitions = []  # (nome, tipo, escopo, linha, coluna)
+        self.imports = []  # (módulo, nome, apelido, linha)
+        self.references = []  # (nome, linha, coluna)
+        self.scope = []  # (nome, tipo) dos escopos abertos
+
+    def define(self, name, kind, node, column=None):
+        self.definitions.append((name, kind, '.'.join(scope for scope, _ in self.scope),
+                                 node.lineno, node.col_offset if column is None else column))
+
+    def visit_FunctionDef(self, node):
+        # A coluna aponta para o nome, depois de "def " / "async def "
+        prefix = 'async def ' if isinstance(node, ast.AsyncFunctionDef) else 'def '
+        self.define(node.name, 'function', node, node.col_offset + len(prefix))
+        for expression in node.decorator_list + node.args.defaults:
+            self.visit(expression)
+        self.scope.append((node.name, 'function'))
+        for statement in node.body:
+            self.visit(statement)
+        self.scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.define(node.name, 'class', node, node.col_offset + len('class '))
+        for expression in node.decorator_list + node.bases:
+            self.visit(expression)
+        self.scope.append((node.name, 'class'))
+        for statement in node.body:
+            self.visit(statement)
+        self.scope.pop()
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imports.append((alias.name, '', alias.asname or '', node.lineno))
+
+    def visit_ImportFrom(self, node):
+        module = '.' * node.level + (node.module or '')
+        for alias in node.names:
+            self.imports.append((module, alias.name, alias.asname or '', node.lineno))
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            # Só atribuições de módulo e de classe viram definições do workspace
+            if all(kind == 'class' for _, kind in self.scope):
+                self.define(node.id, 'variable', node)
+        elif node.id not in IGNORED_REFERENCES:
+            self.references.append((node.id, node.lineno, node.col_offset))
+
+    def visit_Attribute(self, node):
+        self.visit(node.value)
+        if node.end_lineno == node.lineno:
+            column = node.end_col_offset - len(node.attr)
+        else:
+            column = node.col_offset
+        if isinstance(node.ctx, ast.Store) and isinstance(node.value, ast.Name) \
+                and node.value.id == 'self':
+            self.define(node.attr, 'attribute', node, column)
+        else:
+            self.references.append((node.attr, node.end_lineno, column))
+
+
+def index_file(path):
+    """Lê e analisa um arquivo; roda nos processos do pool.
+
+    Retorna (caminho, mtime, tamanho, hash, definições, imports, referências)
+    ou None se o arquivo não puder ser lido. Arquivos com erro de sintaxe
+    entram sem símbolos, para não serem reanalisados até mudarem.
+    """
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+
+    collector = DefinitionCollector()
+    try:
+        tree = ast.parse(data, filename=path)
+        for statement in tree.body:
+            collector.visit(statement)
+    except (SyntaxError, ValueError, RecursionError):
+        pass
+    return (path, stat.st_mtime, stat.st_size, file_hash(data),
+            collector.definitions, collector.imports, collector.references)
+
+
+class WorkspaceIndexer(QThread):
+    """Atualiza o índice de um workspace em segundo plano.
+
+    Percorre o diretório, compara mtime/tamanho com o banco e, para os
+    arquivos alterados, o hash do conteúdo; só os que mudaram de fato são
+    analisados, em paralelo num pool de processos.
+    """
+    progress_signal = pyqtSignal(int, int)  # analisados, total
+    finished_signal = pyqtSignal(int, int)  # analisados, arquivos no índice
+
+    def __init__(self, index, root, paths=None):
+        super().__init__()
+        self.index = index
+        self.root = root
+        self.paths = paths  # None = workspace inteiro
+
+    def stop(self, *args):
+        """Pede a interrupção sem esperar: a thread para no próximo arquivo analisado"""
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            connection = self.index.open_connection(self.index.database_path(self.root))
+            try:
+                parsed = self.update(connection)
+                total = connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            finally:
+                connection.close()
+            self.finished_signal.emit(parsed, total)
+        except Exception as e:
+            print(f"Erro ao indexar workspace: {e}")
+            self.finished_signal.emit(0, 0)
+
+    def update(self, connection):
+        """Sincroniza o banco com os arquivos em disco; retorna quantos foram analisados"""
+        known = {path: (file_id, mtime, size, digest) for file_id, path, mtime, size, digest
+                 in connection.execute("SELECT id, path, mtime, size, hash FROM files")}
+
+        if self.paths is None:
+            found = self.index.scan(self.root)
+            removed = [path for path in known if path not in found]
+        else:
+            found = {}
+            removed = []
+            for path in self.paths:
+                try:
+                    stat = os.stat(path)
+                    found[path] = (stat.st_mtime, stat.st_size)
+                except OSError:
+                    if path in known:
+                        removed.append(path)
+
+        changed = []
+        touched = []  # mtime mudou mas o conteúdo não: só atualiza o registro
+        for path, (mtime, size) in found.items():
+            entry = known.get(path)
+            if entry is None:
+                changed.append(path)
+            elif entry[1] != mtime or entry[2] != size:
+                try:
+                    with open(path, 'rb') as file:
+                        digest = file_hash(file.read())
+                except OSError:
+                    continue
+                if digest == entry[3]:
+                    touched.append((mtime, size, entry[0]))
+                else:
+                    changed.append(path)
+
+        with connection:
+            for path in removed:
+                self.delete_file(connection, known[path][0])
+            connection.executemany("UPDATE files SET mtime = ?, size = ? WHERE id = ?", touched)
+
+        if not changed:
+            return 0
+
+        if len(changed) < POOL_MIN_FILES:
+            results = map(index_file, changed)
+            pool = None
+        else:
+            # spawn: fork de um processo com threads do Qt não é seguro
+            pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1),
+                                       mp_context=multiprocessing.get_context('spawn'))
+            results = pool.map(index_file, changed, chunksize=16)
+
+        parsed = 0
+        batch = []
+        try:
+            for result in results:
+                if self.isInterruptionRequested():
+                    break
+                if result is not None:
+                    batch.append(result)
+                parsed += 1
+                if len(batch) >= WRITE_BATCH:
+                    self.write(connection, batch, known)
+                    batch = []
+                    self.progress_signal.emit(parsed, len(changed))
+            self.write(connection, batch, known)
+            self.progress_signal.emit(parsed, len(changed))
+        finally:
+            if pool is not None:
+                if sys.version_info >= (3, 9):
+                    pool.shutdown(wait=False, cancel_futures=True)
+                else:
+                    pool.shutdown(wait=False)
+        return parsed
+
+    def delete_file(self, connection, file_id):
+        for table in ('definitions', 'imports', 'refs'):
+            connection.execute(f"DELETE FROM {table} WHERE file_id = ?", (file_id,))
+        connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def write(self, connection, results, known):
+        """Grava os resultados de vários arquivos numa transação"""
+        with connection:
+            for path, mtime, size, digest, definitions, imports, references in results:
+                entry = known.get(path)
+                if entry is not None:
+                    self.delete_file(connection, entry[0])
+                file_id = connection.execute(
+                    "INSERT OR REPLACE INTO files (path, mtime, size, hash) VALUES (?, ?, ?, ?)",
+                    (path, mtime, size, digest)).lastrowid
+                known[path] = (file_id, mtime, size, digest)
+                connection.executemany(
+                    "INSERT INTO definitions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(file_id, name, name.lower(), kind, scope, line, column)
+                     for name, kind, scope, line, column in definitions])
+                connection.executemany(
+                    "INSERT INTO imports VALUES (?, ?, ?, ?, ?)",
+                    [(file_id,) + item for item in imports])
+                connection.executemany(
+                    "INSERT INTO refs VALUES (?, ?, ?, ?)",
+                    [(file_id,) + item for item in references])
+
+
+class WorkspaceIndex(QObject):
+    """Índice de símbolos do workspace gravado em SQLite.
+
+    Cada raiz tem seu banco em CACHE_DIR/workspaces, então reabrir um
+    workspace reaproveita o índice e só reanalisa o que mudou desde a
+    última vez. As consultas usam uma conexão por thread.
+    """
+    progress_signal = pyqtSignal(int, int)
+    finished_signal = pyqtSignal(int, int)
+
+    def __init__(self):
+        super().__init__()
+        self.root = None
+        self.indexer = None
+        self.pending_paths = None  # arquivos salvos durante uma indexação
+        self.stopping = set()  # indexações interrompidas que ainda não terminaram
+        self.local = threading.local()
+
+    def database_path(self, root):
+        """Caminho do banco de um workspace"""
+        name = hashlib.sha1(os.path.abspath(root).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(CACHE_DIR, 'workspaces', f'{name}.sqlite3')
+
+    def open_connection(self, path):
+        """Abre o banco, criando as tabelas se necessário"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        connection = sqlite3.connect(path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with connection:
+                for table in ('files', 'definitions', 'imports', 'refs'):
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+                connection.executescript(SCHEMA)
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return connection
+
+    def connection(self):
+        """Conexão da thread atual com o banco do workspace aberto"""
+        if self.root is None:
+            return None
+        path = self.database_path(self.root)
+        current = getattr(self.local, 'connection', None)
+        if current is None or self.local.path != path:
+            if current is not None:
+                current.close()
+            self.local.connection = self.open_connection(path)
+            self.local.path = path
+        return self.local.connection
+
+    def scan(self, root):
+        """Retorna {caminho: (mtime, tamanho)} dos arquivos .py do workspace"""
+        found = {}
+        limit = EDITOR_CONFIG['workspace_max_files']
+        for directory, subdirectories, files in os.walk(root):
+            subdirectories[:] = [name for name in subdirectories
+                                 if name not in IGNORED_DIRECTORIES and not name.startswith('.')]
+            for name in files:
+                if name.endswith('.py'):
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    found[path] = (stat.st_mtime, stat.st_size)
+                    if len(found) >= limit:
+                        return found
+        return found
+
+    def is_indexable_root(self, path):
+        """Evita indexar a pasta pessoal ou a raiz do sistema inteiras"""
+        path = os.path.abspath(path)
+        return path != os.path.dirname(path) and path != os.path.expanduser('~')
+
+    def contains(self, path):
+        """Verifica se um caminho está dentro do workspace aberto"""
+        if self.root is None:
+            return False
+        try:
+            return os.path.commonpath([self.root, os.path.abspath(path)]) == self.root
+        except ValueError:
+            return False  # Windows: unidades diferentes
+
+    def set_root(self, root):
+        """Abre o workspace de ``root``; pastas dentro do atual não o trocam"""
+        root = os.path.abspath(root)
+        if self.contains(root) or not self.is_indexable_root(root):
+            return
+        self.stop()
+        self.root = root
+        self.reindex()
+
+    def reindex(self, paths=None):
+        """Atualiza o índice (todo o workspace ou só ``paths``)"""
+        if self.root is None:
+            return
+        if self.indexer is not None and self.indexer.isRunning():
+            if paths is None:
+                self.pending_paths = None
+            elif self.pending_paths is not None:
+                self.pending_paths.extend(paths)
+            return
+        self.pending_paths = []
+        self.indexer = WorkspaceIndexer(self, self.root, paths)
+        self.indexer.progress_signal.connect(self.progress_signal)
+        self.indexer.finished_signal.connect(self._on_indexer_finished)
+        self.indexer.start()
+
+    def update_file(self, path):
+        """Reindexa um arquivo salvo, se ele for do workspace"""
+        if path and path.endswith('.py') and self.contains(path):
+            self.reindex([os.path.abspath(path)])
+
+    def _on_indexer_finished(self, parsed, total):
+        if self.sender() is not self.indexer:
+            return  # indexação interrompida por stop()
+        self.indexer.wait()
+        self.indexer = None
+        self.finished_signal.emit(parsed, total)
+        pending, self.pending_paths = self.pending_paths, []
+        if pending is None or pending:
+            self.reindex(pending)
+
+    def stop(self, *args):
+        """Interrompe a indexação em andamento, sem travar a interface esperando por ela"""
+        indexer, self.indexer = self.indexer, None
+        if indexer is None:
+            return
+        # A referência fica guardada até a thread terminar de fato
+        indexer.finished.connect(lambda: self.stopping.discard(indexer))
+        indexer.stop()
+        if indexer.isRunning():
+            self.stopping.add(indexer)
+
+    def shutdown(self, *args):
+        """Interrompe e espera as indexações (ao fechar a IDE)"""
+        self.stop()
+        for indexer in list(self.stopping):
+            indexer.wait()
+        self.stopping.clear()
+
+    def is_indexing(self):
+        return self.indexer is not None and self.indexer.isRunning()
+
+    # Consultas
+
+    def find_definitions(self, name):
+        """Definições de um nome: [(caminho, linha, coluna, tipo, escopo)]"""
+        connection = self.connection()
+        if connection is None:
+            return []
+        return connection.execute(
+            "SELECT files.path, line, column, kind, scope FROM definitions "
+            "JOIN files ON files.id = definitions.file_id "
+            "WHERE name = ? ORDER BY files.path, line", (name,)).fetchall()
+
+    def iter_references(self, name, batch_size=200):
+        """Gera as referências de um nome em lotes: [(caminho, linha, coluna)]"""
+        connection = self.connection()
+        if connection is None:
+            return
+        cursor = connection.execute(
+            "SELECT files.path, line, column FROM refs JOIN files ON files.id = refs.file_id "
+            "WHERE name = ? ORDER BY files.path, line, column", (name,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+
+    def find_references(self, name):
+        """Todas as referências de um nome"""
+        return [row for rows in self.iter_references(name) for row in rows]
+
+    def find_imports(self, module):
+        """Arquivos que importam um módulo: [(caminho, nome, apelido, linha)]"""
+        connection = self.connection()
+        if connection is None:
+            return []
+        return connection.execute(
+            "SELECT files.path, name, alias, line FROM imports "
+            "JOIN files ON files.id = imports.file_id WHERE module = ?", (module,)).fetchall()
+
+    def module_definitions(self, module):
+        """Nomes do nível de topo dos arquivos do workspace que podem ser ``module``:
+        [(nome, tipo)] de ``.../pacote/modulo.py`` ou ``.../pacote/modulo/__init__.py``"""
+        connection = self.connection()
+        if connection is None:
+            return []
+        relative = module.replace('.', os.sep)
+        patterns = ('*' + os.sep + relative + '.py',
+                    '*' + os.sep + os.path.join(relative, '__init__.py'))
+        return connection.execute(
+            "SELECT DISTINCT name, kind FROM definitions "
+            "JOIN files ON files.id = definitions.file_id "
+            "WHERE scope = '' AND (files.path GLOB ? OR files.path GLOB ?) ORDER BY name",
+            patterns).fetchall()
+
+    def search(self, word, limit=50):
+        """Nomes definidos no workspace que começam com ``word`` (para autocompletar)"""
+        connection = self.connection()
+        if connection is None or not word:
+            return []
+        key = word.lower()
+        rows = connection.execute(
+            "SELECT DISTINCT name FROM definitions WHERE key >= ? AND key < ? "
+            "ORDER BY key LIMIT ?",
+            (key, key + '\U0010ffff', limit)).fetchall()
+        return [row[0] for row in rows]
+
+
+# Instância global
+workspace_index = WorkspaceIndex()